@@ -0,0 +1,406 @@
+"""Airtable / Vision / ImgBB / PubChem 로컬 목(mock) 서버
+
+app.py 의 *_API_URL secrets 를 이 서버로 돌리면 네트워크 없이 전 경로를 실행할 수 있다.
+
+- Airtable: 목록(pageSize/offset/filterByFormula/fields[]/sort/maxRecords), 단건 GET/PATCH/DELETE,
+  생성(단건/records 배치), 배치 PATCH/DELETE, 초당 요청 한도 초과 시 429
+- Vision: 미리 정한(canned) TEXT_DETECTION 응답
+- ImgBB: 업로드 후 가짜 URL 반환 / PubChem: CAS 로 Title 반환
+
+단독 실행:
+    python -m bench.mock_server --tx 10000 --port 8787
+"""
+import argparse, hashlib, json, re, threading, time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+TX_TABLE, MATERIALS_TABLE, TRASH_TABLE = "Lab OCR Results", "Materials", "Lab OCR Trash"
+
+DEFAULT_OCR_TEXT = "Ethanol absolute\nCAS No. 64-17-5\n500 mL\nSynthetic Supplier Co."
+
+
+# =========================
+# filterByFormula (자주 쓰는 부분집합만)
+# =========================
+class FormulaError(ValueError):
+    pass
+
+
+def _split_args(s: str) -> list[str]:
+    """최상위 콤마 기준 분리 (괄호/따옴표 내부 무시)"""
+    out, depth, quote, cur = [], 0, None, []
+    for ch in s:
+        if quote:
+            cur.append(ch)
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            out.append("".join(cur).strip()); cur = []
+            continue
+        cur.append(ch)
+    if cur:
+        out.append("".join(cur).strip())
+    return out
+
+
+_FUNC_RE = re.compile(r"^(AND|OR|NOT)\((.*)\)$", re.S | re.I)
+_CMP_RE = re.compile(r"^(\{[^}]+\}|RECORD_ID\(\))\s*(=|!=)\s*('(?:[^']*)'|\"(?:[^\"]*)\"|-?\d+(?:\.\d+)?|TRUE\(\)|FALSE\(\))$", re.I)
+_FIELD_RE = re.compile(r"^\{([^}]+)\}$")
+
+
+def compile_formula(formula: str):
+    """formula → (record -> bool) 함수. 지원: AND/OR/NOT, {F}=값, {F}!=값, RECORD_ID()=값, {F}"""
+    f = formula.strip()
+    m = _FUNC_RE.match(f)
+    if m:
+        op, args = m.group(1).upper(), [compile_formula(a) for a in _split_args(m.group(2))]
+        if op == "AND":
+            return lambda r: all(a(r) for a in args)
+        if op == "OR":
+            return lambda r: any(a(r) for a in args)
+        if len(args) != 1:
+            raise FormulaError(formula)
+        return lambda r: not args[0](r)
+    m = _CMP_RE.match(f)
+    if m:
+        lhs, op, rhs = m.groups()
+        if rhs[0] in "'\"":
+            val = rhs[1:-1]
+        elif rhs.upper() in ("TRUE()", "FALSE()"):
+            val = rhs.upper() == "TRUE()"
+        else:
+            val = float(rhs)
+        if lhs.upper() == "RECORD_ID()":
+            get = lambda r: r["id"]
+        else:
+            name = lhs[1:-1]
+            get = lambda r: _norm(r["fields"].get(name), val)
+        return (lambda r: get(r) == val) if op == "=" else (lambda r: get(r) != val)
+    m = _FIELD_RE.match(f)
+    if m:
+        name = m.group(1)
+        return lambda r: bool(r["fields"].get(name))
+    raise FormulaError(formula)
+
+
+def _norm(v, like):
+    """Airtable 처럼 빈 값은 ''/0/False 로 비교"""
+    if isinstance(like, bool):
+        return bool(v)
+    if isinstance(like, float):
+        try:
+            return float(v or 0)
+        except (TypeError, ValueError):
+            return None
+    return "" if v is None else str(v)
+
+
+# =========================
+# 서버 상태
+# =========================
+class MockState:
+    def __init__(self, rate_limit: float = 0, latency_ms: float = 0, ocr_text: str = DEFAULT_OCR_TEXT):
+        self.lock = threading.RLock()
+        self.tables: dict[str, list[dict]] = {}
+        self.rate_limit = rate_limit      # base 당 초당 요청 수 (0 = 무제한)
+        self.latency_ms = latency_ms      # 요청마다 인위적 지연
+        self.ocr_text = ocr_text
+        self.calls = Counter()
+        self.bytes_out = Counter()
+        self._recent = {}                 # base -> deque[timestamps]
+        self._seq = 0
+
+    def load(self, dataset: dict):
+        with self.lock:
+            self.tables = {
+                TX_TABLE: [dict(r) for r in dataset.get("tx", [])],
+                MATERIALS_TABLE: [dict(r) for r in dataset.get("materials", [])],
+                TRASH_TABLE: [dict(r) for r in dataset.get("trash", [])],
+            }
+
+    def table(self, name: str) -> list[dict]:
+        return self.tables.setdefault(name, [])
+
+    def new_id(self) -> str:
+        self._seq += 1
+        return f"recNEW{self._seq:011d}"
+
+    def rate_limited(self, base: str) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        q = self._recent.setdefault(base, deque())
+        while q and now - q[0] > 1.0:
+            q.popleft()
+        if len(q) >= self.rate_limit:
+            return True
+        q.append(now)
+        return False
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"calls": dict(self.calls), "bytes_out": dict(self.bytes_out),
+                    "total_calls": sum(v for k, v in self.calls.items() if ":" not in k)}
+
+    def reset_stats(self):
+        with self.lock:
+            self.calls.clear()
+            self.bytes_out.clear()
+            self._recent.clear()
+
+
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+
+
+class Handler(BaseHTTPRequestHandler):
+    state: MockState = None  # MockServer 에서 주입
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # ----- 공통 -----
+    def _send(self, code: int, body, route: str):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with self.state.lock:
+            self.state.bytes_out[route] += len(data)
+
+    def _body(self) -> bytes:
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n) if n else b""
+
+    def _json(self) -> dict:
+        raw = self._body()
+        return json.loads(raw) if raw else {}
+
+    def _dispatch(self, method: str):
+        parts = urlsplit(self.path)
+        path, query = unquote(parts.path), parse_qs(parts.query)
+        if self.state.latency_ms:
+            time.sleep(self.state.latency_ms / 1000.0)
+        if path == "/__stats":
+            return self._send(200, self.state.stats(), "__stats")
+        if path == "/__reset":
+            self.state.reset_stats()
+            return self._send(200, {"ok": True}, "__reset")
+        if path.startswith("/v0/"):
+            return self._airtable(method, path[4:].split("/"), query)
+        if path.endswith("/images:annotate") and method == "POST":
+            return self._vision()
+        if path.endswith("/upload") and method == "POST":
+            return self._imgbb()
+        if "/compound/name/" in path:
+            return self._pubchem(path)
+        self._send(404, {"error": "NOT_FOUND"}, "unknown")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # ----- Airtable -----
+    def _airtable(self, method: str, segs: list[str], query: dict):
+        st = self.state
+        base, table_name = segs[0], (segs[1] if len(segs) > 1 else "")
+        rid = segs[2] if len(segs) > 2 else None
+        kind = {"GET": "get" if rid else "list", "POST": "create",
+                "PATCH": "update", "DELETE": "delete"}[method]
+        route = f"airtable.{kind}"
+        body = self._json() if method in ("POST", "PATCH") else {}
+        with st.lock:
+            st.calls[route] += 1
+            st.calls[f"{route}:{table_name}"] += 1
+            limited = st.rate_limited(base)
+        if limited:
+            with st.lock:
+                st.calls["airtable:429"] += 1
+            return self._send(429, {"error": {"type": "RATE_LIMIT_REACHED",
+                                              "message": "Rate limit exceeded. Please try again later"}}, route)
+        with st.lock:  # 응답 본문만 잠금 안에서 만들고 전송은 밖에서 (동시 요청 허용)
+            code, out = self._airtable_op(method, table_name, rid, query, body)
+        self._send(code, out, route)
+
+    def _airtable_op(self, method: str, table_name: str, rid: str | None, query: dict, body: dict):
+        st = self.state
+        recs = st.table(table_name)
+        if method == "GET" and not rid:
+            return self._list(recs, query)
+        if rid:
+            idx = next((i for i, r in enumerate(recs) if r["id"] == rid), None)
+            if idx is None:
+                return 404, {"error": "NOT_FOUND"}
+            if method == "GET":
+                return 200, recs[idx]
+            if method == "PATCH":
+                recs[idx] = {**recs[idx], "fields": {**recs[idx]["fields"], **body.get("fields", {})}}
+                return 200, recs[idx]
+            del recs[idx]
+            return 200, {"id": rid, "deleted": True}
+        if method == "POST":
+            items = body.get("records") or [{"fields": body.get("fields", {})}]
+            if len(items) > 10:
+                return 422, {"error": {"type": "INVALID_RECORDS"}}
+            created = [{"id": st.new_id(), "createdTime": _now_iso(), "fields": dict(it.get("fields", {}))}
+                       for it in items]
+            recs.extend(created)
+            return 200, ({"records": created} if "records" in body else created[0])
+        if method == "PATCH":
+            by_id = {r["id"]: i for i, r in enumerate(recs)}
+            out = []
+            for it in body.get("records", [])[:10]:
+                i = by_id.get(it.get("id"))
+                if i is not None:
+                    recs[i] = {**recs[i], "fields": {**recs[i]["fields"], **it.get("fields", {})}}
+                    out.append(recs[i])
+            return 200, {"records": out}
+        ids = set(query.get("records[]", [])[:10])
+        st.tables[table_name] = [r for r in recs if r["id"] not in ids]
+        return 200, {"records": [{"id": i, "deleted": True} for i in ids]}
+
+    def _list(self, recs: list[dict], query: dict):
+        formula = (query.get("filterByFormula") or [""])[0]
+        if formula:
+            try:
+                pred = compile_formula(formula)
+            except FormulaError:
+                return 422, {"error": {"type": "INVALID_FILTER_BY_FORMULA"}}
+            recs = [r for r in recs if pred(r)]
+        for i in reversed(range(4)):   # sort[0] 이 최우선 → 뒤 키부터 안정 정렬
+            fld = (query.get(f"sort[{i}][field]") or [""])[0]
+            if fld:
+                desc = (query.get(f"sort[{i}][direction]") or ["asc"])[0] == "desc"
+                recs = sorted(recs, key=lambda r: (r["fields"].get(fld) is not None, r["fields"].get(fld) or ""),
+                              reverse=desc)
+        max_records = int((query.get("maxRecords") or [0])[0] or 0)
+        if max_records:
+            recs = recs[:max_records]
+        page_size = min(int((query.get("pageSize") or [100])[0]), 100)
+        start = int((query.get("offset") or [0])[0] or 0)
+        page = recs[start:start + page_size]
+        fields = query.get("fields[]")
+        if fields:
+            page = [{**r, "fields": {k: v for k, v in r["fields"].items() if k in fields}} for r in page]
+        out = {"records": page}
+        if start + page_size < len(recs):
+            out["offset"] = str(start + page_size)
+        return 200, out
+
+    # ----- 기타 외부 API -----
+    def _vision(self):
+        body = self._json()
+        with self.state.lock:
+            self.state.calls["vision"] += 1
+        content = body.get("requests", [{}])[0].get("image", {}).get("content", "")
+        text = self.state.ocr_text
+        self._send(200, {"responses": [{
+            "textAnnotations": [{"description": text}],
+            "fullTextAnnotation": {"text": text},
+            "_digest": hashlib.sha1(content.encode()).hexdigest(),
+        }]}, "vision")
+
+    def _imgbb(self):
+        raw = self._body()
+        with self.state.lock:
+            self.state.calls["imgbb"] += 1
+        digest = hashlib.sha1(raw).hexdigest()[:16]
+        self._send(200, {"data": {"url": f"http://{self.headers.get('Host')}/img/{digest}.jpg"}}, "imgbb")
+
+    def _pubchem(self, path: str):
+        with self.state.lock:
+            self.state.calls["pubchem"] += 1
+        cas = path.split("/compound/name/", 1)[1].split("/", 1)[0]
+        self._send(200, {"PropertyTable": {"Properties": [{"Title": f"Compound {cas}"}]}}, "pubchem")
+
+
+class MockServer:
+    """백그라운드 스레드에서 도는 목 서버. with 문으로 사용 가능"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **state_kw):
+        self.state = MockState(**state_kw)
+        handler = type("BoundHandler", (Handler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def secrets(self) -> dict:
+        """app.py 를 이 서버로 향하게 하는 secrets"""
+        return {
+            "AIRTABLE_TOKEN": "mock-token",
+            "AIRTABLE_BASE_ID": "appMOCK",
+            "AIRTABLE_TABLE_NAME": TX_TABLE,
+            "MATERIALS_TABLE_NAME": MATERIALS_TABLE,
+            "TRASH_TABLE_NAME": TRASH_TABLE,
+            "IMGBB_KEY": "mock-imgbb",
+            "GCP_KEY": "mock-gcp",
+            "AIRTABLE_API_URL": f"{self.url}/v0",
+            "VISION_API_URL": f"{self.url}/v1",
+            "IMGBB_API_URL": f"{self.url}/1",
+            "PUBCHEM_API_URL": f"{self.url}/rest/pug",
+            "AIRTABLE_RATE_LIMIT": self.state.rate_limit,  # 앱 쪽 요청 한도를 목 서버 한도에 맞춤
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    from bench.synth import generate
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--tx", type=int, default=1000, help="합성 트랜잭션 수")
+    ap.add_argument("--rate-limit", type=float, default=5, help="base 당 초당 요청 한도 (0=무제한)")
+    ap.add_argument("--latency-ms", type=float, default=0)
+    args = ap.parse_args()
+
+    srv = MockServer(port=args.port, rate_limit=args.rate_limit, latency_ms=args.latency_ms)
+    srv.state.load(generate(args.tx))
+    print("# .streamlit/secrets.toml")
+    for k, v in srv.secrets().items():
+        print(f'{k} = "{v}"')
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""app.py 경로별 벤치마크 (목 서버 + streamlit AppTest)
+
+각 시나리오를 합성 데이터 크기별로 실행하고 벽시계 시간, 탭별 소요 시간,
+외부 API 호출 수/응답 바이트를 집계한다.
+
+    python -m bench.run                         # 1k, 10k 기본 시나리오
+    python -m bench.run --sizes 1000 10000 100000 --json bench_output.json
+    python -m bench.run --scenarios page_inventory ocr_save --latency-ms 150
+
+결과 표는 stdout, streamlit 경고는 stderr 로 나간다 (필요하면 2>/dev/null).
+"""
+import argparse, json, sys, time
+from collections import defaultdict
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from bench.mock_server import TX_TABLE, MockServer
+from bench.synth import generate
+
+APP = str(Path(__file__).resolve().parent.parent / "app.py")
+
+# 1x1 PNG (OCR 응답은 목 서버가 고정 텍스트로 돌려줌)
+PNG_1PX = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+# =========================
+# 하위 탭별 시간 측정 (st.tabs 가 돌려주는 컨테이너를 감싸 with 블록 시간을 잰다)
+# =========================
+class _TimedTab:
+    def __init__(self, dg, label: str, sink: dict):
+        self._dg, self._label, self._sink = dg, label, sink
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self._dg.__enter__()
+
+    def __exit__(self, *exc):
+        try:
+            return self._dg.__exit__(*exc)
+        finally:
+            self._sink[self._label] += (time.perf_counter() - self._t0) * 1000.0
+
+    def __getattr__(self, name):
+        return getattr(self._dg, name)
+
+
+class TabTimer:
+    def __init__(self):
+        self.sections = defaultdict(float)
+        self._orig = None
+
+    def __enter__(self):
+        self._orig = st.tabs
+        orig, sink = self._orig, self.sections
+
+        def timed_tabs(labels, *a, **kw):
+            return [_TimedTab(dg, lbl, sink) for dg, lbl in zip(orig(labels, *a, **kw), labels)]
+
+        st.tabs = timed_tabs
+        return self
+
+    def __exit__(self, *exc):
+        st.tabs = self._orig
+
+
+# =========================
+# 시나리오
+# =========================
+def _new_app(srv: MockServer, timeout: float) -> AppTest:
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    for k, v in srv.secrets().items():
+        at.secrets[k] = v
+    at.secrets["WARMUP"] = False  # 백그라운드 예열이 시나리오 호출 수에 섞이지 않게 (warm_* 에서 직접 실행)
+    return at
+
+
+def _button(at: AppTest, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def _measure(srv: MockServer, at: AppTest, step) -> dict:
+    srv.state.reset_stats()
+    with TabTimer() as tt:
+        t0 = time.perf_counter()
+        step(at)
+        wall = (time.perf_counter() - t0) * 1000.0
+    stats = srv.state.stats()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    # app.py 자체 계측(metrics.Recorder) — 마지막 리런 기준
+    rec = at.session_state["_metrics_cur"] if "_metrics_cur" in at.session_state else None
+    return {"wall_ms": round(wall, 1), "api_calls": stats["total_calls"],
+            "calls": stats["calls"], "bytes_out": stats["bytes_out"],
+            "sections_ms": {k: round(v, 1) for k, v in tt.sections.items()},
+            "app_metrics": rec.rows() if rec is not None else []}
+
+
+PAGES = {
+    "ocr": "views/ocr.py",
+    "inventory": "views/inventory.py",
+    "audit": "views/audit.py",
+    "forecast": "views/forecast.py",
+    "hazard": "views/hazard.py",
+    "log": "views/log.py",
+    "trash": "views/trash.py",
+}
+
+
+def _page_load(page: str):
+    def sc(srv, at, n_rows):
+        """새 세션에서 해당 페이지 첫 렌더"""
+        at.switch_page(PAGES[page])
+        return _measure(srv, at, lambda a: a.run())
+    sc.__doc__ = f"새 세션에서 {page} 페이지 첫 렌더"
+    return sc
+
+
+def _rerun(page: str):
+    def sc(srv, at, n_rows):
+        at.switch_page(PAGES[page])
+        at.run()
+        return _measure(srv, at, lambda a: a.run())
+    sc.__doc__ = f"{page} 페이지 두 번째 렌더 (위젯 조작 1회에 해당)"
+    return sc
+
+
+def _lab_scope(srv):
+    from services.scope import Scope
+    f = next(r["fields"] for r in srv.state.table(TX_TABLE) if r["fields"].get("lab"))
+    return Scope(f["dept"], f["building"], f["lab"])
+
+
+def _warm_page(page: str):
+    def sc(srv, at, n_rows):
+        at.run()   # app/config import (secrets) — 기본 페이지는 외부 호출 없음
+        import warmup
+        scope = _lab_scope(srv)
+        w = warmup.run(labs=[scope.lab])
+        at.session_state["scope"] = scope
+        at.switch_page(PAGES[page])
+        res = _measure(srv, at, lambda a: a.run())
+        res["warm_ms"] = round((w.finished_at - w.started_at) * 1000.0, 1)
+        return res
+    sc.__doc__ = f"예열(warmup.run, 실험실 하나 지정) 후 그 실험실 범위 새 세션의 {page} 페이지 첫 렌더"
+    return sc
+
+
+def _warm_default_page(page: str):
+    def sc(srv, at, n_rows):
+        at.run()
+        import warmup
+        w = warmup.run()   # 기본 WARMUP_LABS — 새 세션의 첫 범위(전체)
+        at.switch_page(PAGES[page])   # 범위를 고르지 않은 새 세션
+        res = _measure(srv, at, lambda a: a.run())
+        res["warm_ms"] = round((w.finished_at - w.started_at) * 1000.0, 1)
+        return res
+    sc.__doc__ = f"기본 설정으로 예열(warmup.run) 후 범위를 고르지 않은 새 세션의 {page} 페이지 첫 렌더"
+    return sc
+
+
+def _scoped_page(page: str):
+    def sc(srv, at, n_rows):
+        at.run()
+        from services.scope import fetch_scope_list
+        fetch_scope_list()   # 범위 목록은 한 시간 캐시 — 이미 받아 둔 상태에서 측정
+        at.session_state["scope"] = _lab_scope(srv)
+        at.switch_page(PAGES[page])
+        return _measure(srv, at, lambda a: a.run())
+    sc.__doc__ = f"실험실 하나로 범위를 고른 세션의 {page} 페이지 첫 렌더"
+    return sc
+
+
+def sc_bulk_delete(srv, at, n_rows):
+    """입출고 로그에서 n_rows 건 삭제 체크 후 적용"""
+    at.switch_page(PAGES["log"])
+    at.run()
+    at.session_state["edit_logs_grid"] = {
+        "edited_rows": {i: {"삭제": True} for i in range(n_rows)}, "added_rows": [], "deleted_rows": []}
+
+    def step(a):
+        _button(a, "✅ 선택 항목 적용").click()
+        a.run()
+    return _measure(srv, at, step)
+
+
+def sc_restore(srv, at, n_rows):
+    """휴지통에서 n_rows 건 복원"""
+    at.switch_page(PAGES["trash"])
+    at.run()
+    at.session_state["trash_editor_grid"] = {
+        "edited_rows": {i: {"복원": True} for i in range(n_rows)}, "added_rows": [], "deleted_rows": []}
+
+    def step(a):
+        _button(a, "✅ 선택 항목 복원").click()
+        a.run()
+    return _measure(srv, at, step)
+
+
+def sc_ocr(srv, at, n_rows):
+    """라벨 업로드 → OCR 결과 렌더"""
+    at.run()
+
+    def step(a):
+        a.file_uploader[0].upload("label.png", PNG_1PX, "image/png")
+        a.run()
+    return _measure(srv, at, step)
+
+
+def sc_ocr_save(srv, at, n_rows):
+    """OCR 후 메타 입력 → 저장 버튼"""
+    at.run()
+    at.file_uploader[0].upload("label.png", PNG_1PX, "image/png")
+    for w in at.text_input:
+        if w.label == "실험실명":
+            w.input("Lab-001")
+        elif w.label.startswith("호수"):
+            w.input("203")
+    at.number_input[0].set_value(10)
+    at.run()
+
+    def step(a):
+        _button(a, "💾 Airtable에 저장").click()
+        a.run()
+    return _measure(srv, at, step)
+
+
+def sc_ocr_dup(srv, at, n_rows):
+    """저장 직후 같은 사진 재업로드 (중복 경고, Vision 재호출 없어야 함)"""
+    sc_ocr_save(srv, at, n_rows)
+
+    def step(a):
+        a.file_uploader[0].upload("label_again.png", PNG_1PX, "image/png")
+        a.run()
+    res = _measure(srv, at, step)
+    res["dup_warning"] = any("중복 의심" in w.value for w in at.warning)
+    return res
+
+
+SCENARIOS = {
+    **{f"page_{p}": _page_load(p) for p in PAGES},
+    "rerun_ocr": _rerun("ocr"),
+    "rerun_inventory": _rerun("inventory"),
+    "warm_inventory": _warm_page("inventory"),
+    "warm_hazard": _warm_page("hazard"),
+    "warm_default_inventory": _warm_default_page("inventory"),
+    "warm_default_hazard": _warm_default_page("hazard"),
+    "lab_inventory": _scoped_page("inventory"),
+    "lab_hazard": _scoped_page("hazard"),
+    "bulk_delete": sc_bulk_delete,
+    "restore": sc_restore,
+    "ocr": sc_ocr,
+    "ocr_save": sc_ocr_save,
+    "ocr_dup": sc_ocr_dup,
+}
+
+
+def run(sizes, scenarios, n_rows=20, latency_ms=0.0, rate_limit=0.0, timeout=600.0) -> list[dict]:
+    results = []
+    with MockServer(latency_ms=latency_ms, rate_limit=rate_limit) as srv:
+        for size in sizes:
+            dataset = generate(size)
+            for name in scenarios:
+                srv.state.load(dataset)  # 쓰기 시나리오 간 상태 초기화
+                st.cache_resource.clear()  # 프로세스 공용 캐시(중복 인덱스 등)도 새 서버 상태에 맞춰 비움
+                st.cache_data.clear()
+                at = _new_app(srv, timeout)
+                try:
+                    res = SCENARIOS[name](srv, at, n_rows)
+                except Exception as e:
+                    res = {"error": str(e)}
+                results.append({"scenario": name, "size": size, **res})
+                _print_row(results[-1])
+    return results
+
+
+def _print_row(r: dict):
+    if "error" in r:
+        print(f"{r['scenario']:<22} {r['size']:>7}  ERROR {r['error']}")
+        return
+    secs = " ".join(f"[{k}]={v:.0f}" for k, v in r["sections_ms"].items())
+    calls = " ".join(f"{k}={v}" for k, v in sorted(r["calls"].items()) if ":" not in k)
+    print(f"{r['scenario']:<22} {r['size']:>7}  {r['wall_ms']:>9.1f} ms  api={r['api_calls']:<4} [{calls}]  {secs}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    ap.add_argument("--rows", type=int, default=20, help="bulk_delete/restore 대상 건수")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="목 서버 요청당 지연")
+    ap.add_argument("--rate-limit", type=float, default=0.0, help="base 당 초당 요청 한도 (Airtable=5)")
+    ap.add_argument("--timeout", type=float, default=600.0)
+    ap.add_argument("--json", help="결과 JSON 저장 경로")
+    args = ap.parse_args(argv)
+
+    results = run(args.sizes, args.scenarios, args.rows, args.latency_ms, args.rate_limit, args.timeout)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
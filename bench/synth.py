@@ -0,0 +1,96 @@
+"""벤치마크용 합성 데이터 생성기 (트랜잭션 / Materials / 휴지통)"""
+import json, random
+from datetime import datetime, timedelta, timezone
+
+# data/chem_ref.csv 에 있는 CAS 일부 + 임의 생성 CAS
+KNOWN_CAS = ["64-17-5", "67-63-0", "67-56-1", "67-64-1", "75-05-8", "108-88-3", "110-54-3", "60-29-7"]
+
+DEPTS = ["화학공학과", "안전공학과", "신소재공학과", "기계시스템디자인공학과"]
+BUILDINGS = ["청운관", "제1공학관", "제2공학관", "어울림관"]
+IO_TYPES = [("입고", 0.55), ("출고", 0.3), ("반품", 0.05), ("폐기", 0.1)]
+UNITS = [("g", 0.3), ("mL", 0.3), ("L", 0.15), ("kg", 0.1), ("EA", 0.1), ("cyl", 0.05)]
+
+
+def make_cas(rng: random.Random) -> str:
+    """체크섬이 맞는 CAS 번호 생성"""
+    body = str(rng.randint(1000, 999999999))
+    total = sum((i + 1) * int(d) for i, d in enumerate(reversed(body)))
+    return f"{body[:-2]}-{body[-2:]}-{total % 10}"
+
+
+def _pick(rng, weighted):
+    return rng.choices([v for v, _ in weighted], weights=[w for _, w in weighted])[0]
+
+
+def _rec_id(prefix: str, i: int) -> str:
+    return f"{prefix}{i:014d}"
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def generate(n_tx: int, n_cas: int | None = None, n_labs: int | None = None,
+             trash_ratio: float = 0.02, days: int = 730, seed: int = 42) -> dict:
+    """n_tx 건 트랜잭션과 그에 맞는 Materials / 휴지통 레코드를 생성
+
+    반환: {"tx": [...], "materials": [...], "trash": [...]} (Airtable 레코드 형식)
+    """
+    rng = random.Random(seed)
+    n_cas = n_cas or max(len(KNOWN_CAS), min(5000, n_tx // 20))
+    n_labs = n_labs or max(4, min(400, n_tx // 250))
+
+    cas_pool = list(KNOWN_CAS)
+    while len(cas_pool) < n_cas:
+        c = make_cas(rng)
+        if c not in cas_pool:
+            cas_pool.append(c)
+
+    labs = [(rng.choice(DEPTS), rng.choice(BUILDINGS), str(rng.randint(101, 599)), f"Lab-{i:03d}")
+            for i in range(n_labs)]
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    created0 = now - timedelta(days=days)
+
+    materials = []
+    for i, cas in enumerate(cas_pool):
+        f = {"CAS": cas}
+        if rng.random() < 0.7:
+            f["name"] = f"Chem-{i:05d}"
+        if rng.random() < 0.3:
+            f["density_g_per_ml"] = round(rng.uniform(0.6, 1.9), 3)
+        if rng.random() < 0.2:
+            f["container_volume_L"] = rng.choice([0.5, 1.0, 2.5, 4.0, 20.0])
+        materials.append({"id": _rec_id("recMAT", i), "createdTime": _iso(created0), "fields": f})
+
+    tx = []
+    for i in range(n_tx):
+        dept, bld, room, lab = rng.choice(labs)
+        io = _pick(rng, IO_TYPES)
+        sign = 1 if io == "입고" else -1
+        # 최근 데이터가 많도록 치우친 분포
+        t = now - timedelta(seconds=int(days * 86400 * rng.random() ** 2))
+        f = {
+            "Name": f"label_{i}.jpg",
+            "ocr_text": f"synthetic label {i}",
+            "CAS": rng.choice(cas_pool),
+            "dept": dept, "lab": lab, "building": bld, "room": room,
+            "io_type": io,
+            "qty": sign * rng.randint(1, 500),
+            "unit": _pick(rng, UNITS),
+            "tx_time": _iso(t),
+            "deleted": False,
+        }
+        tx.append({"id": _rec_id("recTX", i), "createdTime": _iso(t), "fields": f})
+
+    trash = []
+    for i in range(int(n_tx * trash_ratio)):
+        orig = dict(rng.choice(tx))
+        orig["id"] = _rec_id("recDEL", i)
+        trash.append({"id": _rec_id("recTRS", i), "createdTime": _iso(now), "fields": {
+            "original_record_id": orig["id"],
+            "deleted_at": _iso(now - timedelta(days=rng.randint(0, 30))),
+            "raw": json.dumps(orig, ensure_ascii=False),
+        }})
+
+    return {"tx": tx, "materials": materials, "trash": trash}
@@ -0,0 +1,68 @@
+import streamlit as st
+
+# =========================
+# Secrets (Streamlit → Secrets)
+# =========================
+AIRTABLE_TOKEN        = st.secrets.get("AIRTABLE_TOKEN", "")
+AIRTABLE_BASE_ID      = st.secrets.get("AIRTABLE_BASE_ID", "")
+
+# 기록 테이블(트랜잭션)
+AIRTABLE_TABLE_ID     = st.secrets.get("AIRTABLE_TABLE_ID", "")                 # tbl... 형태 권장
+AIRTABLE_TABLE_NAME   = st.secrets.get("AIRTABLE_TABLE_NAME", "Lab OCR Results")
+
+# 마스터 테이블(Materials)
+MATERIALS_TABLE_ID    = st.secrets.get("MATERIALS_TABLE_ID", "")
+MATERIALS_TABLE_NAME  = st.secrets.get("MATERIALS_TABLE_NAME", "Materials")
+
+# 휴지통 테이블(선택) — 없으면 소프트삭제
+TRASH_TABLE_ID        = st.secrets.get("TRASH_TABLE_ID", "")
+TRASH_TABLE_NAME      = st.secrets.get("TRASH_TABLE_NAME", "Lab OCR Trash")
+
+IMGBB_KEY             = st.secrets.get("IMGBB_KEY", "")
+DEFAULT_GCP_KEY       = st.secrets.get("GCP_KEY", "")
+
+# 외부 API 엔드포인트 (로컬 목 서버/벤치마크용으로 덮어쓰기 가능)
+AIRTABLE_API_URL      = st.secrets.get("AIRTABLE_API_URL", "https://api.airtable.com/v0")
+VISION_API_URL        = st.secrets.get("VISION_API_URL", "https://vision.googleapis.com/v1")
+IMGBB_API_URL         = st.secrets.get("IMGBB_API_URL", "https://api.imgbb.com/1")
+PUBCHEM_API_URL       = st.secrets.get("PUBCHEM_API_URL", "https://pubchem.ncbi.nlm.nih.gov/rest/pug")
+
+# 관리자 계측 패널 (Secrets METRICS_PANEL=true 또는 URL ?debug=1)
+METRICS_PANEL         = bool(st.secrets.get("METRICS_PANEL", False))
+
+# 중복 스캔 해시를 트랜잭션 테이블에 저장 (img_sha / img_dhash / ocr_simhash 텍스트 필드 필요)
+DUP_HASH_FIELDS       = bool(st.secrets.get("DUP_HASH_FIELDS", False))
+
+# Airtable 요청 한도 (base 당 초당 요청 수, 0 이면 제한 없음) — 병렬 로딩도 이 한도를 나눠 씀
+AIRTABLE_RATE_LIMIT   = float(st.secrets.get("AIRTABLE_RATE_LIMIT", 5))
+
+# 라벨 이미지 저장소: imgbb | local | s3 (비우면 IMGBB_KEY 있을 때 imgbb, 없으면 이미지 저장 안 함)
+IMAGE_BACKEND         = st.secrets.get("IMAGE_BACKEND", "imgbb" if IMGBB_KEY else "")
+IMAGE_LOCAL_DIR       = st.secrets.get("IMAGE_LOCAL_DIR", "static/images")
+IMAGE_PUBLIC_URL      = st.secrets.get("IMAGE_PUBLIC_URL", "")   # local/s3 공개 주소 (예: https://<앱>/app/static/images)
+IMAGE_THUMB_FIELD     = st.secrets.get("IMAGE_THUMB_FIELD", "")  # 썸네일 URL 을 넣을 트랜잭션 필드(선택)
+S3_ENDPOINT_URL       = st.secrets.get("S3_ENDPOINT_URL", "")    # MinIO 등 (예: http://localhost:9000)
+S3_BUCKET             = st.secrets.get("S3_BUCKET", "")
+S3_REGION             = st.secrets.get("S3_REGION", "")
+S3_ACCESS_KEY         = st.secrets.get("S3_ACCESS_KEY", "")
+S3_SECRET_KEY         = st.secrets.get("S3_SECRET_KEY", "")
+
+# 캐시 유지 시간(초): 범위별 스냅샷 / 학교 전체 요약 / 범위 선택 목록
+#   TTL 이 지나면 기존 스냅샷을 보여주며 백그라운드에서 새로 받고, STALE 보다 오래되면 기다려서 새로 받음
+SNAPSHOT_TTL_S        = float(st.secrets.get("SNAPSHOT_TTL_S", 60))
+SNAPSHOT_STALE_S      = float(st.secrets.get("SNAPSHOT_STALE_S", 600))
+ROLLUP_TTL_S          = int(st.secrets.get("ROLLUP_TTL_S", 900))
+SCOPE_LIST_TTL_S      = float(st.secrets.get("SCOPE_LIST_TTL_S", 3600))
+
+# 화학물질 기준 데이터 (CAS → 유별/밀도/수용성). 비우면 data/chem_ref.csv — 파일이 바뀌면 이 간격(초)으로 다시 읽음
+CHEM_REF_PATH         = st.secrets.get("CHEM_REF_PATH", "")
+CHEM_REF_CHECK_S      = float(st.secrets.get("CHEM_REF_CHECK_S", 30))
+# 지정수량(L) 덮어쓰기 — 예) [HAZARD_LIMITS_L] 에 "제2석유류(비수용성)" = 1000
+HAZARD_LIMITS_L       = dict(st.secrets.get("HAZARD_LIMITS_L", {}))
+
+# 시작 예열 (공용 캐시·연결 미리 채움) / 상태 엔드포인트 포트(/healthz, /readyz — 0 이면 끔)
+WARMUP                = bool(st.secrets.get("WARMUP", True))
+HEALTH_PORT           = int(st.secrets.get("HEALTH_PORT", 0))
+# 예열 때 미리 불러올 범위 — "*" 는 새 세션이 처음 보는 전체 범위(전체 테이블 + 학교 전체 요약).
+# 실험실 이름을 더 적을 수 있음 — 예) WARMUP_LABS = ["*", "Lab-001"]. [] 이면 범위 목록만 예열
+WARMUP_LABS           = list(st.secrets.get("WARMUP_LABS", ["*"]))
@@ -0,0 +1,229 @@
+"""리런 단위 계측: 외부 호출/구간별 횟수·바이트·지연 히스토그램
+
+- http(op, method, url, ...)  : requests 호출을 감싸 op 별로 기록
+- timed(name)                 : with 블록(탭 계산, 페이지네이션 등) 소요 시간 기록
+- begin_rerun(store)          : 리런마다 새 기록 시작 (직전 기록은 누적/로그로 마감)
+- prometheus_text() / to_json : 프로세스 누적치 / 리런 기록 내보내기
+- warm_connection(url)        : 공용 연결 풀에 해당 호스트 연결을 미리 열어 둠 (예열용)
+
+streamlit 에 의존하지 않으므로 벤치마크/서비스 모듈에서도 그대로 import 가능.
+"""
+import json, logging, threading, time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger("lab_ocr.metrics")
+
+# 지연 히스토그램 버킷 상한(ms) — 마지막은 +Inf
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+KIND_HTTP, KIND_SECTION = "http", "section"
+
+
+@dataclass(slots=True)
+class OpStats:
+    count: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: list = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+
+    def add(self, ms: float, bytes_in: int = 0, bytes_out: int = 0, error: bool = False):
+        self.count += 1
+        self.errors += int(error)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, ub in enumerate(BUCKETS_MS):
+            if ms <= ub:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def merge(self, other: "OpStats"):
+        self.count += other.count
+        self.errors += other.errors
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def quantile_ms(self, q: float) -> float | None:
+        """버킷 상한 기준 근사 분위수"""
+        if not self.count:
+            return None
+        target, acc = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            acc += n
+            if acc >= target:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class Recorder:
+    """한 번의 리런(또는 벤치마크 구간) 동안의 기록"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started = time.time()
+        self.wall_ms = None
+        self.ops: dict[tuple[str, str], OpStats] = {}
+        self._lock = threading.Lock()  # 병렬 로더 스레드에서도 기록
+
+    def record(self, kind: str, name: str, ms: float, **kw):
+        with self._lock:
+            self.ops.setdefault((kind, name), OpStats()).add(ms, **kw)
+
+    def finish(self):
+        if self.wall_ms is None:
+            self.wall_ms = (time.time() - self.started) * 1000.0
+        return self
+
+    def rows(self) -> list[dict]:
+        out = []
+        for (kind, name), s in sorted(self.ops.items(), key=lambda kv: -kv[1].total_ms):
+            out.append({"kind": kind, "name": name, "count": s.count, "errors": s.errors,
+                        "bytes_in": s.bytes_in, "bytes_out": s.bytes_out,
+                        "total_ms": round(s.total_ms, 1), "p50_ms": s.quantile_ms(0.5),
+                        "p95_ms": s.quantile_ms(0.95), "max_ms": round(s.max_ms, 1)})
+        return out
+
+    def to_json(self) -> str:
+        return json.dumps({"label": self.label, "started": self.started,
+                           "wall_ms": None if self.wall_ms is None else round(self.wall_ms, 1),
+                           "ops": self.rows()}, ensure_ascii=False)
+
+
+_current: ContextVar[Recorder | None] = ContextVar("lab_ocr_metrics", default=None)
+_totals: dict[tuple[str, str], OpStats] = {}
+_totals_lock = threading.Lock()
+HISTORY_LEN = 20
+
+
+def current() -> Recorder | None:
+    return _current.get()
+
+
+def use(rec: Recorder | None):
+    """현재 컨텍스트(스레드)의 기록기를 지정 — 작업 스레드에 전달할 때 사용"""
+    _current.set(rec)
+
+
+def record(kind: str, name: str, ms: float, **kw):
+    rec = _current.get()
+    if rec is not None:
+        rec.record(kind, name, ms, **kw)
+
+
+def _close(rec: Recorder):
+    rec.finish()
+    with _totals_lock:
+        for key, s in rec.ops.items():
+            _totals.setdefault(key, OpStats()).merge(s)
+    log.info(rec.to_json())
+
+
+def begin_rerun(store, label: str = "") -> Recorder:
+    """store(세션 상태 dict 류)에 새 Recorder 를 걸고, 직전 기록은 마감해 history 로 보냄"""
+    prev = store.get("_metrics_cur")
+    if prev is not None:
+        _close(prev)
+        hist = store.setdefault("_metrics_hist", [])
+        hist.append(prev)
+        del hist[:-HISTORY_LEN]
+    rec = Recorder(label)
+    store["_metrics_cur"] = rec
+    _current.set(rec)
+    return rec
+
+
+@contextmanager
+def timed(name: str, kind: str = KIND_SECTION):
+    t0 = time.perf_counter()
+    err = False
+    try:
+        yield
+    except Exception:
+        err = True
+        raise
+    finally:
+        record(kind, name, (time.perf_counter() - t0) * 1000.0, error=err)
+
+
+# 프로세스 공용 연결 풀 — 호스트별 keep-alive 로 TLS 핸드셰이크는 연결당 한 번
+# (쿠키를 쓰는 API 가 없어 스레드 간 Session 공유 가능)
+POOL_MAXSIZE = 16   # 호스트당 동시 연결 (병렬 로더 + 이미지 업로드 스레드)
+_session = requests.Session()
+for _scheme in ("https://", "http://"):
+    _session.mount(_scheme, HTTPAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE))
+
+
+def warm_connection(url: str, timeout: float = 5.0) -> bool:
+    """url 호스트로 연결(TLS 포함)을 열어 풀에 남겨 둠. 응답 코드는 상관없음"""
+    parts = urlsplit(url)
+    try:
+        _session.head(f"{parts.scheme}://{parts.netloc}/", timeout=timeout)
+        return True
+    except requests.RequestException:
+        return False
+
+
+def http(op: str, method: str, url: str, nbytes_out: int | None = None, **kw) -> requests.Response:
+    """공용 Session 요청 래퍼. 응답/요청 바이트, 지연, 4xx/5xx·예외를 op 로 기록"""
+    if nbytes_out is None:
+        body = kw.get("json")
+        nbytes_out = len(json.dumps(body)) if body is not None else 0
+    t0 = time.perf_counter()
+    r, err = None, True
+    try:
+        r = _session.request(method, url, **kw)
+        err = r.status_code >= 400
+        return r
+    finally:
+        record(KIND_HTTP, op, (time.perf_counter() - t0) * 1000.0,
+               bytes_in=len(r.content) if r is not None else 0, bytes_out=nbytes_out, error=err)
+
+
+def totals() -> dict[tuple[str, str], OpStats]:
+    with _totals_lock:
+        return {k: OpStats(s.count, s.errors, s.bytes_in, s.bytes_out, s.total_ms, s.max_ms, list(s.buckets))
+                for k, s in _totals.items()}
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(prefix: str = "lab_ocr") -> str:
+    """프로세스 누적치를 Prometheus text exposition 형식으로"""
+    lines = []
+    snap = totals()
+    for metric, help_ in (("calls_total", "호출/구간 실행 횟수"), ("errors_total", "오류 횟수"),
+                          ("bytes_in_total", "응답 바이트"), ("bytes_out_total", "요청 바이트")):
+        lines.append(f"# HELP {prefix}_{metric} {help_}")
+        lines.append(f"# TYPE {prefix}_{metric} counter")
+        attr = {"calls_total": "count", "errors_total": "errors",
+                "bytes_in_total": "bytes_in", "bytes_out_total": "bytes_out"}[metric]
+        for (kind, name), s in sorted(snap.items()):
+            lines.append(f'{prefix}_{metric}{{kind="{kind}",op="{_esc(name)}"}} {getattr(s, attr)}')
+    lines.append(f"# HELP {prefix}_latency_ms 지연(ms)")
+    lines.append(f"# TYPE {prefix}_latency_ms histogram")
+    for (kind, name), s in sorted(snap.items()):
+        lbl = f'kind="{kind}",op="{_esc(name)}"'
+        acc = 0
+        for ub, n in zip((*BUCKETS_MS, "+Inf"), s.buckets):
+            acc += n
+            lines.append(f'{prefix}_latency_ms_bucket{{{lbl},le="{ub}"}} {acc}')
+        lines.append(f"{prefix}_latency_ms_sum{{{lbl}}} {s.total_ms:.3f}")
+        lines.append(f"{prefix}_latency_ms_count{{{lbl}}} {s.count}")
+    return "\n".join(lines) + "\n"
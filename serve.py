@@ -0,0 +1,15 @@
+"""서버 부팅과 동시에 예열을 시작하고 Streamlit 을 띄움 (같은 프로세스라 캐시를 공유)
+
+    python serve.py [--server.port 8501 …]      # streamlit run app.py 와 같은 옵션
+"""
+import sys
+from pathlib import Path
+
+from streamlit.web import cli as stcli
+
+import warmup
+
+if __name__ == "__main__":
+    warmup.start()
+    sys.argv = ["streamlit", "run", str(Path(__file__).with_name("app.py")), *sys.argv[1:]]
+    sys.exit(stcli.main())
@@ -0,0 +1,273 @@
+import streamlit as st
+import json, re, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote, unquote
+
+import metrics
+from config import (AIRTABLE_TOKEN, AIRTABLE_BASE_ID, AIRTABLE_API_URL, AIRTABLE_RATE_LIMIT,
+                    AIRTABLE_TABLE_ID, AIRTABLE_TABLE_NAME,
+                    MATERIALS_TABLE_ID, MATERIALS_TABLE_NAME,
+                    TRASH_TABLE_ID, TRASH_TABLE_NAME, SNAPSHOT_TTL_S)
+
+def table_ref(table_id, table_name):
+    return table_id or quote(table_name, safe="")
+
+def at_headers():
+    return {"Authorization": f"Bearer {AIRTABLE_TOKEN}", "Content-Type": "application/json"}
+
+# =========================
+# 요청 한도 (Airtable: base 당 초당 5회) — 병렬 로더 포함 프로세스 전체가 공유
+# =========================
+class RateBudget:
+    """토큰 버킷. rate<=0 이면 제한 없음. burst=1 이면 1/rate 초 간격으로 고르게 내보냄
+    (1초 슬라이딩 윈도로 세는 서버에서 burst 를 크게 잡으면 첫 1초에 한도를 넘김)"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = self.burst
+        self._t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._t) * self.rate)
+                self._t = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+_budget = RateBudget(AIRTABLE_RATE_LIMIT * 0.9)  # 도착 시각 지터 여유 10%
+AT_MAX_RETRY = 4
+
+def at_request(op: str, method: str, url: str, **kw):
+    """Airtable 호출 공용 경로: 요청 한도만큼 대기, 429 면 Retry-After/지수 백오프 후 재시도"""
+    for attempt in range(AT_MAX_RETRY + 1):
+        _budget.acquire()
+        r = metrics.http(op, method, url, headers=at_headers(), **kw)
+        if r.status_code != 429 or attempt == AT_MAX_RETRY:
+            return r
+        try:
+            wait = float(r.headers.get("Retry-After") or 0)
+        except ValueError:
+            wait = 0
+        time.sleep(min(30.0, wait or 0.5 * 2 ** attempt))
+    return r
+
+_UNKNOWN_FIELD_RE = re.compile(r'Unknown field name: \\?"(.+?)\\?"')
+_missing_fields: dict[str, set] = {}  # table -> 이 base 에 없는 필드 (fields[] 에서 제외)
+
+def at_get_all(base_id, table_id_or_name, formula: str | None = None, fields: list | None = None,
+               sort: list | None = None, max_records: int = 0):
+    """Airtable 전 레코드 조회 (페이지네이션 처리). formula/fields 로 서버측 필터·필드 제한,
+    sort=[(필드, "asc"|"desc"), …] 로 정렬, max_records 로 개수 제한
+
+    fields 에 base 에 없는 필드가 있으면(422 UNKNOWN_FIELD_NAME) 그 필드를 빼고 다시 조회."""
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}"
+    with metrics.timed(f"at_get_all:{unquote(table_id_or_name)}"):
+        while True:
+            missing = _missing_fields.get(table_id_or_name, set())
+            want = [f for f in fields if f not in missing] if fields else None
+            out, params = [], {"pageSize": 100}
+            if formula:
+                params["filterByFormula"] = formula
+            if want:
+                params["fields[]"] = want
+            for i, (fld, direction) in enumerate(sort or ()):
+                params[f"sort[{i}][field]"] = fld
+                params[f"sort[{i}][direction]"] = direction
+            if max_records:
+                params["maxRecords"] = max_records
+            while True:
+                r = at_request("airtable.list", "GET", url, params=params, timeout=30)
+                if r.status_code == 422 and want:
+                    m = _UNKNOWN_FIELD_RE.search(r.text)
+                    if m and m.group(1) in want:
+                        _missing_fields.setdefault(table_id_or_name, set()).add(m.group(1))
+                        break  # 처음부터 다시
+                r.raise_for_status()
+                data = r.json()
+                out.extend(data.get("records", []))
+                off = data.get("offset")
+                if not off:
+                    return out
+                params["offset"] = off
+
+def at_get_many(specs: dict) -> dict:
+    """여러 테이블을 동시에 전체 조회. specs: {이름: (table, formula, fields)}
+
+    반환: {이름: 레코드 list 또는 Exception}. 요청 한도는 at_request 가 공유해 지킨다."""
+    rec = metrics.current()
+
+    def one(spec):
+        metrics.use(rec)  # 작업 스레드에서도 같은 리런 기록기에 기록
+        table, formula, fields = spec
+        try:
+            return at_get_all(AIRTABLE_BASE_ID, table, formula=formula, fields=fields)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, len(specs)), thread_name_prefix="at-load") as ex:
+        futs = {name: ex.submit(one, spec) for name, spec in specs.items()}
+        return {name: f.result() for name, f in futs.items()}
+
+def at_find_one(base_id, table_id_or_name, formula: str):
+    """filterByFormula로 단건 조회"""
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}"
+    r = at_request("airtable.find", "GET", url,
+                   params={"maxRecords": 1, "filterByFormula": formula},
+                   timeout=20)
+    r.raise_for_status()
+    js = r.json()
+    return (js.get("records") or [None])[0]
+
+def at_get_record(base_id, table_id_or_name, record_id: str):
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}/{record_id}"
+    r = at_request("airtable.get", "GET", url, timeout=20)
+    if r.status_code == 200:
+        return r.json()
+    return None
+
+def at_update_record(base_id, table_id_or_name, record_id: str, fields: dict):
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}/{record_id}"
+    r = at_request("airtable.update", "PATCH", url, json={"fields": fields}, timeout=20)
+    return r
+
+def at_delete_record(base_id, table_id_or_name, record_id: str):
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}/{record_id}"
+    r = at_request("airtable.delete", "DELETE", url, timeout=20)
+    return r
+
+def at_create_record(base_id, table_id_or_name, fields: dict):
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}"
+    r = at_request("airtable.create", "POST", url, json={"fields": fields}, timeout=20)
+    return r
+
+AT_BATCH = 10      # Airtable 쓰기 요청당 최대 레코드 수
+AT_ID_CHUNK = 50   # RECORD_ID() 조회 한 번에 넣을 id 수 (URL 길이 제한)
+
+def at_get_by_ids(base_id, table_id_or_name, ids, fields: list | None = None) -> dict:
+    """여러 레코드를 id 로 한꺼번에 조회 → {id: 레코드}. 없는(이미 지워진) id 는 빠짐"""
+    ids = list(dict.fromkeys(ids))
+    out = {}
+    for i in range(0, len(ids), AT_ID_CHUNK):
+        chunk = ids[i:i + AT_ID_CHUNK]
+        formula = "OR(" + ", ".join(f"RECORD_ID() = '{rid}'" for rid in chunk) + ")"
+        for r in at_get_all(base_id, table_id_or_name, formula=formula, fields=fields):
+            out[r["id"]] = r
+    return out
+
+def at_create_many(base_id, table_id_or_name, fields_list: list[dict]) -> tuple[list, list]:
+    """여러 레코드를 10건씩 묶어 생성 → (입력 순서의 생성 레코드, 실패 묶음은 None / 실패 메시지 목록)"""
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}"
+    created, errors = [], []
+    for i in range(0, len(fields_list), AT_BATCH):
+        chunk = fields_list[i:i + AT_BATCH]
+        r = at_request("airtable.create", "POST", url, timeout=30,
+                       json={"records": [{"fields": f} for f in chunk]})
+        if r.status_code in (200, 201):
+            created.extend(r.json().get("records", []))
+        else:
+            created.extend([None] * len(chunk))
+            errors.append(r.text[:300])
+    return created, errors
+
+def at_update_many(base_id, table_id_or_name, updates: list[tuple[str, dict]]) -> tuple[list, list]:
+    """(id, fields) 목록을 10건씩 PATCH → (갱신된 레코드 — 전체 필드, 실패 메시지 목록)"""
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}"
+    updated, errors = [], []
+    for i in range(0, len(updates), AT_BATCH):
+        chunk = updates[i:i + AT_BATCH]
+        r = at_request("airtable.update", "PATCH", url, timeout=30,
+                       json={"records": [{"id": rid, "fields": f} for rid, f in chunk]})
+        if r.status_code == 200:
+            updated.extend(r.json().get("records", []))
+        else:
+            errors.append(r.text[:300])
+    return updated, errors
+
+def at_delete_many(base_id, table_id_or_name, ids: list[str]) -> tuple[list, list]:
+    """10건씩 삭제 → (삭제된 id, 실패 메시지 목록)"""
+    url = f"{AIRTABLE_API_URL}/{base_id}/{table_id_or_name}"
+    deleted, errors = [], []
+    for i in range(0, len(ids), AT_BATCH):
+        r = at_request("airtable.delete", "DELETE", url, timeout=30, params={"records[]": ids[i:i + AT_BATCH]})
+        if r.status_code == 200:
+            deleted.extend(d["id"] for d in r.json().get("records", []) if d.get("deleted"))
+        else:
+            errors.append(r.text[:300])
+    return deleted, errors
+
+def tx_ref() -> str:
+    return table_ref(AIRTABLE_TABLE_ID, AIRTABLE_TABLE_NAME)
+
+def materials_ref() -> str:
+    return table_ref(MATERIALS_TABLE_ID, MATERIALS_TABLE_NAME)
+
+def save_to_airtable(fields: dict):
+    """트랜잭션 1건 생성 → (ok, 메시지, 생성된 레코드 — 실패 시 {})"""
+    if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+        return False, "Airtable secrets 미설정", {}
+    tref = tx_ref()
+    url = f"{AIRTABLE_API_URL}/{AIRTABLE_BASE_ID}/{tref}"
+    r = at_request("airtable.create", "POST", url, json={"fields": fields}, timeout=30)
+    ok = r.status_code in (200, 201)
+    return ok, (r.text if not ok else "OK"), (r.json() if ok else {})
+
+# ===== 휴지통(Undo) 관련 =====
+def trash_enabled() -> bool:
+    return bool(TRASH_TABLE_ID or TRASH_TABLE_NAME)
+
+def trash_ref() -> str:
+    return table_ref(TRASH_TABLE_ID, TRASH_TABLE_NAME)
+
+def trash_fields(orig_record: dict) -> dict:
+    """
+    휴지통 테이블에 원본을 JSON으로 저장할 필드.
+    휴지통 테이블 필수 필드:
+      - original_record_id (single line)
+      - deleted_at (date/time)
+      - raw (long text)
+    """
+    return {
+        "original_record_id": orig_record.get("id", ""),
+        "deleted_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00","Z"),
+        "raw": json.dumps(orig_record, ensure_ascii=False)
+    }
+
+# 휴지통 목록 캐시 (프로세스 공용) — 쓰기 응답으로 patch_trash, SNAPSHOT_TTL_S 지나면 다시 조회
+@st.cache_resource(show_spinner=False)
+def _trash_cache() -> dict:
+    return {"at": 0.0, "recs": None, "lock": threading.Lock()}
+
+def get_trash_all():
+    """휴지통 테이블 전체 로드"""
+    if not trash_enabled():
+        return []
+    c = _trash_cache()
+    with c["lock"]:
+        if c["recs"] is not None and time.monotonic() - c["at"] < SNAPSHOT_TTL_S:
+            return list(c["recs"])
+    try:
+        recs = at_get_all(AIRTABLE_BASE_ID, trash_ref())
+    except Exception as e:
+        st.warning(f"휴지통 로드 실패: {e}")
+        return []
+    with c["lock"]:
+        c["at"], c["recs"] = time.monotonic(), recs
+    return list(recs)
+
+def patch_trash(added=(), removed=()):
+    """휴지통 캐시에 새로 만든 레코드 추가 / 지운 id 제거 (다시 조회하지 않음)"""
+    c = _trash_cache()
+    removed = set(removed)
+    with c["lock"]:
+        if c["recs"] is not None:
+            c["recs"] = [r for r in c["recs"] if r.get("id") not in removed] + [r for r in added if r]
@@ -0,0 +1,237 @@
+"""화학물질 기준 데이터 (CAS → 제4류 유별, 밀도, 수용성)
+
+data/chem_ref.csv (또는 Secrets CHEM_REF_PATH) 를 CAS 키 dict 로 들고 있다가 조회한다 (Airtable 호출 없음).
+파일이 바뀌면 CHEM_REF_CHECK_S 간격으로 수정 시각을 보고 다시 읽어 통째로 교체한다 — 재시작 불필요.
+버전은 파일 머리의 "# version: …" 줄(없으면 내용 해시)이고, 바뀌면 캐시된 스냅샷의 유별/밀도 열만
+그 자리에서 다시 분류한다 (Airtable 재조회 없음, services.inventory.reclassify).
+
+대량 가져오기 (검증 · 정규화 · 병합 후 새 버전으로 저장):
+    python -m services.chemref import 원본1.csv 원본2.csv [--into data/chem_ref.csv]
+    python -m services.chemref check [data/chem_ref.csv]
+
+열: cas, name, hazard_class, density_g_per_ml, water_soluble, flash_point_c, boiling_point_c
+hazard_class 가 비어 있으면 인화점/끓는점으로 판정 (알코올류·동식물유류는 직접 적어야 함).
+"""
+import argparse, csv, hashlib, io, os, re, sys, threading, time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "chem_ref.csv"
+COLUMNS = ["cas", "name", "hazard_class", "density_g_per_ml", "water_soluble", "flash_point_c", "boiling_point_c"]
+
+PETROLEUM = ("제1석유류", "제2석유류", "제3석유류")   # 수용성/비수용성 구분이 있는 유별
+SIMPLE_CLASSES = ("특수인화물", "알코올류", "제4석유류", "동식물유류")
+
+@dataclass(frozen=True, slots=True)
+class ChemRef:
+    name: str
+    hazard_class: str | None
+    density: float | None          # g/mL
+    water_soluble: bool | None
+
+@dataclass(slots=True)
+class RefTable:
+    version: str
+    path: str
+    mtime: float
+    items: dict                    # cas -> ChemRef
+    errors: list                   # 읽으면서 버린 줄 ("줄번호: 사유")
+
+    @property
+    def is_seed(self) -> bool:
+        """저장소에 같이 들어 있는 기본 시드 그대로인지 (가져오기 전)"""
+        return self.version.endswith("-seed")
+
+# =========================
+# 정규화 / 판정
+# =========================
+_CAS_RE = re.compile(r"^\d{2,7}-\d{2}-\d$")
+_SPACE_RE = re.compile(r"[\s()]+")
+
+def valid_cas(cas: str) -> bool:
+    if not _CAS_RE.match(cas or ""):
+        return False
+    body = cas.replace("-", "")[:-1]
+    return sum((i + 1) * int(d) for i, d in enumerate(reversed(body))) % 10 == int(cas[-1])
+
+def parse_bool(v) -> bool | None:
+    s = str(v or "").strip().lower()
+    if s in ("y", "yes", "true", "1", "수용성", "o"):
+        return True
+    if s in ("n", "no", "false", "0", "비수용성", "x"):
+        return False
+    return None
+
+def parse_float(v) -> float | None:
+    try:
+        f = float(str(v).strip())
+    except (TypeError, ValueError):
+        return None
+    return f if f == f else None
+
+def normalize_class(raw, water_soluble: bool | None = None) -> str | None:
+    """표기 흔들림 정리 ("제1석유류 수용성" → "제1석유류(수용성)"). 석유류인데 수용성 표기가 없으면
+    water_soluble 로, 그것도 모르면 지정수량이 작은 비수용성으로 봄. 알 수 없는 이름은 None"""
+    s = _SPACE_RE.sub("", str(raw or ""))
+    if not s:
+        return None
+    if s in SIMPLE_CLASSES:
+        return s
+    for base in PETROLEUM:
+        if s.startswith(base):
+            rest = s[len(base):]
+            if rest == "수용성" or (rest == "" and water_soluble):
+                return f"{base}(수용성)"
+            if rest in ("비수용성", ""):
+                return f"{base}(비수용성)"
+    return None
+
+def classify_by_flash(flash_c: float | None, boil_c: float | None, water_soluble: bool | None) -> str | None:
+    """인화점(℃)·끓는점(℃)으로 제4류 유별 판정 (위험물안전관리법 시행령 별표1 기준, 발화점 조건은 제외)"""
+    if flash_c is None:
+        return None
+    if flash_c <= -20 and boil_c is not None and boil_c <= 40:
+        return "특수인화물"
+    for limit, base in ((21, "제1석유류"), (70, "제2석유류"), (200, "제3석유류")):
+        if flash_c < limit:
+            return normalize_class(base, water_soluble)
+    return "제4석유류" if flash_c < 250 else None
+
+def parse_rows(text: str) -> tuple[str, dict, list]:
+    """CSV 본문 → (선언된 버전 또는 "", {cas: ChemRef}, 오류 목록). 같은 CAS 는 뒤의 줄이 우선"""
+    version, body, line_no = "", [], []   # line_no: body 각 줄의 파일 줄 번호 (주석 줄 포함해 셈)
+    for i, line in enumerate(text.splitlines(), start=1):
+        if line.startswith("#"):
+            m = re.match(r"#\s*version:\s*(\S+)", line)
+            version = m.group(1) if m else version
+        else:
+            body.append(line)
+            line_no.append(i)
+    items, errors = {}, []
+    reader = csv.DictReader(body)
+    for r in reader:
+        n = line_no[reader.line_num - 1]
+        cas = (r.get("cas") or "").strip()
+        if not valid_cas(cas):
+            errors.append(f"{n}: CAS 형식/체크섬 오류 ({cas})")
+            continue
+        sol = parse_bool(r.get("water_soluble"))
+        raw = r.get("hazard_class")
+        hclass = normalize_class(raw, sol)
+        if raw and not hclass:
+            errors.append(f"{n}: 알 수 없는 유별 ({raw})")
+            continue
+        hclass = hclass or classify_by_flash(parse_float(r.get("flash_point_c")),
+                                             parse_float(r.get("boiling_point_c")), sol)
+        dens = parse_float(r.get("density_g_per_ml"))
+        items[sys.intern(cas)] = ChemRef((r.get("name") or "").strip(), hclass,
+                                         dens if dens and dens > 0 else None, sol)
+    return version, items, errors
+
+def load_table(path: Path) -> RefTable:
+    data = path.read_bytes()
+    version, items, errors = parse_rows(data.decode("utf-8-sig"))
+    return RefTable(version or hashlib.sha256(data).hexdigest()[:12], str(path),
+                    path.stat().st_mtime, items, errors)
+
+# =========================
+# 프로세스 공용 테이블 (수정 시각 보고 교체)
+# =========================
+_table: RefTable | None = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+def ref_path() -> Path:
+    from config import CHEM_REF_PATH   # 지연 import — 가져오기 CLI 는 secrets 없이 동작
+    return Path(CHEM_REF_PATH) if CHEM_REF_PATH else DEFAULT_PATH
+
+def reference() -> RefTable:
+    """현재 기준 테이블. 파일이 없거나 깨졌으면 직전 테이블 유지 (처음부터 없으면 빈 테이블)"""
+    global _table, _checked_at
+    from config import CHEM_REF_CHECK_S
+    now = time.monotonic()
+    if _table is not None and now - _checked_at < CHEM_REF_CHECK_S:
+        return _table
+    with _lock:
+        if _table is not None and now - _checked_at < CHEM_REF_CHECK_S:
+            return _table
+        _checked_at = now
+        path = ref_path()
+        try:
+            if _table is None or path.stat().st_mtime != _table.mtime or str(path) != _table.path:
+                _table = load_table(path)
+        except Exception:
+            if _table is None:
+                _table = RefTable("", str(path), 0.0, {}, [])
+        return _table
+
+def lookup(cas: str) -> ChemRef | None:
+    return reference().items.get(cas)
+
+def ref_version() -> str:
+    return reference().version
+
+# =========================
+# 가져오기 CLI
+# =========================
+def _fmt(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return "Y" if v else "N"
+    return f"{v:g}" if isinstance(v, float) else str(v)
+
+def write_table(path: Path, items: dict) -> str:
+    """정렬된 CSV 로 원자적 저장, 새 버전 반환 (날짜-내용해시)"""
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(COLUMNS)
+    for cas in sorted(items, key=lambda c: [int(p) for p in c.split("-")]):
+        e = items[cas]
+        w.writerow([cas, e.name, e.hazard_class or "", _fmt(e.density), _fmt(e.water_soluble), "", ""])
+    body = buf.getvalue()
+    version = f"{date.today():%Y%m%d}-{hashlib.sha256(body.encode()).hexdigest()[:8]}"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(f"# version: {version}\n{body}", encoding="utf-8")
+    os.replace(tmp, path)   # 앱이 반쯤 쓴 파일을 읽지 않도록
+    return version
+
+def _print_summary(items: dict, errors: list):
+    print(f"{len(items)}종")
+    for k, n in sorted(Counter(e.hazard_class or "미분류" for e in items.values()).items()):
+        print(f"  {k}: {n}")
+    for e in errors[:20]:
+        print(f"  ! {e}")
+    if len(errors) > 20:
+        print(f"  ! … 외 {len(errors) - 20}건")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="화학물질 기준 데이터 가져오기/검사")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_imp = sub.add_parser("import", help="CSV 들을 검증·정규화해 기준 파일에 병합")
+    p_imp.add_argument("sources", nargs="+", type=Path)
+    p_imp.add_argument("--into", type=Path, default=DEFAULT_PATH)
+    p_imp.add_argument("--replace", action="store_true", help="기존 내용을 버리고 새로 만듦")
+    p_chk = sub.add_parser("check", help="기준 파일 요약/오류 출력")
+    p_chk.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "check":
+        t = load_table(args.path)
+        print(f"version {t.version}")
+        _print_summary(t.items, t.errors)
+        return
+    items = {} if args.replace or not args.into.exists() else load_table(args.into).items
+    errors = []
+    for src in args.sources:
+        _, new, errs = parse_rows(src.read_text(encoding="utf-8-sig"))
+        items.update(new)
+        errors += [f"{src.name}:{e}" for e in errs]
+    version = write_table(args.into, items)
+    print(f"{args.into} ← version {version}")
+    _print_summary(items, errors)
+
+if __name__ == "__main__":
+    main()
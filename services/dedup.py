@@ -0,0 +1,193 @@
+import hashlib, io, re, threading, time
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+from PIL import Image  # streamlit 의존성으로 항상 설치됨
+
+from config import AIRTABLE_BASE_ID, DUP_HASH_FIELDS
+from services.airtable import at_get_all, tx_ref
+
+IMG_MAX_DIST = 10     # dHash 해밍거리 ≤ 이 값이면 같은 사진으로 봄 (64비트 중, 재압축 ~4 / 살짝 자르기·기울기 ~11)
+TEXT_MAX_DIST = 12    # OCR 텍스트 SimHash 해밍거리 (같은 CAS 일 때, 오인식 1~2자 ~10 / 다른 병 20+)
+INDEX_CAPACITY = 5000 # 최근 저장분만 유지
+RECENT_DAYS = 30
+
+# =========================
+# 해시
+# =========================
+def content_sha(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+def image_dhash(image_bytes: bytes) -> int | None:
+    """64비트 difference hash (9x8 흑백 축소 후 가로 인접 픽셀 비교). 디코딩 불가 시 None"""
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        img.draft("L", (64, 64))  # JPEG 은 디코딩 단계에서 축소 (대용량 사진도 빠름)
+        small = np.asarray(img.convert("L").resize((9, 8), Image.Resampling.BOX), dtype=np.int16)
+    except Exception:
+        return None
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+_NON_TEXT_RE = re.compile(r"[^0-9a-z가-힣]+")
+
+def text_simhash(text: str) -> int | None:
+    """OCR 텍스트 64비트 SimHash (공백·기호 제거 후 문자 4-gram) — 띄어쓰기/오인식 몇 글자에 둔감"""
+    s = _NON_TEXT_RE.sub("", (text or "").lower())
+    if not s:
+        return None
+    grams = {s[i:i + 4] for i in range(max(1, len(s) - 3))}
+    acc = np.zeros(64, dtype=np.int32)
+    for g in grams:
+        bits = np.unpackbits(np.frombuffer(hashlib.blake2b(g.encode(), digest_size=8).digest(), np.uint8))
+        acc += np.where(bits == 1, 1, -1).astype(np.int32)
+    return int.from_bytes(np.packbits(acc > 0).tobytes(), "big")
+
+_POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def hamming(arr: np.ndarray, h: int) -> np.ndarray:
+    """uint64 배열 각 원소와 h 의 해밍거리 (벡터 연산)"""
+    x = np.bitwise_xor(arr, np.uint64(h))
+    return _POP8[x.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+# =========================
+# 최근 저장분 인덱스 (프로세스 공용)
+# =========================
+@dataclass(slots=True)
+class ScanEntry:
+    sha: str
+    dhash: int | None
+    text_hash: int | None
+    cas: str
+    record_id: str
+    saved_at: float
+    label: str              # 파일명/실험실 등 표시용
+
+@dataclass(slots=True)
+class DupMatch:
+    entry: ScanEntry
+    reason: str             # "동일 파일" / "유사 이미지" / "같은 CAS·유사 텍스트"
+    distance: int
+
+class ScanIndex:
+    """최근 저장된 스캔의 해시를 고정 크기 링버퍼(uint64 배열)로 보관, 해밍거리 최근접 조회"""
+
+    def __init__(self, capacity: int = INDEX_CAPACITY):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._entries: list[ScanEntry | None] = [None] * capacity
+        self._img = np.zeros(capacity, dtype=np.uint64)
+        self._txt = np.zeros(capacity, dtype=np.uint64)
+        self._has_img = np.zeros(capacity, dtype=bool)
+        self._has_txt = np.zeros(capacity, dtype=bool)
+        self._by_sha: dict[str, int] = {}
+        self._next = 0
+
+    def __len__(self):
+        return sum(e is not None for e in self._entries)
+
+    def add(self, e: ScanEntry):
+        with self._lock:
+            i = self._next % self.capacity
+            old = self._entries[i]
+            if old is not None and self._by_sha.get(old.sha) == i:
+                del self._by_sha[old.sha]
+            self._entries[i] = e
+            self._has_img[i] = e.dhash is not None
+            self._img[i] = e.dhash or 0
+            self._has_txt[i] = e.text_hash is not None
+            self._txt[i] = e.text_hash or 0
+            if e.sha:
+                self._by_sha[e.sha] = i
+            self._next += 1
+
+    def match_image(self, sha: str, dhash: int | None) -> DupMatch | None:
+        with self._lock:
+            i = self._by_sha.get(sha)
+            if i is not None:
+                return DupMatch(self._entries[i], "동일 파일", 0)
+            if dhash is None or not self._has_img.any():
+                return None
+            d = np.where(self._has_img, hamming(self._img, dhash), 65)
+            j = int(d.argmin())
+            return DupMatch(self._entries[j], "유사 이미지", int(d[j])) if d[j] <= IMG_MAX_DIST else None
+
+    def match_text(self, cas: str, text_hash: int | None) -> DupMatch | None:
+        if not cas or text_hash is None:
+            return None
+        with self._lock:
+            same_cas = np.fromiter((e is not None and e.cas == cas for e in self._entries),
+                                   dtype=bool, count=self.capacity)
+            mask = same_cas & self._has_txt
+            if not mask.any():
+                return None
+            d = np.where(mask, hamming(self._txt, text_hash), 65)
+            j = int(d.argmin())
+            return DupMatch(self._entries[j], "같은 CAS·유사 텍스트", int(d[j])) if d[j] <= TEXT_MAX_DIST else None
+
+def _hex64(v) -> int | None:
+    """Airtable 에 저장된 16진 해시 → int (비었거나 깨진 값은 None)"""
+    try:
+        return int(v, 16) if v else None
+    except (TypeError, ValueError):
+        return None
+
+@st.cache_resource(show_spinner=False)
+def get_scan_index() -> ScanIndex:
+    """프로세스당 1개. DUP_HASH_FIELDS 가 켜져 있으면 Airtable 에 저장된 해시(최근 INDEX_CAPACITY 건)로 최초 1회 채움"""
+    idx = ScanIndex()
+    if DUP_HASH_FIELDS and AIRTABLE_BASE_ID:
+        try:
+            recs = at_get_all(AIRTABLE_BASE_ID, tx_ref(),
+                              formula="NOT({img_sha} = '')",
+                              fields=["img_sha", "img_dhash", "ocr_simhash", "CAS", "Name", "lab", "tx_time"],
+                              sort=[("tx_time", "desc")], max_records=INDEX_CAPACITY)
+        except Exception:
+            recs = []
+        cutoff = time.time() - RECENT_DAYS * 86400
+        from services.inventory import parse_iso
+        for r in reversed(recs):   # 오래된 것부터 넣어 링버퍼에서 최근 것이 나중에 밀려나도록
+            f = r.get("fields", {})
+            when = parse_iso(f.get("tx_time") or r.get("createdTime"))
+            if when is not None and when.timestamp() < cutoff:
+                continue
+            idx.add(ScanEntry(
+                sha=f.get("img_sha", ""),
+                dhash=_hex64(f.get("img_dhash")),
+                text_hash=_hex64(f.get("ocr_simhash")),
+                cas=(f.get("CAS") or "").strip(), record_id=r.get("id", ""),
+                saved_at=when.timestamp() if when else time.time(),
+                label=f"{f.get('Name','')} · {f.get('lab','')}"))
+    return idx
+
+def hash_fields(sha: str, dhash: int | None, text_hash: int | None) -> dict:
+    """DUP_HASH_FIELDS 가 켜져 있을 때 트랜잭션에 함께 저장할 필드"""
+    if not DUP_HASH_FIELDS:
+        return {}
+    out = {"img_sha": sha}
+    if dhash is not None:
+        out["img_dhash"] = f"{dhash:016x}"
+    if text_hash is not None:
+        out["ocr_simhash"] = f"{text_hash:016x}"
+    return out
+
+# =========================
+# OCR 결과 캐시 — 같은 파일은 Vision 을 다시 부르지 않음 (리런/재업로드)
+# =========================
+class OcrFailed(Exception):
+    """오류 응답은 캐시하지 않도록 예외로 빼냄 (원본 응답은 args[0])"""
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _ocr_cached(sha: str, _image_bytes: bytes, gcp_key: str) -> dict:
+    from services.ocr import run_ocr
+    js = run_ocr(_image_bytes, gcp_key)
+    if "error" in js or any("error" in r for r in js.get("responses", [])):
+        raise OcrFailed(js)
+    return js
+
+def ocr_cached(sha: str, image_bytes: bytes, gcp_key: str) -> dict:
+    try:
+        return _ocr_cached(sha, image_bytes, gcp_key)
+    except OcrFailed as e:
+        return e.args[0]
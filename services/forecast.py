@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from services.inventory import LiveSnapshot, get_density, get_container_volume
+from services.units import to_liters
+
+# 소모(유출)로 보는 구분 — 반품은 재고 이동이라 제외
+OUTFLOW_TYPES = ("출고", "폐기")
+DEFAULT_LEAD_TIME_DAYS = 14.0
+
+_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_CACHE_LEN = 16
+_lock = threading.Lock()
+
+
+def _reorder_points_L(cas_list: list, mats_idx: dict) -> tuple[np.ndarray, np.ndarray]:
+    """CAS 코드 순서의 발주점(L 환산, 없으면 NaN)과 리드타임(일) 배열"""
+    rp = np.full(len(cas_list), np.nan)
+    lead = np.full(len(cas_list), DEFAULT_LEAD_TIME_DAYS)
+    for i, cas in enumerate(cas_list):
+        m = mats_idx.get(cas)
+        if not m:
+            continue
+        if m.get("reorder_point") not in (None, ""):
+            v = to_liters(m["reorder_point"], m.get("reorder_unit") or "L",
+                          get_density(cas, mats_idx), get_container_volume(cas, mats_idx))
+            rp[i] = np.nan if v is None else v
+        try:
+            lead[i] = float(m.get("lead_time_days") or DEFAULT_LEAD_TIME_DAYS)
+        except (TypeError, ValueError):
+            pass
+    return rp, lead
+
+
+def consumption_forecast(snap: LiveSnapshot, window_days: int = 30,
+                         asof: datetime | None = None) -> pd.DataFrame:
+    """CAS × 실험실별 잔량(L), 최근 window_days 일 소모율(L/일), 잔여일수, 발주 판정
+
+    전체 로그를 한 번에 groupby 로 집계한다. 같은 스냅샷/기간이면 캐시된 결과를 돌려준다.
+    L 로 환산되지 않는 기록(밀도/용기부피 없음)은 제외.
+    """
+    asof = asof or datetime.now(timezone.utc)
+    key = (snap.fingerprint, int(window_days), asof.date())
+    with _lock:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+
+    cols = snap.cols
+    ok = ~np.isnan(cols.liters) & np.fromiter((bool(t.cas) for t in snap.tx), dtype=bool, count=len(snap.tx))
+    tx = [t for t, keep in zip(snap.tx, ok.tolist()) if keep]
+    liters, when_s, cas_code = cols.liters[ok], cols.when_s[ok], cols.cas_code[ok]
+
+    t_end = asof.timestamp()
+    in_win = (when_s > t_end - window_days * 86400.0) & (when_s <= t_end)
+    is_out = np.fromiter((t.io_type in OUTFLOW_TYPES for t in tx), dtype=bool, count=len(tx))
+    df = pd.DataFrame({
+        "cas_code": cas_code,
+        "building": [t.building for t in tx],
+        "room": [t.room for t in tx],
+        "lab": [t.lab for t in tx],
+        "bal": liters,
+        "used": np.where(is_out & in_win, -liters, 0.0),   # 유출은 음수로 기록됨
+        "when_s": when_s,
+    })
+    g = df.groupby(["cas_code", "building", "room", "lab"], sort=False).agg(
+        bal=("bal", "sum"), used=("used", "sum"), last_s=("when_s", "max")).reset_index()
+
+    rate = g["used"].to_numpy().clip(min=0) / float(window_days)
+    bal = g["bal"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(rate > 0, np.maximum(bal, 0) / rate, np.inf)
+    rp_by_cas, lead_by_cas = _reorder_points_L(cols.cas_list, snap.mats_idx)
+    codes = g["cas_code"].to_numpy()
+    rp, lead = rp_by_cas[codes], lead_by_cas[codes]
+
+    below_rp = ~np.isnan(rp) & (bal <= rp)
+    status = np.select(
+        [bal <= 0, below_rp | (days_left <= lead), days_left <= 2 * lead],
+        ["소진", "발주 필요", "주의"], default="정상")
+
+    out = pd.DataFrame({
+        "CAS": [cols.cas_list[c] for c in codes],
+        "물질명": [snap.mats_idx.get(cols.cas_list[c], {}).get("name", "") for c in codes],
+        "건물": g["building"], "호수": g["room"], "실험실": g["lab"],
+        "잔량(L)": bal.round(2),
+        "소모율(L/일)": rate.round(3),
+        "잔여일수": np.where(np.isinf(days_left), np.nan, days_left.round(1)),
+        "발주점(L)": rp.round(2),
+        "리드타임(일)": lead,
+        "상태": status,
+    })
+    order = pd.Categorical(out["상태"], ["소진", "발주 필요", "주의", "정상"], ordered=True)
+    out = out.assign(_o=order).sort_values(["_o", "잔여일수"], na_position="last").drop(columns="_o")
+    out = out.reset_index(drop=True)
+
+    with _lock:
+        _CACHE[key] = out
+        while len(_CACHE) > _CACHE_LEN:
+            _CACHE.popitem(last=False)
+    return out
@@ -0,0 +1,515 @@
+import streamlit as st
+import numpy as np, itertools, sys, threading, time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+
+import metrics
+from config import (AIRTABLE_TOKEN, AIRTABLE_BASE_ID, AIRTABLE_API_URL, HAZARD_LIMITS_L, PUBCHEM_API_URL,
+                    SNAPSHOT_STALE_S, SNAPSHOT_TTL_S)
+from services.airtable import (at_get_many, at_find_one, at_update_record, at_request,
+                               materials_ref, tx_ref)
+from services.chemref import lookup as chem_lookup, normalize_class, ref_version
+from services.scope import Scope, current_scope, note_scopes
+from services.units import Unit, parse_unit, unit_code, to_liters_batch
+
+def ensure_material_record(cas_no: str, name_guess: str = ""):
+    """Materials에 CAS 없으면 자동 생성"""
+    if not cas_no:
+        return None
+    mref = materials_ref()
+    try:
+        rec = at_find_one(AIRTABLE_BASE_ID, mref, formula=f"{{CAS}} = '{cas_no}'")
+        if rec:
+            return rec  # 이미 있음
+        payload = {"fields": {"CAS": cas_no}}
+        if name_guess:
+            payload["fields"]["name"] = name_guess[:100]
+        url = f"{AIRTABLE_API_URL}/{AIRTABLE_BASE_ID}/{mref}"
+        r = at_request("airtable.create", "POST", url, json=payload, timeout=20)
+        if r.status_code in (200, 201):
+            return r.json()
+    except:
+        pass
+    return None
+
+def set_material_name_if_missing(cas_no: str, mats_idx: dict, name_hint: str = ""):
+    """Materials에 name이 없으면 PubChem 조회해 채움(가능하면)"""
+    if not cas_no:
+        return
+    mref = materials_ref()
+    current = mats_idx.get(cas_no, {})
+    if current.get("name"):
+        return
+    name_found = None
+    try:
+        url = f"{PUBCHEM_API_URL}/compound/name/{cas_no}/property/Title,IUPACName/JSON"
+        r = metrics.http("pubchem.name", "GET", url, timeout=12)
+        if r.status_code == 200:
+            js = r.json()
+            props = js.get("PropertyTable", {}).get("Properties", [])
+            if props:
+                p = props[0]
+                name_found = p.get("Title") or p.get("IUPACName")
+    except:
+        pass
+    if not name_found:
+        name_found = (name_hint or "").strip()
+        if "\n" in name_found:
+            name_found = name_found.split("\n", 1)[0]
+        name_found = name_found[:100]
+    if not name_found:
+        return
+    try:
+        rec = at_find_one(AIRTABLE_BASE_ID, mref, formula=f"{{CAS}} = '{cas_no}'")
+        if rec:
+            rid = rec["id"]
+            at_update_record(AIRTABLE_BASE_ID, mref, rid, {"name": name_found})
+        else:
+            at_request(
+                "airtable.create", "POST", f"{AIRTABLE_API_URL}/{AIRTABLE_BASE_ID}/{mref}",
+                json={"fields": {"CAS": cas_no, "name": name_found}}, timeout=20
+            )
+    except:
+        pass
+
+
+# 제4류 지정수량(L). Secrets HAZARD_LIMITS_L 로 덮어쓰기 가능
+LEGAL_LIMITS_L = {
+    "특수인화물": 100.0,
+    "제1석유류(비수용성)": 600.0,
+    "제1석유류(수용성)": 1700.0,
+    "알코올류": 4100.0,
+    "제2석유류(비수용성)": 1000.0,
+    "제2석유류(수용성)": 2000.0,
+    "제3석유류(비수용성)": 2000.0,
+    "제3석유류(수용성)": 4000.0,
+    "제4석유류": 6000.0,
+    "동식물유류": 10000.0,
+}
+LEGAL_LIMITS_L.update({k: float(v) for k, v in HAZARD_LIMITS_L.items()})
+
+# 페이지에서 실제로 쓰는 필드만 요청 (ocr_text/Attachments 등 큰 필드 제외)
+TX_FIELDS = ["CAS", "qty", "unit", "io_type", "dept", "building", "room", "lab", "deleted", "tx_time"]
+MATERIAL_FIELDS = ["CAS", "name", "designated_qty", "Unit", "unit", "hazard_class", "density_g_per_ml",
+                   "container_volume_L", "reorder_point", "reorder_unit", "lead_time_days"]
+
+def materials_index(mats: list) -> dict:
+    """Materials 레코드를 CAS 키로 묶어 name, designated_qty, unit, hazard_class, density 제공"""
+    out = {}
+    for r in mats:
+        f = r.get("fields",{})
+        cas = (f.get("CAS") or "").strip()
+        if not cas:
+            continue
+        out[cas] = material_entry(f)
+    return out
+
+def material_entry(f: dict) -> dict:
+    return {
+        "name": f.get("name",""),
+        "designated_qty": f.get("designated_qty"),
+        "unit": (f.get("Unit") or f.get("unit") or ""),
+        "hazard_class": f.get("hazard_class",""),
+        "density_g_per_ml": f.get("density_g_per_ml"),
+        "container_volume_L": f.get("container_volume_L"),   # EA/cyl 1개당 공칭 부피
+        "reorder_point": f.get("reorder_point"),             # 발주점 (reorder_unit 기준)
+        "reorder_unit": f.get("reorder_unit") or "",         # 비우면 L
+        "lead_time_days": f.get("lead_time_days"),           # 발주~입고 소요일
+    }
+
+def load_material_one(cas: str) -> dict:
+    """CAS 한 건만 조회해 {cas: entry} 로 반환 (Materials 전체 로드 없이)"""
+    if not cas:
+        return {}
+    try:
+        rec = at_find_one(AIRTABLE_BASE_ID, materials_ref(), formula=f"{{CAS}} = '{cas}'")
+    except Exception:
+        return {}
+    return {cas: material_entry(rec.get("fields", {}))} if rec else {}
+
+def classify_hazard(cas: str, mats_idx: dict) -> str | None:
+    """Materials.hazard_class → 기준 데이터(services.chemref) 순. Materials 표기는 정규화해서 씀"""
+    if cas in mats_idx and mats_idx[cas].get("hazard_class"):
+        raw = mats_idx[cas]["hazard_class"]
+        return normalize_class(raw) or raw
+    ref = chem_lookup(cas)
+    return ref.hazard_class if ref else None
+
+def get_density(cas: str, mats_idx: dict) -> float | None:
+    if cas in mats_idx and mats_idx[cas].get("density_g_per_ml"):
+        try:
+            return float(mats_idx[cas]["density_g_per_ml"])
+        except:
+            pass
+    ref = chem_lookup(cas)
+    return ref.density if ref else None
+
+def get_container_volume(cas: str, mats_idx: dict) -> float | None:
+    try:
+        v = float(mats_idx.get(cas, {}).get("container_volume_L") or 0)
+    except:
+        return None
+    return v if v > 0 else None
+
+def material_arrays(cas_list: list, mats_idx: dict) -> tuple[np.ndarray, np.ndarray]:
+    """CAS 코드 순서대로 밀도(g/mL), 용기부피(L) 조회 배열 생성 (없으면 0)"""
+    dens = np.array([get_density(c, mats_idx) or 0.0 for c in cas_list], dtype=np.float64)
+    cont = np.array([get_container_volume(c, mats_idx) or 0.0 for c in cas_list], dtype=np.float64)
+    return dens, cont
+
+def parse_iso(iso_str) -> datetime | None:
+    if not iso_str:
+        return None
+    try:
+        return datetime.fromisoformat(str(iso_str).replace("Z", "+00:00"))
+    except:
+        return None
+
+def iso_z(dt_val: datetime) -> str:
+    """aware datetime → 초 단위 UTC ISO8601(Z)"""
+    return dt_val.astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00","Z")
+
+@dataclass(slots=True)
+class Tx:
+    id: str
+    when: datetime | None        # tx_time (없으면 createdTime), 파싱 실패 시 None
+    cas: str
+    qty: float | None
+    unit: "Unit | str"
+    io_type: str
+    dept: str
+    building: str
+    room: str
+    lab: str
+    deleted: bool
+    hazard_class: str | None     # Materials → 기준 데이터 순으로 미리 결정
+    density: float | None        # g/mL
+    ver: int = 0                 # 불러올 때의 필드 값 표식 (tx_stamp) — 쓰기 전 동시 수정 확인용
+
+def tx_stamp(fields: dict) -> int:
+    """레코드 버전 표식. 화면에 쓰는 필드(TX_FIELDS) 값이 같으면 같은 값 (Airtable 에는 ETag 가 없음)"""
+    return hash(tuple(repr(fields.get(k)) for k in TX_FIELDS))
+
+def build_transactions(records: list, mats_idx: dict) -> list[Tx]:
+    """Airtable 원본 레코드를 Tx 로 변환. 유별/밀도는 CAS당 1회만 조회"""
+    intern = sys.intern
+    resolved = {}  # cas -> (hazard_class, density)
+    out = []
+    for r in records:
+        f = r.get("fields", {})
+        cas = intern((f.get("CAS") or "").strip())
+        if cas not in resolved:
+            resolved[cas] = ((classify_hazard(cas, mats_idx), get_density(cas, mats_idx))
+                             if cas else (None, None))
+        hclass, dens = resolved[cas]
+        q = f.get("qty")
+        try:
+            q = float(q) if q is not None else None
+        except:
+            q = None
+        out.append(Tx(
+            id=r.get("id", ""),
+            when=parse_iso(f.get("tx_time") or r.get("createdTime")),
+            cas=cas,
+            qty=q,
+            unit=parse_unit(f.get("unit")),
+            io_type=intern(f.get("io_type") or ""),
+            dept=intern(f.get("dept") or ""),
+            building=intern(f.get("building") or ""),
+            room=intern(str(f.get("room") or "")),
+            lab=intern(f.get("lab") or ""),
+            deleted=bool(f.get("deleted", False)),
+            hazard_class=hclass,
+            density=dens,
+            ver=tx_stamp(f),
+        ))
+    return out
+
+@dataclass(slots=True)
+class TxColumns:
+    """Tx 리스트와 같은 순서의 열 배열. liters 는 환산 불가 시 NaN"""
+    cas_list: list          # cas_code → CAS
+    cas_code: np.ndarray
+    qty: np.ndarray         # None → NaN
+    unit_code: np.ndarray
+    liters: np.ndarray
+    when_s: np.ndarray      # 거래일시 epoch 초, 없으면 NaN
+
+def row_columns(txs: list[Tx], cas_index: dict, mats_idx: dict) -> tuple:
+    """Tx 들의 (cas_code, qty, unit_code, liters, when_s) 열 조각. cas_index 에 없는 CAS 는 뒤에 추가"""
+    n = len(txs)
+    cas_code = np.fromiter((cas_index.setdefault(t.cas, len(cas_index)) for t in txs), dtype=np.int32, count=n)
+    qty = np.fromiter((np.nan if t.qty is None else t.qty for t in txs), dtype=np.float64, count=n)
+    codes = np.fromiter((unit_code(t.unit) for t in txs), dtype=np.int32, count=n)
+    # 밀도/용기부피는 이 조각에 나온 CAS 만 조회
+    cas_list, present = list(cas_index), np.unique(cas_code)
+    dens_by_cas, cont_by_cas = np.zeros(len(cas_list)), np.zeros(len(cas_list))
+    dens_by_cas[present], cont_by_cas[present] = material_arrays([cas_list[i] for i in present], mats_idx)
+    liters = to_liters_batch(qty, codes, dens_by_cas[cas_code], cont_by_cas[cas_code])
+    when_s = np.fromiter((np.nan if t.when is None else t.when.timestamp() for t in txs),
+                         dtype=np.float64, count=n)
+    return cas_code, qty, codes, liters, when_s
+
+def build_columns(txs: list[Tx], mats_idx: dict) -> TxColumns:
+    """열 배열을 만들고 L 환산을 한 번의 벡터 연산으로 수행"""
+    cas_index = {}
+    parts = row_columns(txs, cas_index, mats_idx)
+    return TxColumns(list(cas_index), *parts)
+
+def load_snapshot(formula: str | None = None):
+    """Materials + 트랜잭션(formula 로 범위 제한)을 동시에 한 번만 불러와 (list[Tx], mats_idx) 반환"""
+    res = at_get_many({"tx": (tx_ref(), formula, TX_FIELDS),
+                       "mats": (materials_ref(), None, MATERIAL_FIELDS)})
+    if isinstance(res["tx"], Exception):
+        raise res["tx"]
+    if isinstance(res["mats"], Exception):
+        st.warning(f"Materials 로드 실패: {res['mats']}")
+        res["mats"] = []
+    mats_idx = materials_index(res["mats"])
+    return build_transactions(res["tx"], mats_idx), mats_idx
+
+@dataclass(slots=True)
+class LiveSnapshot:
+    """삭제 제외 트랜잭션 + 열 배열 + Materials (페이지 공용)"""
+    tx: list
+    cols: TxColumns
+    mats_idx: dict
+    error: Exception | None = None
+    fingerprint: int = 0    # 스냅샷 버전 (새로 불러오거나 패치할 때마다 증가) — 파생 계산 캐시 키
+    ref_ver: str = ""       # 유별/밀도를 정할 때 쓴 기준 데이터 버전
+    patch_seq: int = 0      # 반영된 마지막 패치 번호 (_SnapshotCache.seq)
+    id_pos: dict | None = None   # record id → 행 위치 (첫 패치 때 만듦)
+
+_fingerprints = itertools.count(1)
+
+def next_fingerprint() -> int:
+    """프로세스 안에서 겹치지 않는 스냅샷 버전 (내용 해시 대신 — 패치마다 전체를 훑지 않도록)"""
+    return next(_fingerprints)
+
+def snapshot_positions(snap: LiveSnapshot) -> dict:
+    if snap.id_pos is None:
+        snap.id_pos = {t.id: i for i, t in enumerate(snap.tx)}
+    return snap.id_pos
+
+def reclassify(snap: LiveSnapshot, ver: str) -> LiveSnapshot:
+    """기준 데이터가 다시 읽혔을 때 유별/밀도와 L 환산만 다시 계산한 스냅샷 (Airtable 재조회 없음)"""
+    mats_idx, cols = snap.mats_idx, snap.cols
+    resolved = {c: ((classify_hazard(c, mats_idx), get_density(c, mats_idx)) if c else (None, None))
+                for c in cols.cas_list}
+    tx = [t if (t.hazard_class, t.density) == resolved[t.cas]
+          else replace(t, hazard_class=resolved[t.cas][0], density=resolved[t.cas][1]) for t in snap.tx]
+    dens, cont = material_arrays(cols.cas_list, mats_idx)
+    liters = to_liters_batch(cols.qty, cols.unit_code, dens[cols.cas_code], cont[cols.cas_code])
+    return LiveSnapshot(tx, replace(cols, liters=liters), mats_idx, snap.error,
+                        next_fingerprint(), ver, snap.patch_seq, snap.id_pos)
+
+# =========================
+# 범위별 스냅샷 캐시 (프로세스 공용)
+#   쓰기 경로는 응답으로 받은 레코드를 patch_snapshots() 로 캐시에 바로 반영 (다시 불러오지 않음)
+#   SNAPSHOT_TTL_S 가 지나면 있던 스냅샷을 그대로 쓰고 백그라운드에서 다시 불러와 교체(재조정),
+#   SNAPSHOT_STALE_S 보다 오래됐으면 그 자리에서 다시 불러옴
+# =========================
+SNAPSHOT_CACHE_MAX = 32
+PATCH_LOG_MAX = 256
+
+@dataclass(slots=True)
+class SnapshotPatch:
+    seq: int
+    upserts: list               # 쓰기 응답 레코드 (생성/수정)
+    removed: set                # 삭제된 record id
+
+@dataclass(slots=True)
+class _SnapshotCache:
+    items: OrderedDict          # Scope -> (로드 시각, LiveSnapshot)
+    lock: threading.Lock
+    patches: deque = field(default_factory=lambda: deque(maxlen=PATCH_LOG_MAX))  # 로드 중 들어온 패치 재적용용
+    seq: int = 0
+    refreshing: set = field(default_factory=set)
+    loading: dict = field(default_factory=dict)   # Scope -> Event (같은 범위 동시 로드는 한 번만)
+    patch_lock: threading.Lock = field(default_factory=threading.Lock)   # 패치 순서 유지 (읽기는 막지 않음)
+
+@st.cache_resource(show_spinner=False)
+def _snapshot_cache() -> _SnapshotCache:
+    return _SnapshotCache(OrderedDict(), threading.Lock())
+
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot-refresh")
+
+def apply_patch(snap: LiveSnapshot, scope: Scope, upserts: list, removed: set) -> LiveSnapshot:
+    """스냅샷에 쓰기 결과 반영한 새 스냅샷. 바뀐 행만 제자리 교체, 새 레코드는 끝에 추가,
+    삭제 표시됐거나 범위 밖이 된 레코드는 빠짐 — 나머지 행은 열 배열 복사만. 이 범위와 무관하면 snap 그대로"""
+    new_tx = build_transactions(upserts, snap.mats_idx)
+    pos = snapshot_positions(snap)
+    keep = {t.id: t for t in new_tx if not t.deleted and scope.match(t.dept, t.building, t.lab)}
+    drop = sorted({pos[i] for i in removed if i in pos}
+                  | {pos[t.id] for t in new_tx if t.id not in keep and t.id in pos})
+    upd = [(pos[t.id], t) for t in keep.values() if t.id in pos]
+    add = [t for t in keep.values() if t.id not in pos]
+    if not (drop or upd or add):
+        return snap
+    c = snap.cols
+    cas_index = {cas: i for i, cas in enumerate(c.cas_list)}
+    arrays = [c.cas_code, c.qty, c.unit_code, c.liters, c.when_s]
+    tx = list(snap.tx)
+    if upd:
+        rows = np.fromiter((i for i, _ in upd), dtype=np.int64, count=len(upd))
+        arrays = [a.copy() for a in arrays]
+        for a, part in zip(arrays, row_columns([t for _, t in upd], cas_index, snap.mats_idx)):
+            a[rows] = part
+        for i, t in upd:
+            tx[i] = t
+    if add:
+        parts = row_columns(add, cas_index, snap.mats_idx)
+        arrays = [np.concatenate([a, part]) for a, part in zip(arrays, parts)]
+        tx.extend(add)
+    if drop:
+        arrays = [np.delete(a, drop) for a in arrays]
+        dropped = set(drop)
+        tx = [t for i, t in enumerate(tx) if i not in dropped]
+        id_pos = None   # 위치가 밀림 — 다음 패치 때 다시 만듦
+    elif add:
+        id_pos = {**pos, **{t.id: len(snap.tx) + k for k, t in enumerate(add)}}
+    else:
+        id_pos = pos
+    return LiveSnapshot(tx, TxColumns(list(cas_index), *arrays), snap.mats_idx, None,
+                        next_fingerprint(), snap.ref_ver, snap.patch_seq, id_pos)
+
+def patch_snapshots(upserts=(), removed=()):
+    """쓰기 응답(생성/수정 레코드, 삭제 id)을 캐시된 모든 범위의 스냅샷에 반영
+
+    새 스냅샷은 캐시 잠금 밖에서 만들고 잠금 안에서는 교체만 한다 (읽는 세션을 막지 않도록).
+    패치끼리는 patch_lock 으로 순서를 지킨다."""
+    upserts, removed = [r for r in upserts if r], set(removed)
+    if not (upserts or removed):
+        return
+    note_scopes(upserts)
+    cache = _snapshot_cache()
+    with cache.patch_lock:
+        with cache.lock:
+            cache.seq += 1
+            seq = cache.seq
+            cache.patches.append(SnapshotPatch(seq, upserts, removed))
+            todo = list(cache.items.items())
+        while todo:
+            built = []
+            for scope, hit in todo:
+                new = apply_patch(hit[1], scope, upserts, removed)
+                if new is not hit[1]:
+                    new.patch_seq = seq
+                built.append((scope, hit, new))
+            todo = []
+            with cache.lock:
+                for scope, hit, new in built:
+                    cur = cache.items.get(scope)
+                    if cur is hit:
+                        cache.items[scope] = (hit[0], new)
+                    elif cur is not None and cur[1].patch_seq < seq:
+                        todo.append((scope, cur))   # 그 사이 재분류 등으로 바뀜 — 새 것에 다시 적용
+                    # 없어졌거나 재조회가 이미 이 패치를 반영했으면 그대로 둠
+
+def _load_into_cache(cache: _SnapshotCache, scope: Scope, background: bool = False) -> LiveSnapshot:
+    with cache.lock:
+        ev = cache.loading.get(scope)
+        if ev is None:
+            cache.loading[scope] = threading.Event()
+    if ev is not None:
+        # 다른 세션/예열이 같은 범위를 불러오는 중 — 끝나길 기다렸다 그 결과를 씀
+        if not background:
+            with st.spinner(f"🔄 데이터 불러오는 중… ({scope.label()})"):
+                ev.wait()
+        else:
+            ev.wait()
+        with cache.lock:
+            hit = cache.items.get(scope)
+        if hit:
+            return hit[1]
+        return _load_into_cache(cache, scope, background)
+    try:
+        return _load_uncached(cache, scope, background)
+    finally:
+        with cache.lock:
+            cache.loading.pop(scope).set()
+
+def _load_uncached(cache: _SnapshotCache, scope: Scope, background: bool) -> LiveSnapshot:
+    with cache.lock:
+        seq0 = cache.seq
+    t0, ver = time.monotonic(), ref_version()
+    tx_all, mats_idx, err = [], {}, None
+    if AIRTABLE_TOKEN and AIRTABLE_BASE_ID:
+        try:
+            if background:
+                tx_all, mats_idx = load_snapshot(scope.formula())
+            else:
+                with st.spinner(f"🔄 데이터 불러오는 중… ({scope.label()})"), metrics.timed("snapshot"):
+                    tx_all, mats_idx = load_snapshot(scope.formula())
+        except Exception as e:
+            err = e
+    # 삭제된(소프트삭제) 제외
+    tx_live = [t for t in tx_all if not t.deleted]
+    snap = LiveSnapshot(tx_live, build_columns(tx_live, mats_idx), mats_idx, err, next_fingerprint(), ver, seq0)
+    while err is None:
+        with cache.lock:
+            # 불러오는 동안 들어온 쓰기 반영 (오래돼 로그에서 밀려났으면 캐시에 넣지 않음)
+            missed = [p for p in cache.patches if p.seq > snap.patch_seq]
+            if cache.seq > snap.patch_seq and (not missed or missed[0].seq != snap.patch_seq + 1):
+                return snap
+            if not missed:
+                cache.items[scope] = (t0, snap)
+                cache.items.move_to_end(scope)
+                while len(cache.items) > SNAPSHOT_CACHE_MAX:
+                    cache.items.popitem(last=False)
+                return snap
+        for p in missed:   # 잠금 밖에서 적용하고 다시 확인
+            snap = apply_patch(snap, scope, p.upserts, p.removed)
+            snap.patch_seq = p.seq
+    return snap
+
+def _refresh_async(cache: _SnapshotCache, scope: Scope):
+    """백그라운드 재조정 (범위당 하나만)"""
+    with cache.lock:
+        if scope in cache.refreshing:
+            return
+        cache.refreshing.add(scope)
+
+    def job():
+        try:
+            _load_into_cache(cache, scope, background=True)
+        finally:
+            with cache.lock:
+                cache.refreshing.discard(scope)
+    _refresh_pool.submit(job)
+
+def _current_ref(cache: _SnapshotCache, scope: Scope, hit: tuple) -> LiveSnapshot:
+    """캐시된 스냅샷이 예전 기준 데이터로 분류됐으면 제자리에서 다시 분류해 교체"""
+    snap, ver = hit[1], ref_version()
+    if snap.ref_ver == ver:
+        return snap
+    new = reclassify(snap, ver)
+    with cache.lock:
+        if cache.items.get(scope) is hit:   # 그 사이 패치/재조회로 바뀌었으면 그쪽이 최신
+            cache.items[scope] = (hit[0], new)
+    return new
+
+def prime_snapshot(scope: Scope) -> LiveSnapshot:
+    """예열용: 화면 없이 범위 스냅샷을 캐시에 채움 (이미 있으면 그대로)"""
+    cache = _snapshot_cache()
+    with cache.lock:
+        hit = cache.items.get(scope)
+    return _current_ref(cache, scope, hit) if hit else _load_into_cache(cache, scope, background=True)
+
+def load_live_snapshot(scope: Scope | None = None) -> LiveSnapshot:
+    """페이지에서 쓰는 스냅샷 로드 (범위 미지정 시 세션의 선택 범위). 실패 시 빈 스냅샷 + error"""
+    scope = current_scope() if scope is None else scope
+    cache, now = _snapshot_cache(), time.monotonic()
+    with cache.lock:
+        hit = cache.items.get(scope)
+        if hit and now - hit[0] < SNAPSHOT_STALE_S:
+            cache.items.move_to_end(scope)
+        else:
+            hit = None
+    if hit is None:
+        return _load_into_cache(cache, scope)
+    if now - hit[0] >= SNAPSHOT_TTL_S:
+        _refresh_async(cache, scope)
+    return _current_ref(cache, scope, hit)   # 기준 데이터가 다시 읽혔으면 유별/밀도만 재계산
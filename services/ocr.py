@@ -0,0 +1,32 @@
+import base64, re
+
+import metrics
+from config import VISION_API_URL, IMGBB_API_URL, IMGBB_KEY
+
+CAS_RE = re.compile(r"\b\d{2,7}-\d{2}-\d\b")
+def extract_cas(text: str) -> str:
+    m = CAS_RE.search(text or "")
+    return m.group(0) if m else ""
+
+
+def run_ocr(image_bytes: bytes, gcp_key: str) -> dict:
+    url = f"{VISION_API_URL}/images:annotate?key={gcp_key}"
+    b64 = base64.b64encode(image_bytes).decode("utf-8")
+    payload = {"requests": [{
+        "image": {"content": b64},
+        "features": [{"type": "TEXT_DETECTION"}]
+    }]}
+    return metrics.http("vision.annotate", "POST", url, json=payload, timeout=40,
+                        nbytes_out=len(b64)).json()
+
+def upload_to_imgbb(image_bytes, filename: str) -> str | None:
+    """ImgBB 업로드 → URL. 키가 없으면 None, 실패하면 예외 (재시도는 호출 쪽에서)"""
+    if not IMGBB_KEY:
+        return None
+    b64 = base64.b64encode(image_bytes).decode("utf-8")
+    r = metrics.http("imgbb.upload", "POST", f"{IMGBB_API_URL}/upload",
+                     data={"key": IMGBB_KEY, "image": b64, "name": filename},
+                     timeout=25, nbytes_out=len(b64))
+    r.raise_for_status()
+    return r.json()["data"]["url"]
+
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from services.inventory import LiveSnapshot, get_container_volume, get_density, iso_z
+from services.units import to_liters
+
+ADJUST_TYPE = "조정"
+TOLERANCE_L = 0.001   # 이보다 작은 차이는 일치로 봄
+
+@dataclass(slots=True)
+class AuditScan:
+    """실사 중 확인한 한 병"""
+    cas: str
+    qty: float
+    unit: str
+    source: str = ""     # 파일명 / "수기"
+
+@dataclass(slots=True)
+class BookBalance:
+    liters: dict         # cas -> 장부 보유량(L), 재고 현황 실험실별 상세와 같은 환산
+    unconvertible: set   # 환산 불가 트랜잭션이 있는 CAS
+    dept: str            # 해당 위치에서 가장 많이 쓰인 학과 (조정 트랜잭션용)
+
+def book_balances(snap: LiveSnapshot, building: str, room: str, lab: str) -> BookBalance:
+    """위치(건물, 호수, 실험실)의 CAS별 장부 보유량(L). CAS 코드 bincount 로 한 번에 합산"""
+    tx, cols = snap.tx, snap.cols
+    at_loc = np.fromiter((t.building == building and t.room == room and t.lab == lab for t in tx),
+                         dtype=bool, count=len(tx))
+    has_qty = ~np.isnan(cols.qty)
+    ok = at_loc & has_qty & ~np.isnan(cols.liters)
+    sums = np.bincount(cols.cas_code[ok], weights=cols.liters[ok], minlength=len(cols.cas_list))
+    seen = np.bincount(cols.cas_code[ok], minlength=len(cols.cas_list)) > 0
+    liters = {cols.cas_list[i]: float(sums[i]) for i in np.flatnonzero(seen) if cols.cas_list[i]}
+    bad = at_loc & has_qty & np.isnan(cols.liters)
+    unconvertible = {cols.cas_list[i] for i in np.unique(cols.cas_code[bad]) if cols.cas_list[i]}
+    depts = pd.Series([tx[i].dept for i in np.flatnonzero(at_loc)], dtype=object)
+    dept = depts.mode().iloc[0] if len(depts) else ""
+    return BookBalance(liters, unconvertible, dept)
+
+def scan_totals(scans: list[AuditScan], mats_idx: dict) -> dict:
+    """cas -> [병 수, 실사량(L) 또는 NaN(환산 불가 포함)]"""
+    out: dict[str, list] = {}
+    for s in scans:
+        if not s.cas:
+            continue
+        L = to_liters(s.qty, s.unit, get_density(s.cas, mats_idx), get_container_volume(s.cas, mats_idx))
+        acc = out.setdefault(s.cas, [0, 0.0])
+        acc[0] += 1
+        acc[1] += np.nan if L is None else L
+    return out
+
+def reconcile(snap: LiveSnapshot, building: str, room: str, lab: str,
+              scans: list[AuditScan], unscanned_zero: bool = True) -> tuple[pd.DataFrame, BookBalance]:
+    """CAS별 실사 vs 장부 비교표. unscanned_zero 면 장부에만 있는 CAS 는 실사 0 으로 봄"""
+    book = book_balances(snap, building, room, lab)
+    found = scan_totals(scans, snap.mats_idx)
+    keys = set(found) | (set(book.liters) | book.unconvertible if unscanned_zero else set())
+    rows = []
+    for cas in sorted(keys):
+        n, phys = found.get(cas, [0, 0.0])
+        bk = book.liters.get(cas, 0.0)
+        if np.isnan(phys) or cas in book.unconvertible:
+            diff, status = np.nan, "환산 불가"
+        else:
+            diff = phys - bk
+            status = "일치" if abs(diff) < TOLERANCE_L else ("초과" if diff > 0 else "부족")
+        rows.append({"CAS": cas, "물질명": snap.mats_idx.get(cas, {}).get("name", ""),
+                     "실사(병)": n, "실사(L)": phys, "장부(L)": bk, "차이(L)": diff, "상태": status})
+    df = pd.DataFrame(rows, columns=["CAS", "물질명", "실사(병)", "실사(L)", "장부(L)", "차이(L)", "상태"])
+    return df, book
+
+def adjustment_fields(diff: pd.DataFrame, building: str, room: str, lab: str, dept: str,
+                      when: datetime | None = None, note: str = "") -> list[dict]:
+    """차이(L) 만큼 장부를 맞추는 조정 트랜잭션 필드 (L 단위, 부호 그대로)"""
+    when = when or datetime.now(timezone.utc)
+    ts = iso_z(when)
+    out = []
+    for r in diff.to_dict("records"):
+        d = r["차이(L)"]
+        if d != d or abs(d) < TOLERANCE_L:
+            continue
+        out.append({
+            "Name": f"audit_{when.astimezone().strftime('%Y%m%d_%H%M')}",
+            "ocr_text": note or f"재고 실사 조정 (실사 {r['실사(병)']}병, 장부 {r['장부(L)']:.3f} L)",
+            "CAS": r["CAS"], "dept": dept, "lab": lab, "building": building, "room": room,
+            "io_type": ADJUST_TYPE, "qty": round(float(d), 4), "unit": "L",
+            "tx_time": ts, "deleted": False,
+        })
+    return out
@@ -0,0 +1,233 @@
+"""제4류 위험물 규제 보고서 — 임의 기준일 보유량 / 월별 최대 보유 비율
+
+스냅샷의 L 환산 트랜잭션을 거래일시 순으로 정렬해 두고
+  · 유별 합계는 누적합(prefix sum) 배열에서 searchsorted 한 번 (O(log n))
+  · CAS별 잔량은 월초 시점 잔량(월별 스냅샷) + 그 달 기준일까지의 거래만 bincount
+로 구한다. 인덱스는 스냅샷 fingerprint 별로 캐시된다.
+"""
+import io, threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time as dtime
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+
+try:  # PDF 보고서 쓸 때만 필요
+    import reportlab
+except Exception:
+    reportlab = None
+
+from services.inventory import LEGAL_LIMITS_L, LiveSnapshot
+
+UNCLASSIFIED = "미분류"
+PDF_FONT = "HYSMyeongJo-Medium"   # reportlab 내장 한글 CID 폰트 (별도 파일 불필요)
+
+_CACHE: "OrderedDict[int, BalanceIndex]" = OrderedDict()
+_CACHE_LEN = 8
+_lock = threading.Lock()
+
+def class_order() -> list[str]:
+    return list(LEGAL_LIMITS_L) + [UNCLASSIFIED]
+
+def limit_status(ratio: float | None) -> str:
+    """지정수량 대비 비율 → 상태 (위험물 현황과 같은 기준)"""
+    if ratio is None or ratio != ratio:
+        return "정상"
+    return "초과" if ratio >= 1.0 else "경고" if ratio >= 0.5 else "주의" if ratio >= 0.2 else "정상"
+
+def local_tz():
+    return datetime.now().astimezone().tzinfo
+
+def day_end(d: date) -> float:
+    """기준일(현지) 하루 끝 epoch 초 — 그날 기록까지 포함"""
+    return datetime.combine(d, dtime.max).replace(tzinfo=local_tz()).timestamp()
+
+# =========================
+# 잔량 인덱스
+# =========================
+@dataclass(slots=True)
+class BalanceIndex:
+    when_s: np.ndarray         # 거래일시 epoch 초 (오름차순)
+    cas_code: np.ndarray       # 같은 순서의 CAS 코드 (snap.cols.cas_list 기준)
+    liters: np.ndarray
+    cas_list: list
+    classes: list              # 유별 이름 (class_order)
+    class_of_cas: np.ndarray   # cas_code → 유별 번호
+    class_prefix: np.ndarray   # (n+1, K) 유별 누적합 — 행 i 는 앞 i 건까지의 합
+    month_starts: list         # 월초(현지) datetime
+    month_pos: np.ndarray      # 각 월초의 정렬 위치 (그 전까지의 거래 수)
+    month_cas: np.ndarray      # (M, n_cas) 월초 시점 CAS별 잔량
+    skipped: int               # 환산 불가/일시 없음으로 빠진 기록 수
+
+def build_index(snap: LiveSnapshot) -> BalanceIndex:
+    cols = snap.cols
+    classes = class_order()
+    cidx = {c: i for i, c in enumerate(classes)}
+    hclass = {}
+    for t in snap.tx:
+        hclass.setdefault(t.cas, t.hazard_class)
+    class_of_cas = np.array([cidx.get(hclass.get(c) or UNCLASSIFIED, cidx[UNCLASSIFIED])
+                             for c in cols.cas_list], dtype=np.int32)
+
+    has_cas = np.array([bool(c) for c in cols.cas_list], dtype=bool)
+    ok = ~np.isnan(cols.liters) & ~np.isnan(cols.when_s)
+    if len(cols.cas_list):
+        ok &= has_cas[cols.cas_code]
+    counted = ~np.isnan(cols.qty)
+    skipped = int((counted & ~ok).sum())
+    order = np.argsort(cols.when_s[ok], kind="stable")
+    when_s = cols.when_s[ok][order]
+    cas_code = cols.cas_code[ok][order]
+    liters = cols.liters[ok][order]
+
+    n, K, n_cas = len(when_s), len(classes), len(cols.cas_list)
+    class_prefix = np.zeros((n + 1, K))
+    if n:
+        onehot = np.zeros((n, K))
+        onehot[np.arange(n), class_of_cas[cas_code]] = liters
+        np.cumsum(onehot, axis=0, out=class_prefix[1:])
+
+    # 월별 스냅샷: 첫 거래가 있는 달 ~ 마지막 거래 다음 달의 월초
+    month_starts, month_pos, month_cas = [], np.zeros(0, dtype=np.int64), np.zeros((0, n_cas))
+    if n:
+        tz = local_tz()
+        first = datetime.fromtimestamp(when_s[0], tz).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last = datetime.fromtimestamp(when_s[-1], tz)
+        m = first
+        while m <= last:
+            month_starts.append(m)
+            m = (m.replace(day=28) + pd.Timedelta(days=4)).replace(day=1)
+        month_starts.append(m)
+        month_pos = np.searchsorted(when_s, [m.timestamp() for m in month_starts], side="left")
+        # 월 구간별 CAS 합계를 누적 → 월초 잔량
+        seg = np.zeros((len(month_starts), n_cas))
+        for i in range(1, len(month_starts)):
+            a, b = month_pos[i - 1], month_pos[i]
+            seg[i] = np.bincount(cas_code[a:b], weights=liters[a:b], minlength=n_cas)
+        month_cas = np.cumsum(seg, axis=0)
+
+    return BalanceIndex(when_s, cas_code, liters, list(cols.cas_list), classes, class_of_cas,
+                        class_prefix, month_starts, month_pos, month_cas, skipped)
+
+def get_index(snap: LiveSnapshot) -> BalanceIndex:
+    key = snap.fingerprint
+    with _lock:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+    idx = build_index(snap)
+    with _lock:
+        _CACHE[key] = idx
+        while len(_CACHE) > _CACHE_LEN:
+            _CACHE.popitem(last=False)
+    return idx
+
+def class_balances_at(idx: BalanceIndex, ts: float) -> np.ndarray:
+    """ts(epoch 초) 시점까지의 유별 보유량(L)"""
+    return idx.class_prefix[np.searchsorted(idx.when_s, ts, side="right")]
+
+def cas_balances_at(idx: BalanceIndex, ts: float) -> np.ndarray:
+    """ts 시점까지의 CAS별 보유량(L) — 직전 월초 스냅샷 + 그 뒤 거래만 합산"""
+    pos = np.searchsorted(idx.when_s, ts, side="right")
+    m = np.searchsorted(idx.month_pos, pos, side="right") - 1
+    if m < 0:
+        return np.zeros(len(idx.cas_list))
+    a = idx.month_pos[m]
+    return idx.month_cas[m] + np.bincount(idx.cas_code[a:pos], weights=idx.liters[a:pos],
+                                          minlength=len(idx.cas_list))
+
+# =========================
+# 보고서 표
+# =========================
+def class_table(idx: BalanceIndex, ts: float) -> pd.DataFrame:
+    cur = class_balances_at(idx, ts)
+    rows = []
+    for k, name in enumerate(idx.classes):
+        limit = LEGAL_LIMITS_L.get(name)
+        ratio = cur[k] / limit if limit else None
+        rows.append({"구분": name, "보유량(L)": round(float(cur[k]), 1),
+                     "지정수량(L)": limit, "배수": None if ratio is None else round(ratio, 3),
+                     "상태": limit_status(ratio) if limit else ""})
+    return pd.DataFrame(rows)
+
+def cas_table(idx: BalanceIndex, ts: float, mats_idx: dict) -> pd.DataFrame:
+    bal = cas_balances_at(idx, ts)
+    keep = np.flatnonzero(np.abs(bal) >= 0.0005)
+    df = pd.DataFrame({
+        "CAS": [idx.cas_list[i] for i in keep],
+        "물질명": [mats_idx.get(idx.cas_list[i], {}).get("name", "") for i in keep],
+        "위험물류명": [idx.classes[idx.class_of_cas[i]] for i in keep],
+        "보유량(L)": bal[keep].round(2),
+    })
+    return df.sort_values("보유량(L)", ascending=False).reset_index(drop=True)
+
+def monthly_peaks(idx: BalanceIndex, start: date | None = None, end: date | None = None) -> pd.DataFrame:
+    """월별 유별 최대 보유량과 지정수량 대비 최대 배수 (월초 잔량 + 월중 모든 거래 직후 잔량 중 최대)"""
+    if len(idx.month_starts) < 2:
+        return pd.DataFrame(columns=["월", "구분", "최대 보유량(L)", "지정수량(L)", "최대 배수", "상태"])
+    pos = idx.month_pos
+    peak = np.maximum.reduceat(idx.class_prefix, pos[:-1], axis=0)
+    peak = np.maximum(peak, idx.class_prefix[pos[1:]])   # 월말 잔량 포함
+    rows = []
+    for i, m in enumerate(idx.month_starts[:-1]):
+        if (start and m.date() < start.replace(day=1)) or (end and m.date() > end):
+            continue
+        for k, name in enumerate(idx.classes):
+            limit = LEGAL_LIMITS_L.get(name)
+            ratio = peak[i, k] / limit if limit else None
+            rows.append({"월": f"{m:%Y-%m}", "구분": name, "최대 보유량(L)": round(float(peak[i, k]), 1),
+                         "지정수량(L)": limit, "최대 배수": None if ratio is None else round(ratio, 3),
+                         "상태": limit_status(ratio) if limit else ""})
+    return pd.DataFrame(rows)
+
+# =========================
+# 내보내기 (XLSX / PDF) — 라이브러리가 없으면 None
+# =========================
+def xlsx_engine() -> str | None:
+    for eng in ("openpyxl", "xlsxwriter"):
+        if find_spec(eng):
+            return eng
+    return None
+
+def to_xlsx(sheets: dict) -> bytes | None:
+    eng = xlsx_engine()
+    if eng is None:
+        return None
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine=eng) as w:
+        for name, df in sheets.items():
+            df.to_excel(w, sheet_name=name[:31], index=False)
+    return buf.getvalue()
+
+def to_pdf(title: str, subtitle: str, sheets: dict) -> bytes | None:
+    if reportlab is None:
+        return None
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    pdfmetrics.registerFont(UnicodeCIDFont(PDF_FONT))
+    styles = getSampleStyleSheet()
+    for s in styles.byName.values():
+        s.fontName = PDF_FONT
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4, title=title)
+    story = [Paragraph(title, styles["Title"]), Paragraph(subtitle, styles["Normal"]), Spacer(1, 12)]
+    for name, df in sheets.items():
+        story.append(Paragraph(name, styles["Heading2"]))
+        data = [list(df.columns)] + [["" if v is None or v != v else str(v) for v in r]
+                                     for r in df.itertuples(index=False)]
+        tbl = Table(data, repeatRows=1)
+        tbl.setStyle(TableStyle([
+            ("FONT", (0, 0), (-1, -1), PDF_FONT, 8),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ]))
+        story += [tbl, Spacer(1, 12)]
+    doc.build(story)
+    return buf.getvalue()
@@ -0,0 +1,134 @@
+import io
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import numpy as np
+from PIL import Image
+
+try:  # zbar 공유 라이브러리가 없으면 바코드 인식만 생략
+    from pyzbar import pyzbar
+except Exception:
+    pyzbar = None
+
+from services.airtable import save_to_airtable
+from services.dedup import (IMG_MAX_DIST, ScanEntry, content_sha, get_scan_index, hamming,
+                            hash_fields, image_dhash, ocr_cached)
+from services.inventory import ensure_material_record, patch_snapshots
+from services.ocr import extract_cas
+from services.storage import attach_image_async
+
+SHARP_MAX_SIDE = 640  # 선명도 계산용 축소 크기
+
+# =========================
+# 프레임 (연속 촬영 한 장)
+# =========================
+@dataclass(slots=True)
+class Frame:
+    name: str
+    data: bytes
+    sha: str
+    dhash: int | None
+    sharpness: float
+    codes: list = field(default_factory=list)   # 바코드/QR 문자열
+
+def sharpness(image_bytes: bytes) -> float:
+    """라플라시안 분산 — 클수록 초점이 맞은 사진 (흔들린 사진은 작음)"""
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        img.draft("L", (SHARP_MAX_SIDE, SHARP_MAX_SIDE))
+        img = img.convert("L")
+        img.thumbnail((SHARP_MAX_SIDE, SHARP_MAX_SIDE))
+        g = np.asarray(img, dtype=np.float32)
+    except Exception:
+        return 0.0
+    if g.shape[0] < 3 or g.shape[1] < 3:
+        return 0.0
+    lap = 4 * g[1:-1, 1:-1] - g[:-2, 1:-1] - g[2:, 1:-1] - g[1:-1, :-2] - g[1:-1, 2:]
+    return float(lap.var())
+
+def read_barcodes(image_bytes: bytes) -> list[str]:
+    if pyzbar is None:
+        return []
+    try:
+        img = Image.open(io.BytesIO(image_bytes)).convert("L")
+        return [c.data.decode("utf-8", "ignore") for c in pyzbar.decode(img)]
+    except Exception:
+        return []
+
+def make_frame(name: str, data: bytes) -> Frame:
+    return Frame(name=name, data=data, sha=content_sha(data), dhash=image_dhash(data),
+                 sharpness=sharpness(data), codes=read_barcodes(data))
+
+def barcode_cas(frame: Frame) -> str:
+    """바코드 내용에 CAS 가 있으면 반환 (있으면 Vision 호출 생략 가능)"""
+    for c in frame.codes:
+        cas = extract_cas(c)
+        if cas:
+            return cas
+    return ""
+
+def identify(frame: Frame, gcp_key: str) -> tuple[str, str, str]:
+    """프레임 → (CAS, 텍스트, 오류). 바코드에 CAS 가 있으면 Vision 호출 없이"""
+    cas_no = barcode_cas(frame)
+    if cas_no:
+        return cas_no, "\n".join(frame.codes), ""
+    if not gcp_key:
+        return "", "", "Vision API Key 없음"
+    try:
+        text = ocr_cached(frame.sha, frame.data, gcp_key)["responses"][0]["fullTextAnnotation"]["text"]
+    except Exception:
+        return "", "", "텍스트 인식 실패"
+    return extract_cas(text), text, ""
+
+def group_bursts(frames: list[Frame]) -> list[list[Frame]]:
+    """연속된 프레임 중 서로 비슷한(dHash 근접) 것끼리 한 병으로 묶음"""
+    groups: list[list[Frame]] = []
+    for f in frames:
+        prev = groups[-1][-1] if groups else None
+        if (prev is not None and f.dhash is not None and prev.dhash is not None
+                and int(hamming(np.array([prev.dhash], dtype=np.uint64), f.dhash)[0]) <= IMG_MAX_DIST):
+            groups[-1].append(f)
+        else:
+            groups.append([f])
+    return groups
+
+def pick_sharpest(group: list[Frame]) -> Frame:
+    return max(group, key=lambda f: f.sharpness)
+
+# =========================
+# 저장 (단건/연속 공용)
+# =========================
+def save_scan(img_bytes: bytes, filename: str, text: str, cas_no: str, meta: dict,
+              io_type: str, qty: float, unit: str, tx_time: datetime,
+              sha: str, dhash: int | None, text_hash: int | None) -> tuple[bool, str]:
+    """트랜잭션 저장 → 스냅샷 캐시/중복 인덱스/Materials 반영, 이미지는 백그라운드 업로드. meta: dept/lab/bld/room"""
+    sign = +1 if io_type == "입고" else -1  # 출고/반품/폐기 → 음수
+    # ISO8601(UTC) 저장
+    tx_dt_utc = tx_time.astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+    fields = {
+        "Name": filename,
+        "ocr_text": text,
+        "CAS": cas_no,
+        "dept": meta["dept"],
+        "lab": meta["lab"],
+        "building": meta["bld"],
+        "room": meta["room"],
+        "io_type": io_type,
+        "qty": sign * qty,
+        "unit": unit,
+        "tx_time": tx_dt_utc,   # Airtable에 동일 이름 Date/Time 필드 권장
+        "deleted": False,       # 소프트삭제 플래그(없으면 Airtable에 생성)
+    }
+    fields.update(hash_fields(sha, dhash, text_hash))
+
+    ok, msg, rec = save_to_airtable(fields)
+    if ok:
+        rec_id = rec.get("id", "")
+        patch_snapshots(upserts=[rec])
+        attach_image_async(rec_id, sha, img_bytes, filename)
+        get_scan_index().add(ScanEntry(sha=sha, dhash=dhash, text_hash=text_hash, cas=cas_no,
+                                       record_id=rec_id, saved_at=datetime.now().timestamp(),
+                                       label=f"{filename} · {meta['lab']}"))
+        ensure_material_record(cas_no, name_guess=text.splitlines()[0] if text else "")
+    return ok, msg
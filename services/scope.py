@@ -0,0 +1,216 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import threading, time
+from dataclasses import dataclass, field
+
+from config import AIRTABLE_BASE_ID, ROLLUP_TTL_S, SCOPE_LIST_TTL_S
+
+# =========================
+# 조회 범위 (학과 / 건물 / 실험실) — 빈 값은 전체
+# =========================
+@dataclass(frozen=True, slots=True)
+class Scope:
+    dept: str = ""
+    building: str = ""
+    lab: str = ""
+
+    @property
+    def is_all(self) -> bool:
+        return not (self.dept or self.building or self.lab)
+
+    def label(self) -> str:
+        return " / ".join(v for v in (self.dept, self.building, self.lab) if v) or "전체"
+
+    def formula(self) -> str | None:
+        """트랜잭션 테이블 filterByFormula (전체면 None)"""
+        parts = [f"{{{k}}} = {at_quote(v)}"
+                 for k, v in (("dept", self.dept), ("building", self.building), ("lab", self.lab)) if v]
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else f"AND({', '.join(parts)})"
+
+    def match(self, dept: str, building: str, lab: str) -> bool:
+        return ((not self.dept or self.dept == dept) and (not self.building or self.building == building)
+                and (not self.lab or self.lab == lab))
+
+def at_quote(v: str) -> str:
+    """Airtable 수식 문자열 리터럴"""
+    return "'" + str(v).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+_QP = {"dept": "dept", "building": "bld", "lab": "lab"}  # Scope 필드 → URL 파라미터
+
+def current_scope() -> Scope:
+    """세션의 선택 범위. 새 세션이면 URL(?dept=&bld=&lab=)에서 복원 — 북마크로 사용자별 기억"""
+    sc = st.session_state.get("scope")
+    if sc is None:
+        qp = st.query_params
+        sc = Scope(**{k: qp.get(p, "") for k, p in _QP.items()})
+        st.session_state.scope = sc
+    return sc
+
+def set_scope(sc: Scope):
+    st.session_state.scope = sc
+    for k, p in _QP.items():
+        v = getattr(sc, k)
+        if v:
+            st.query_params[p] = v
+        elif p in st.query_params:
+            del st.query_params[p]
+
+# =========================
+# 범위 선택 목록 (학과, 건물, 실험실) — 프로세스 공용
+#   전체 범위 세션: 어차피 받는 전체 스냅샷에서 뽑음 (추가 요청 없음)
+#   범위를 고른 세션: dept/building/lab 필드만 가볍게 받아 SCOPE_LIST_TTL_S 동안 캐시.
+#     목록이 없거나 오래됐으면 백그라운드에서 받고 그동안은 아는 만큼만 표시 (전체 테이블을 기다리지 않음)
+# =========================
+SCOPE_FIELDS = ["dept", "building", "lab", "deleted"]
+
+@dataclass(slots=True)
+class _ScopeList:
+    items: set = field(default_factory=set)      # {(dept, building, lab)}
+    at: float = 0.0                              # 채운 시각 (monotonic), 0 이면 아직 없음
+    loading: bool = False
+    error: Exception | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+@st.cache_resource(show_spinner=False)
+def _scope_list() -> _ScopeList:
+    return _ScopeList()
+
+def _scope_key(f) -> tuple:
+    return (f.get("dept") or "", f.get("building") or "", f.get("lab") or "")
+
+def fetch_scope_list() -> set:
+    """트랜잭션 테이블에서 (학과, 건물, 실험실) 조합만 받아 목록 교체 (큰 필드 없이 dept/building/lab 만)"""
+    from services.airtable import at_get_all, tx_ref
+    sl = _scope_list()
+    try:
+        recs = at_get_all(AIRTABLE_BASE_ID, tx_ref(), fields=SCOPE_FIELDS)
+        items = {_scope_key(f) for r in recs if not (f := r.get("fields", {})).get("deleted")}
+        with sl.lock:
+            sl.items, sl.at, sl.error = items, time.monotonic(), None
+        return items
+    except Exception as e:
+        with sl.lock:
+            sl.error = e
+        raise
+    finally:
+        with sl.lock:
+            sl.loading = False
+
+def _fetch_bg():
+    try:
+        fetch_scope_list()
+    except Exception:
+        pass   # sl.error 에 남음, 다음 화면에서 다시 시도
+
+def note_scopes(upserts):
+    """쓰기 응답 레코드의 범위를 목록에 추가 (새 실험실이 TTL 전에도 보이도록)"""
+    sl = _scope_list()
+    new = {_scope_key(f) for r in upserts if not (f := r.get("fields", {})).get("deleted")}
+    with sl.lock:
+        sl.items |= new
+
+def known_scopes(snap=None) -> tuple[set, bool]:
+    """(범위 목록, 불러오는 중 여부). snap 이 전체 범위 스냅샷이면 그것으로 목록을 채움"""
+    sl, now = _scope_list(), time.monotonic()
+    if snap is not None and snap.error is None:
+        items = {(t.dept, t.building, t.lab) for t in snap.tx}
+        with sl.lock:
+            sl.items, sl.at = items, now
+        return items, False
+    with sl.lock:
+        start = (not sl.at or now - sl.at >= SCOPE_LIST_TTL_S) and not sl.loading
+        if start:
+            sl.loading = True
+        items, loading = set(sl.items), sl.loading
+    if start:
+        threading.Thread(target=_fetch_bg, name="scope-list", daemon=True).start()
+    return items, loading
+
+def scope_options(items) -> pd.DataFrame:
+    return (pd.DataFrame(sorted(items), columns=["dept", "building", "lab"])
+              .drop_duplicates().sort_values(["dept", "building", "lab"]))
+
+# =========================
+# 학교 전체 요약 — 범위와 무관하게 프로세스 공용으로 ROLLUP_TTL_S 동안 캐시
+#   전체 범위 스냅샷에서 계산 (전체를 보는 사용자와 로드를 공유, 따로 한 번 더 받지 않음).
+#   범위를 고른 세션은 전체 테이블을 받아야 하므로 요청할 때만 (cached_rollup 으로 먼저 확인)
+# =========================
+@st.cache_resource(show_spinner=False)
+def _rollup_slot() -> tuple[list, threading.Lock]:
+    return [0.0, None], threading.Lock()   # [계산 시각, DataFrame]
+
+def rollup_frame(snap) -> pd.DataFrame:
+    """(학과, 건물, 호수, 실험실, CAS, 단위)별 수량 합계 + L 환산 합계.
+    L 합계는 환산되는 기록만 더하고, 환산 불가 기록 수는 skipped 로 따로 센다"""
+    tx, cols = snap.tx, snap.cols
+    df = pd.DataFrame({
+        "dept": [t.dept for t in tx], "building": [t.building for t in tx],
+        "room": [t.room for t in tx], "lab": [t.lab for t in tx],
+        "CAS": [t.cas for t in tx], "unit": [str(t.unit) for t in tx],
+        "qty": cols.qty, "liters": cols.liters,
+    })
+    df["skipped"] = np.isnan(df["liters"])
+    return (df.groupby(["dept", "building", "room", "lab", "CAS", "unit"], sort=False)
+              .agg(qty=("qty", "sum"), liters=("liters", "sum"), n=("qty", "size"),   # sum 은 NaN 제외
+                   skipped=("skipped", "sum"))
+              .reset_index())
+
+def cached_rollup() -> pd.DataFrame | None:
+    """TTL 안의 요약이 있으면 반환 (없으면 None — 불러오지 않음)"""
+    slot, lock = _rollup_slot()
+    with lock:
+        if slot[1] is not None and time.monotonic() - slot[0] < ROLLUP_TTL_S:
+            return slot[1]
+    return None
+
+def load_rollup() -> pd.DataFrame:
+    df = cached_rollup()
+    if df is not None:
+        return df
+    from services.inventory import load_live_snapshot
+    now = time.monotonic()
+    snap = load_live_snapshot(Scope())
+    if snap.error:
+        raise snap.error
+    df = rollup_frame(snap)
+    slot, lock = _rollup_slot()
+    with lock:
+        slot[:] = [now, df]
+    return df
+
+def scope_bar() -> Scope:
+    """데이터 페이지 상단의 범위 선택. 선택은 세션 + URL 에 기억"""
+    sc = current_scope()
+    if not AIRTABLE_BASE_ID:
+        return sc
+    snap = None
+    if sc.is_all:   # 페이지가 곧 같은 스냅샷을 씀 — 목록도 거기서
+        from services.inventory import load_live_snapshot
+        snap = load_live_snapshot(sc)
+    items, loading = known_scopes(snap)
+    if snap is not None and snap.error:
+        st.warning(f"범위 목록을 불러오지 못했습니다: {snap.error}")
+    opts = scope_options(items)
+
+    def pick(col, label, values, cur):
+        values = [""] + sorted(v for v in values.unique() if v)
+        if cur and cur not in values:
+            values.append(cur)
+        # key 없이 — 상위 선택이 바뀌어 목록이 달라지면 세션 범위(cur) 기준으로 다시 잡힘
+        return col.selectbox(label, values, index=values.index(cur), format_func=lambda v: v or "전체")
+
+    c1, c2, c3 = st.columns(3)
+    dept = pick(c1, "학과", opts["dept"], sc.dept)
+    sub = opts[opts["dept"] == dept] if dept else opts
+    bld = pick(c2, "건물", sub["building"], sc.building)
+    sub = sub[sub["building"] == bld] if bld else sub
+    lab = pick(c3, "실험실", sub["lab"], sc.lab)
+    if loading:
+        st.caption("범위 목록을 불러오는 중입니다 — 지금은 알려진 범위만 표시합니다.")
+    new = Scope(dept, bld, lab)
+    if new != sc:
+        set_scope(new)
+    return new
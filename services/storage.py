@@ -0,0 +1,220 @@
+"""라벨 이미지 저장소 (ImgBB / 로컬 디스크 / S3 호환) — 내용 해시 키, 썸네일, 백그라운드 업로드
+
+키는 sha256 기반(img/ab/abcd….jpg, thumb/ab/abcd….jpg)이라 같은 사진은 한 번만 올라간다.
+저장 버튼은 Airtable 레코드만 만들고 바로 돌아오며, 이미지 업로드와 Attachments PATCH 는
+프로세스 공용 작업 스레드에서 처리한다.
+"""
+import io, logging, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+try:  # S3/MinIO 백엔드 쓸 때만 필요
+    import boto3
+except Exception:
+    boto3 = None
+
+from config import (AIRTABLE_BASE_ID, IMAGE_BACKEND, IMAGE_LOCAL_DIR, IMAGE_PUBLIC_URL,
+                    IMAGE_THUMB_FIELD, IMGBB_KEY, S3_ACCESS_KEY, S3_BUCKET, S3_ENDPOINT_URL, S3_REGION,
+                    S3_SECRET_KEY)
+from services.airtable import at_update_record, tx_ref
+from services.ocr import upload_to_imgbb
+
+log = logging.getLogger("lab_ocr.storage")
+
+IMAGE_MAX_SIDE = 2048   # 원본은 이 크기로 줄여 JPEG 재압축 (휴대폰 원본 4000px+ → 수백 KB)
+THUMB_SIDE = 320
+JPEG_QUALITY = 85
+UPLOAD_RETRY = 3
+UPLOAD_BACKOFF_S = 2.0   # 재시도 간격 (2, 4초 …)
+
+# =========================
+# 이미지 가공
+# =========================
+def _jpeg(img: Image.Image, side: int) -> bytes:
+    img = img.copy()
+    img.thumbnail((side, side))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return buf.getvalue()
+
+def prepare_image(image_bytes: bytes) -> tuple[bytes, bytes | None]:
+    """(저장용 원본, 썸네일). EXIF 회전 반영 후 축소. 디코딩 불가면 원본 그대로 + 썸네일 없음"""
+    try:
+        img = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes))).convert("RGB")
+    except Exception:
+        return image_bytes, None
+    full = image_bytes if max(img.size) <= IMAGE_MAX_SIDE and image_bytes[:2] == b"\xff\xd8" \
+        else _jpeg(img, IMAGE_MAX_SIDE)
+    return full, _jpeg(img, THUMB_SIDE)
+
+def image_key(sha: str, kind: str = "img") -> str:
+    return f"{kind}/{sha[:2]}/{sha}.jpg"
+
+# =========================
+# 백엔드
+# =========================
+class ImageStore:
+    """put(key, data) → 공개 URL(없으면 None). exists 는 이미 올라간 키면 그 URL"""
+    name = "none"
+
+    def exists(self, key: str) -> str | None:
+        return None
+
+    def put(self, key: str, data: bytes) -> str | None:
+        return None
+
+class ImgBBStore(ImageStore):
+    """ImgBB 는 키를 지정할 수 없어 프로세스 안에서 키 → URL 을 기억해 중복 업로드를 막음"""
+    name = "imgbb"
+
+    def __init__(self, max_entries: int = 4096):
+        self._urls: OrderedDict[str, str] = OrderedDict()
+        self._max = max_entries
+        self._lock = threading.Lock()
+
+    def exists(self, key):
+        with self._lock:
+            return self._urls.get(key)
+
+    def put(self, key, data):
+        url = upload_to_imgbb(data, key.rsplit("/", 1)[-1])
+        if not url:   # 업로드 실패는 예외로 — 백그라운드 업로더가 다시 시도
+            raise RuntimeError("ImgBB 업로드 응답에 URL 없음")
+        with self._lock:
+            self._urls[key] = url
+            while len(self._urls) > self._max:
+                self._urls.popitem(last=False)
+        return url
+
+class LocalStore(ImageStore):
+    """로컬 디스크. IMAGE_PUBLIC_URL 로 이 디렉터리를 서빙해야 Airtable 첨부가 가능"""
+    name = "local"
+
+    def __init__(self, root: str, public_url: str = ""):
+        self.root = Path(root)
+        self.public_url = public_url.rstrip("/")
+
+    def _url(self, key):
+        return f"{self.public_url}/{key}" if self.public_url else None
+
+    def exists(self, key):
+        return self._url(key) if (self.root / key).exists() else None
+
+    def put(self, key, data):
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)  # 동시에 같은 키를 써도 반쯤 쓴 파일이 보이지 않게
+        return self._url(key)
+
+class S3Store(ImageStore):
+    """S3 호환 (AWS S3 / MinIO). IMAGE_PUBLIC_URL 이 없으면 7일짜리 presigned URL
+    (Airtable 은 첨부 URL 을 받아 자체 저장하므로 만료돼도 무방)"""
+    name = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: str = "", region: str = "",
+                 access_key: str = "", secret_key: str = "", public_url: str = ""):
+        if boto3 is None:
+            raise RuntimeError("S3 백엔드는 boto3 가 필요합니다 (pip install boto3)")
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/")
+        self.s3 = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None,
+                               aws_access_key_id=access_key or None,
+                               aws_secret_access_key=secret_key or None)
+
+    def _url(self, key):
+        if self.public_url:
+            return f"{self.public_url}/{key}"
+        return self.s3.generate_presigned_url("get_object", Params={"Bucket": self.bucket, "Key": key},
+                                              ExpiresIn=7 * 86400)
+
+    def exists(self, key):
+        try:
+            self.s3.head_object(Bucket=self.bucket, Key=key)
+        except Exception:
+            return None
+        return self._url(key)
+
+    def put(self, key, data):
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType="image/jpeg",
+                           CacheControl="public, max-age=31536000, immutable")
+        return self._url(key)
+
+def make_store(backend: str = IMAGE_BACKEND) -> ImageStore:
+    if backend == "imgbb":
+        return ImgBBStore() if IMGBB_KEY else ImageStore()   # 키 없으면 이미지 없이 저장
+    if backend == "local":
+        return LocalStore(IMAGE_LOCAL_DIR, IMAGE_PUBLIC_URL)
+    if backend == "s3":
+        return S3Store(S3_BUCKET, S3_ENDPOINT_URL, S3_REGION, S3_ACCESS_KEY, S3_SECRET_KEY, IMAGE_PUBLIC_URL)
+    return ImageStore()
+
+_store: ImageStore | None = None
+_store_lock = threading.Lock()
+
+def get_store() -> ImageStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = make_store()
+            except Exception as e:
+                log.warning("이미지 저장소 초기화 실패 (%s) — 이미지 없이 저장", e)
+                _store = ImageStore()
+        return _store
+
+# =========================
+# 백그라운드 업로드
+# =========================
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="img-upload")
+_pending: set = set()
+_pending_lock = threading.Lock()
+
+def _put_once(store: ImageStore, key: str, data: bytes) -> str | None:
+    return store.exists(key) or store.put(key, data)
+
+def _attach(record_id: str, sha: str, image_bytes: bytes, filename: str):
+    store = get_store()
+    full, thumb = prepare_image(image_bytes)
+    for attempt in range(UPLOAD_RETRY):
+        try:
+            url = _put_once(store, image_key(sha), full)
+            thumb_url = _put_once(store, image_key(sha, "thumb"), thumb) if thumb else None
+            break
+        except Exception as e:
+            log.warning("이미지 업로드 실패 %s (%d/%d): %s", filename, attempt + 1, UPLOAD_RETRY, e)
+            if attempt + 1 < UPLOAD_RETRY:
+                time.sleep(UPLOAD_BACKOFF_S * 2 ** attempt)
+    else:
+        return
+    fields = {}
+    if url:
+        fields["Attachments"] = [{"url": url, "filename": filename}]
+    if thumb_url and IMAGE_THUMB_FIELD:
+        fields[IMAGE_THUMB_FIELD] = thumb_url
+    if fields:
+        r = at_update_record(AIRTABLE_BASE_ID, tx_ref(), record_id, fields)
+        if r.status_code >= 400:
+            log.warning("첨부 반영 실패 %s: %s", record_id, r.text[:200])
+
+def attach_image_async(record_id: str, sha: str, image_bytes: bytes, filename: str):
+    """레코드 저장 후 이미지 업로드 + Attachments PATCH 를 작업 스레드로 넘김"""
+    if get_store().name == "none" or not record_id:
+        return None
+    fut = _pool.submit(_attach, record_id, sha, image_bytes, filename)
+    with _pending_lock:
+        _pending.add(fut)
+    fut.add_done_callback(lambda f: _pending_discard(f))
+    return fut
+
+def _pending_discard(fut):
+    with _pending_lock:
+        _pending.discard(fut)
+
+def pending_uploads() -> int:
+    with _pending_lock:
+        return len(_pending)
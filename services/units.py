@@ -0,0 +1,106 @@
+import sys
+import numpy as np
+from dataclasses import dataclass
+from enum import Enum
+
+# =========================
+# 단위 환산 엔진 — 확장 가능한 단위 레지스트리 + NumPy 일괄 환산
+# =========================
+class Unit(str, Enum):
+    """기록 단위 (str 서브클래스라 "g" 등 문자열과 비교/해시 호환)"""
+    G   = "g"
+    MG  = "mg"
+    KG  = "kg"
+    ML  = "mL"
+    UL  = "µL"
+    L   = "L"
+    GAL = "gal"
+    EA  = "EA"
+    CYL = "cyl"
+
+    def __str__(self):
+        return self.value
+
+UNIT_CHOICES = [Unit.G.value, Unit.ML.value, Unit.L.value, Unit.KG.value, Unit.EA.value,
+                Unit.CYL.value, Unit.MG.value, Unit.UL.value, Unit.GAL.value]
+
+# 단위 종류: 부피(L 배수) / 질량(g 배수, 밀도 필요) / 용기(Materials 의 용기당 공칭부피 필요)
+KIND_UNKNOWN, KIND_VOLUME, KIND_MASS, KIND_CONTAINER = 0, 1, 2, 3
+
+@dataclass(frozen=True, slots=True)
+class UnitDef:
+    name: str
+    kind: int
+    factor: float   # 부피: 1단위당 L / 질량: 1단위당 g / 용기: 1단위당 용기 수
+
+# code 0 은 "환산 불가" 예약 슬롯
+_UNIT_DEFS: list[UnitDef] = [UnitDef("", KIND_UNKNOWN, 0.0)]
+_UNIT_CODE: dict[str, int] = {}
+_UNIT_KIND = np.zeros(1, dtype=np.int8)
+_UNIT_FACTOR = np.zeros(1, dtype=np.float64)
+
+def register_unit(name: str, kind: int, factor: float, aliases: tuple = ()):
+    """단위를 레지스트리에 추가(이미 있으면 덮어씀). aliases 는 같은 코드로 매핑"""
+    global _UNIT_KIND, _UNIT_FACTOR
+    code = _UNIT_CODE.get(name)
+    if code is None:
+        code = len(_UNIT_DEFS)
+        _UNIT_DEFS.append(UnitDef(name, kind, factor))
+    else:
+        _UNIT_DEFS[code] = UnitDef(name, kind, factor)
+    for n in (name, *aliases):
+        _UNIT_CODE[n] = code
+    _UNIT_KIND = np.array([u.kind for u in _UNIT_DEFS], dtype=np.int8)
+    _UNIT_FACTOR = np.array([u.factor for u in _UNIT_DEFS], dtype=np.float64)
+    return code
+
+register_unit("L",   KIND_VOLUME, 1.0,           aliases=("l",))
+register_unit("mL",  KIND_VOLUME, 1e-3,          aliases=("ml", "ML"))
+register_unit("µL",  KIND_VOLUME, 1e-6,          aliases=("uL", "ul", "μL"))
+register_unit("gal", KIND_VOLUME, 3.785411784,   aliases=("GAL",))   # US gallon
+register_unit("g",   KIND_MASS,   1.0,           aliases=("G",))
+register_unit("mg",  KIND_MASS,   1e-3)
+register_unit("kg",  KIND_MASS,   1e3,           aliases=("KG", "Kg"))
+register_unit("EA",  KIND_CONTAINER, 1.0,        aliases=("ea", "ea."))
+register_unit("cyl", KIND_CONTAINER, 1.0,        aliases=("CYL",))
+
+def unit_code(unit) -> int:
+    return _UNIT_CODE.get(str(unit).strip() if unit is not None else "", 0)
+
+def to_liters_batch(qty: np.ndarray, codes: np.ndarray,
+                    density: np.ndarray, container_L: np.ndarray) -> np.ndarray:
+    """수량/단위코드/밀도(g/mL)/용기부피(L) 배열 → L 배열. 환산 불가는 NaN"""
+    kind = _UNIT_KIND[codes]
+    factor = _UNIT_FACTOR[codes]
+    out = np.full(qty.shape, np.nan, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = kind == KIND_VOLUME
+        out[m] = qty[m] * factor[m]
+        m = (kind == KIND_MASS) & (density > 0)
+        out[m] = qty[m] * factor[m] / density[m] / 1000.0
+        m = (kind == KIND_CONTAINER) & (container_L > 0)
+        out[m] = qty[m] * factor[m] * container_L[m]
+    return out
+
+def to_liters(amount, unit: str, density_g_per_ml: float | None,
+              container_L: float | None = None) -> float | None:
+    """단건 환산 (to_liters_batch 와 동일 규칙)"""
+    try:
+        val = float(amount)
+    except:
+        return None
+    out = to_liters_batch(np.array([val]), np.array([unit_code(unit)]),
+                          np.array([density_g_per_ml or 0.0], dtype=np.float64),
+                          np.array([container_L or 0.0], dtype=np.float64))[0]
+    return None if np.isnan(out) else float(out)
+
+
+_UNIT_BY_NAME = {u.value: u for u in Unit}
+_UNIT_BY_NAME.update({alias: Unit(_UNIT_DEFS[c].name) for alias, c in _UNIT_CODE.items()
+                      if _UNIT_DEFS[c].name in _UNIT_BY_NAME})
+
+def parse_unit(raw) -> "Unit | str":
+    """알려진 단위(별칭 포함)는 Unit 멤버로, 그 외는 intern 된 원문 문자열로"""
+    s = raw.strip() if isinstance(raw, str) else ""
+    return _UNIT_BY_NAME.get(s) or sys.intern(s)
+
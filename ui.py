@@ -0,0 +1,86 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime, time as dtime
+
+import metrics
+import warmup
+from config import DEFAULT_GCP_KEY, METRICS_PANEL
+
+# =========================
+# 호환용 datetime 입력 헬퍼 (Streamlit 구버전 대응)
+# =========================
+def datetime_input_compat(label: str, default_dt: datetime) -> datetime:
+    d = st.date_input(f"{label} (날짜)", value=default_dt.date())
+    t_default = default_dt.time().replace(microsecond=0)
+    t = st.time_input(f"{label} (시간)", value=t_default)
+    if isinstance(t, dtime):
+        combined = datetime.combine(d, t)
+        try:
+            return combined.replace(tzinfo=default_dt.tzinfo)
+        except Exception:
+            return combined
+    return default_dt
+
+def vision_key_input() -> str:
+    """Vision API 키 입력 — OCR/실사 페이지가 같이 쓰고, 한 번 넣은 키는 페이지를 옮겨도 유지"""
+    key = st.text_input("🔑 Google Vision API Key (Secrets에 있으면 비워도 됨)",
+                        value=st.session_state.get("vision_key", DEFAULT_GCP_KEY), type="password")
+    st.session_state.vision_key = key
+    return key
+
+# =========================
+# 유틸
+# =========================
+def show_df(df: pd.DataFrame):
+    df2 = df.copy()
+    df2.index = range(1, len(df2) + 1)  # 1부터 시작
+    df2.index.name = "No."
+    st.dataframe(df2, use_container_width=True)
+
+def fmt_int(x) -> str:
+    try:
+        return f"{int(round(float(x)))}"
+    except:
+        return ""
+
+def fmt_pct(ratio) -> str:
+    if ratio is None:
+        return ""
+    try:
+        return f"{int(round(float(ratio)*100))}%"
+    except:
+        return ""
+
+# =========================
+# 계측 패널 (관리자용, 선택)
+# =========================
+def metrics_panel_slot():
+    """패널이 켜져 있으면 사이드바에 누적치 다운로드 + 현재 리런 표 자리를 만들어 반환"""
+    if not (METRICS_PANEL or st.query_params.get("debug") == "1"):
+        return None
+    with st.sidebar:
+        st.markdown("### 📈 계측")
+        hist = st.session_state.get("_metrics_hist", [])
+        c1, c2 = st.columns(2)
+        c1.download_button("Prometheus", metrics.prometheus_text().encode("utf-8"),
+                           file_name="lab_ocr_metrics.prom", mime="text/plain")
+        c2.download_button("JSON", "\n".join(r.to_json() for r in hist).encode("utf-8"),
+                           file_name="lab_ocr_reruns.jsonl", mime="application/json")
+        if hist:
+            st.caption("최근 리런 소요(ms): " + ", ".join(fmt_int(r.wall_ms) for r in hist[-10:]))
+        st.caption(warmup.status_line())
+        return st.empty()
+
+def render_metrics_panel(slot):
+    """현재 리런의 계측표를 slot 에 그림"""
+    rec = metrics.current()
+    if slot is None or rec is None:
+        return
+    rows = rec.rows()
+    with slot.container():
+        n_http = sum(r["count"] for r in rows if r["kind"] == metrics.KIND_HTTP)
+        kb = sum(r["bytes_in"] + r["bytes_out"] for r in rows if r["kind"] == metrics.KIND_HTTP) / 1024
+        st.caption(f"현재 리런: 외부 호출 {n_http}회 · {kb:,.0f} KB")
+        if rows:
+            st.dataframe(pd.DataFrame(rows)[["kind","name","count","errors","total_ms","p95_ms","bytes_in"]],
+                         use_container_width=True, hide_index=True)
@@ -0,0 +1,143 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from config import AIRTABLE_TOKEN, AIRTABLE_BASE_ID
+from services.airtable import at_create_many, tx_ref
+from services.inventory import load_live_snapshot, patch_snapshots
+from services.reconcile import AuditScan, adjustment_fields, reconcile
+from services.scan import group_bursts, identify, make_frame, pick_sharpest
+from services.scope import scope_bar
+from services.units import UNIT_CHOICES
+from ui import vision_key_input
+
+# =========================
+# PAGE: 🧾 재고 실사 — 선반 스캔 vs 장부(실험실별 상세와 같은 L 환산) 비교 → 조정 트랜잭션 일괄 생성
+# =========================
+st.info("위치를 고르고 실사를 시작한 뒤 병 라벨을 찍거나 CAS 를 입력하세요. "
+        "CAS별 실사량과 장부 보유량(L)의 차이를 '조정' 트랜잭션으로 한 번에 기록합니다.")
+
+if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+    st.error("Airtable secrets가 필요합니다."); st.stop()
+
+scope_bar()
+snap = load_live_snapshot()
+if snap.error:
+    st.error(f"불러오기 실패: {snap.error}"); st.stop()
+
+audit = st.session_state.get("audit")
+
+# ---------- 실사 시작 ----------
+if audit is None:
+    locs = sorted({(t.building, t.room, t.lab) for t in snap.tx if t.lab})
+    if not locs:
+        st.caption("기록된 실험실이 없습니다."); st.stop()
+    loc = st.selectbox("실사 위치 (건물 / 호수 / 실험실)", locs, format_func=lambda x: " / ".join(x))
+    if st.button("▶ 실사 시작"):
+        st.session_state.audit = {"loc": loc, "started": datetime.now().astimezone(),
+                                  "scans": [], "seen": set(), "nonce": 0}
+        st.rerun()
+    st.stop()
+
+bld, room, lab = audit["loc"]
+st.markdown(f"### 📍 {bld} / {room} / {lab}  ·  시작 {audit['started']:%Y-%m-%d %H:%M}")
+
+# ---------- 스캔 ----------
+colQ, colU = st.columns(2)
+per_qty = colQ.number_input("병당 수량", min_value=0.0, value=1.0, step=1.0)
+per_unit = colU.selectbox("단위", UNIT_CHOICES, index=UNIT_CHOICES.index("EA"),
+                          help="EA 는 Materials 의 container_volume_L 로 L 환산")
+gcp_key = vision_key_input()
+
+nonce = audit["nonce"]
+shot = st.camera_input("라벨 촬영 (한 병씩)", key=f"audit_cam_{nonce}")
+burst = st.file_uploader("또는 여러 장 업로드", type=["jpg","jpeg","png"],
+                         accept_multiple_files=True, key=f"audit_files_{nonce}")
+files = ([shot] if shot else []) + list(burst or [])
+if files:
+    frames = [make_frame(f.name, f.getvalue()) for f in files]
+    frames = [f for f in frames if f.sha not in audit["seen"]]  # 같은 사진 다시 올린 경우
+    misses = []
+    with st.spinner("🔎 라벨 인식 중…"):
+        for g in group_bursts(frames):
+            f = pick_sharpest(g)
+            audit["seen"].update(x.sha for x in g)
+            cas_no, _, err = identify(f, gcp_key)
+            if cas_no:
+                audit["scans"].append(AuditScan(cas_no, per_qty, per_unit, f.name))
+            else:
+                misses.append(f"{f.name}: {err or 'CAS 없음'}")
+    audit["nonce"] = nonce + 1
+    audit["misses"] = misses
+    st.rerun()
+for m in audit.pop("misses", []):
+    st.warning(f"⚠️ {m} — 아래에 CAS 를 직접 입력하세요.")
+for level, msg in audit.pop("notices", []):   # 조정 기록 후 리런 전에 남긴 결과
+    getattr(st, level)(msg)
+
+with st.form("audit_manual", clear_on_submit=True):
+    colC, colB = st.columns([3, 1])
+    cas_in = colC.text_input("CAS 직접 입력")
+    if colB.form_submit_button("➕ 추가") and cas_in.strip():
+        audit["scans"].append(AuditScan(cas_in.strip(), per_qty, per_unit, "수기"))
+
+# 스캔 목록 — 표에서 CAS/수량 수정, 행 삭제 가능
+st.markdown(f"#### 📦 스캔한 병 ({len(audit['scans'])})")
+df_scans = pd.DataFrame([{"CAS": s.cas, "수량": s.qty, "단위": s.unit, "출처": s.source}
+                         for s in audit["scans"]], columns=["CAS", "수량", "단위", "출처"])
+edited = st.data_editor(
+    df_scans, num_rows="dynamic", use_container_width=True, key=f"audit_scans_{len(audit['scans'])}",
+    column_config={"단위": st.column_config.SelectboxColumn("단위", options=UNIT_CHOICES),
+                   "출처": st.column_config.TextColumn("출처", disabled=True)})
+audit["scans"] = [AuditScan(str(r["CAS"] or "").strip(), float(r["수량"] or 0), str(r["단위"] or per_unit),
+                            str(r["출처"] or "수기"))
+                  for r in edited.to_dict("records") if str(r["CAS"] or "").strip()]
+
+# ---------- 비교 ----------
+st.markdown("#### ⚖️ 장부 비교 (L)")
+unscanned_zero = st.checkbox("스캔하지 않은 CAS 는 선반에 없음(0)으로 간주", value=False,
+                             help="선반 전체를 다 훑은 뒤에 켜 두세요. 끄면 스캔한 CAS 만 비교합니다.")
+diff, book = reconcile(snap, bld, room, lab, audit["scans"], unscanned_zero)
+if diff.empty:
+    st.caption("비교할 항목이 없습니다.")
+else:
+    c1, c2, c3 = st.columns(3)
+    c1.metric("일치", int((diff["상태"] == "일치").sum()))
+    c2.metric("차이", int(diff["상태"].isin(["초과", "부족"]).sum()))
+    c3.metric("환산 불가", int((diff["상태"] == "환산 불가").sum()))
+    view = diff.copy()
+    view["적용"] = view["상태"].isin(["초과", "부족"])
+    picked = st.data_editor(
+        view.round({"실사(L)": 3, "장부(L)": 3, "차이(L)": 3}), use_container_width=True, hide_index=True,
+        disabled=[c for c in view.columns if c != "적용"], key="audit_diff_grid")
+    adj = adjustment_fields(diff[picked["적용"].to_numpy()], bld, room, lab, book.dept)
+    if st.button(f"✅ 조정 트랜잭션 생성 ({len(adj)}건)", disabled=not adj):
+        with st.spinner("기록 중…"):
+            created, errors = at_create_many(AIRTABLE_BASE_ID, tx_ref(), adj)
+        created = [r for r in created if r]
+        notices = []
+        if errors:
+            if any("INVALID_MULTIPLE_CHOICE_OPTIONS" in e for e in errors):
+                notices.append(("error", "❌ io_type 에 '조정' 옵션이 없습니다. Airtable에서 옵션을 추가하세요."))
+            else:
+                notices.append(("error", f"❌ 일부 실패 ({len(errors)}묶음): {errors[0]}"))
+        if created:
+            patch_snapshots(upserts=created)
+            notices.append(("success", f"✅ 조정 {len(created)}건 기록 완료 — 장부에 바로 반영됩니다."))
+            audit["notices"] = notices
+            st.rerun()   # 반영된 장부로 비교표를 다시 계산
+        for level, msg in notices:
+            getattr(st, level)(msg)
+
+    if book.unconvertible:
+        st.caption("환산 불가: 장부에 L 로 바꿀 수 없는 기록(밀도/용기부피 없음)이 있어 조정하지 않습니다 — "
+                   + ", ".join(sorted(book.unconvertible)))
+
+st.divider()
+if st.button("⏹ 실사 종료"):
+    del st.session_state["audit"]
+    st.rerun()
+
+if not diff.empty:
+    st.download_button("📥 실사 결과 CSV", diff.to_csv(index=False).encode("utf-8-sig"),
+                       file_name=f"audit_{lab}_{audit['started']:%Y%m%d}.csv", mime="text/csv")
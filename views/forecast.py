@@ -0,0 +1,43 @@
+import streamlit as st
+
+from config import AIRTABLE_TOKEN, AIRTABLE_BASE_ID
+from services.forecast import consumption_forecast
+from services.inventory import load_live_snapshot
+from services.scope import scope_bar
+from ui import show_df
+
+# =========================
+# PAGE: 📉 소모 예측 — CAS × 실험실별 소모율 / 잔여일수 / 발주 필요
+# =========================
+st.info("최근 기간의 출고·폐기량으로 일평균 소모율을 구해 잔여일수를 예측합니다. "
+        "Materials의 reorder_point(+reorder_unit), lead_time_days 필드가 있으면 발주 판단에 사용합니다.")
+
+if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+    st.error("Airtable secrets가 필요합니다."); st.stop()
+
+scope_bar()
+snap = load_live_snapshot()
+if snap.error:
+    st.error(f"불러오기 실패: {snap.error}")
+    st.stop()
+
+colw, colf = st.columns([1, 1])
+window = colw.selectbox("소모율 산정 기간(일)", [30, 60, 90, 180, 365], index=0)
+only_flagged = colf.checkbox("발주 필요/소진/주의만 보기", value=True)
+
+df = consumption_forecast(snap, window_days=window)
+if only_flagged:
+    df = df[df["상태"] != "정상"]
+
+c1, c2, c3 = st.columns(3)
+c1.metric("소진", int((df["상태"] == "소진").sum()))
+c2.metric("발주 필요", int((df["상태"] == "발주 필요").sum()))
+c3.metric("주의", int((df["상태"] == "주의").sum()))
+
+if df.empty:
+    st.caption("표시할 데이터가 없습니다.")
+else:
+    show_df(df)
+    st.download_button("📥 CSV로 내려받기 (소모 예측)",
+                       df.to_csv(index=False).encode("utf-8-sig"),
+                       file_name="consumption_forecast.csv", mime="text/csv")
@@ -0,0 +1,170 @@
+import streamlit as st
+import pandas as pd
+from datetime import date
+
+from config import AIRTABLE_TOKEN, AIRTABLE_BASE_ID
+from services.inventory import LEGAL_LIMITS_L, load_live_snapshot
+from services.chemref import reference
+from services.report import (cas_table, class_order, class_table, day_end, get_index, monthly_peaks, to_pdf,
+                             to_xlsx)
+from services.scope import scope_bar
+from ui import show_df, fmt_int, fmt_pct
+
+# =========================
+# PAGE: 위험물(제4류) 현황 — 요약(유별) + 세부(CAS별, 위험물류명 표시)
+# =========================
+st.info("제4류 위험물 기준으로, 창고 전체 저장량(L)을 유별별로 합산하고, CAS별 상세(위험물류명 포함)도 제공합니다.")
+
+if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+    st.error("Airtable secrets가 필요합니다."); st.stop()
+
+scope = scope_bar()
+snap = load_live_snapshot()
+if snap.error:
+    st.error(f"불러오기 실패: {snap.error}")
+    st.stop()
+tx, tx_cols, mats_idx = snap.tx, snap.cols, snap.mats_idx
+
+ref = reference()
+st.caption(f"유별/밀도: Materials → 화학물질 기준 데이터 {ref.version} ({len(ref.items):,}종) 순으로 적용")
+if ref.is_seed:
+    st.info("화학물질 기준 데이터가 기본 시드(흔한 용매만)입니다. 미분류가 많으면 관리자가 "
+            "`python -m services.chemref import 원본.csv` 로 전체 목록을 가져오세요.")
+
+subtA, subtB, subtC = st.tabs(["📦 유별 요약", "🔎 CAS 상세", "📅 기준일 보고서"])
+
+# ----- 유별 요약 -----
+with subtA:
+    by_class = {}
+    skipped  = []
+    for t, Lval in zip(tx, tx_cols.liters.tolist()):
+        if not t.cas or t.qty is None or not t.unit:
+            continue
+        if Lval != Lval:  # NaN → 환산 불가
+            skipped.append({"CAS": t.cas, "qty": t.qty, "unit": str(t.unit)})
+            continue
+        hclass = t.hazard_class or "미분류"
+        by_class[hclass] = by_class.get(hclass, 0.0) + Lval
+
+    disp_rows2, csv_rows2 = [], []
+    for key in class_order():
+        cur = by_class.get(key, 0.0)
+        limit = LEGAL_LIMITS_L.get(key, 0.0)
+        ratio = (cur / limit) if (limit and limit>0) else None
+        remain = max(limit - cur, 0.0) if limit else 0.0
+        status = ("초과" if ratio is not None and ratio>=1.0 else
+                  "경고" if ratio is not None and ratio>=0.5 else
+                  "주의" if ratio is not None and ratio>=0.2 else "정상")
+
+        row = {
+            "구분": key,
+            "현재보유량(L)": fmt_int(cur),
+            "지정수량(L)": fmt_int(limit),
+            "잔여허용량(L)": fmt_int(remain),
+            "비율": fmt_pct(ratio) if ratio is not None else "",
+            "상태": status
+        }
+        disp_rows2.append(row); csv_rows2.append(row.copy())
+
+    st.markdown("#### 📦 제4류 위험물 저장량 현황 (유별 합계)")
+    if not disp_rows2:
+        st.caption("표시할 데이터가 없습니다.")
+    else:
+        df2 = pd.DataFrame(disp_rows2)
+        show_df(df2)
+        st.download_button("📥 CSV로 내려받기 (제4류 유별 요약)",
+                           pd.DataFrame(csv_rows2).to_csv(index=False).encode("utf-8-sig"),
+                           file_name="hazard_class_4_summary.csv", mime="text/csv")
+
+    if skipped:
+        with st.expander("⚠️ 환산 불가 항목 보기"):
+            show_df(pd.DataFrame(skipped))
+
+# ----- CAS 상세(위험물류명 표시) -----
+with subtB:
+    sums = {}
+    detail_rows = []
+    hclass_of = {}
+    for t, Lval in zip(tx, tx_cols.liters.tolist()):
+        if not t.cas or t.qty is None or not t.unit:
+            continue
+        if Lval != Lval:
+            continue
+        key = (t.cas,)
+        sums[key] = sums.get(key, 0.0) + Lval
+        hclass_of[t.cas] = t.hazard_class
+
+    for (cas,) , Lsum in sums.items():
+        m = mats_idx.get(cas, {})
+        hclass = hclass_of.get(cas) or "미분류"
+        limit = LEGAL_LIMITS_L.get(hclass, 0.0)
+        remain = max(limit - Lsum, 0.0) if limit else 0.0
+        detail_rows.append({
+            "CAS": cas,
+            "물질명": m.get("name",""),
+            "위험물류명": hclass,
+            "재고합계(L)": fmt_int(Lsum),
+            "지정수량(L)": fmt_int(limit),
+            "잔여허용량(L)": fmt_int(remain),
+        })
+
+    detail_rows.sort(key=lambda r: int(r["재고합계(L)"]) if r["재고합계(L)"] else 0, reverse=True)
+
+    st.markdown("#### 🔎 CAS별 상세 (위험물류명 포함)")
+    if detail_rows:
+        dfh = pd.DataFrame(detail_rows)
+        show_df(dfh)
+        st.download_button("📥 CSV로 내려받기 (제4류 CAS 상세)",
+                           dfh.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="hazard_cas_detail.csv", mime="text/csv")
+    else:
+        st.caption("표시할 데이터가 없습니다.")
+
+# ----- 기준일 보고서 (점검용: 특정 날짜 보유량 + 월별 최대 배수) -----
+with subtC:
+    idx = get_index(snap)
+    today = date.today()
+    colD, colY = st.columns(2)
+    asof = colD.date_input("기준일", value=today, max_value=today)
+    years = sorted({m.year for m in idx.month_starts[:-1]}, reverse=True) or [today.year]
+    year = colY.selectbox("월별 최대 보유 기간(연도)", years)
+
+    ts = day_end(asof)
+    df_class = class_table(idx, ts)
+    df_cas = cas_table(idx, ts, mats_idx)
+    df_peak = monthly_peaks(idx, date(year, 1, 1), date(year, 12, 31))
+
+    st.markdown(f"#### 📦 {asof:%Y-%m-%d} 기준 유별 보유량")
+    show_df(df_class)
+    st.markdown(f"#### 🔎 {asof:%Y-%m-%d} 기준 CAS별 보유량")
+    if df_cas.empty:
+        st.caption("표시할 데이터가 없습니다.")
+    else:
+        show_df(df_cas)
+    st.markdown(f"#### 📈 {year}년 월별 최대 보유량 / 지정수량 배수")
+    if df_peak.empty:
+        st.caption("표시할 데이터가 없습니다.")
+    else:
+        st.dataframe(df_peak.pivot(index="월", columns="구분", values="최대 배수")[idx.classes[:-1]],
+                     use_container_width=True)
+    if idx.skipped:
+        st.caption(f"환산 불가/일시 없음으로 제외된 기록 {idx.skipped}건")
+
+    sheets = {"유별 보유량": df_class, "CAS별 보유량": df_cas, f"{year} 월별 최대": df_peak}
+    title = "제4류 위험물 저장량 보고서"
+    subtitle = f"기준일 {asof:%Y-%m-%d} · 범위 {scope.label()} · 작성 {today:%Y-%m-%d}"
+    # 파일 생성(openpyxl/reportlab)은 눌렀을 때만 — 표 조회는 리런마다 ms 단위
+    if st.button("📄 보고서 파일 만들기 (XLSX / PDF)"):
+        colX, colP = st.columns(2)
+        xlsx = to_xlsx(sheets)
+        if xlsx:
+            colX.download_button("📥 XLSX 내려받기", xlsx, file_name=f"hazard_report_{asof:%Y%m%d}.xlsx",
+                                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        else:
+            colX.caption("XLSX 는 openpyxl 설치 필요 (pip install openpyxl)")
+        pdf = to_pdf(title, subtitle, sheets)
+        if pdf:
+            colP.download_button("📥 PDF 내려받기", pdf, file_name=f"hazard_report_{asof:%Y%m%d}.pdf",
+                                 mime="application/pdf")
+        else:
+            colP.caption("PDF 는 reportlab 설치 필요 (pip install reportlab)")
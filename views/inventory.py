@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+
+from config import AIRTABLE_TOKEN, AIRTABLE_BASE_ID
+from services.inventory import load_live_snapshot
+from services.scope import cached_rollup, load_rollup, scope_bar
+from ui import show_df
+
+# =========================
+# PAGE: 📦 재고 현황 — CAS별 / 실험실별 (선택 범위) + 학교 전체 요약
+# =========================
+scope = scope_bar()
+subt1, subt2, subt3 = st.tabs(["🔬 CAS별", "🏫 실험실별", "🌐 학교 전체"])
+
+if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+    st.error("Airtable secrets가 필요합니다.")
+snap = load_live_snapshot()
+if snap.error:
+    st.error(f"불러오기 실패: {snap.error}")
+tx, tx_cols, mats_idx = snap.tx, snap.cols, snap.mats_idx
+
+# ---------- CAS별 ----------
+with subt1:
+    st.caption("CAS별 재고합계만 표시 (지정수량/비율 제거).")
+    sums = {}
+    for t in tx:
+        if not t.cas or t.qty is None:
+            continue
+        key = (t.cas, str(t.unit))
+        sums[key] = sums.get(key, 0.0) + t.qty
+
+    rows = []
+    for (cas, unit), qty_sum in sums.items():
+        m = mats_idx.get(cas, {})
+        rows.append({
+            "CAS": cas,
+            "물질명": m.get("name",""),
+            "재고합계": f"{int(round(qty_sum))}",
+            "단위": unit,
+            "메모": ""
+        })
+
+    rows.sort(key=lambda r: int(r["재고합계"]) if r["재고합계"] else 0, reverse=True)
+
+    if rows:
+        df = pd.DataFrame(rows)
+        show_df(df)
+        st.download_button("📥 CSV로 내려받기 (CAS별)",
+                           df.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="inventory_by_cas.csv", mime="text/csv")
+    else:
+        st.caption("표시할 데이터가 없습니다.")
+
+# ---------- 실험실별 ----------
+with subt2:
+    st.caption("실험실별 재고를 **L 단위로 환산**(가능한 항목)하여 요약과 상세를 제공합니다.")
+    sum_lab = {}
+    detail = []
+    skipped = []
+
+    for t, Lval in zip(tx, tx_cols.liters.tolist()):
+        if not t.cas or t.qty is None or not t.unit:
+            continue
+
+        if Lval != Lval:  # NaN → 환산 불가
+            skipped.append({"CAS": t.cas, "qty": t.qty, "unit": str(t.unit),
+                            "building": t.building, "room": t.room, "lab": t.lab})
+            continue
+
+        key = (t.building, t.room, t.lab)
+        sum_lab[key] = sum_lab.get(key, 0.0) + Lval
+
+        m = mats_idx.get(t.cas, {})
+        detail.append({
+            "건물": t.building, "호수": t.room, "실험실": t.lab,
+            "CAS": t.cas, "물질명": m.get("name",""),
+            "환산보유량(L)": f"{int(round(Lval))}",
+            "원수량": f"{int(round(t.qty))}", "원단위": str(t.unit)
+        })
+
+    rows_sum = [
+        {"건물": k[0], "호수": k[1], "실험실": k[2], "총보유량(L)": f"{int(round(v))}"}
+        for k,v in sum_lab.items()
+    ]
+    rows_sum.sort(key=lambda r: int(r["총보유량(L)"]) if r["총보유량(L)"] else 0, reverse=True)
+
+    st.markdown("#### 🧾 실험실별 요약 (L)")
+    if rows_sum:
+        df_sum = pd.DataFrame(rows_sum)
+        show_df(df_sum)
+        st.download_button("📥 CSV로 내려받기 (실험실 요약)",
+                           df_sum.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="inventory_by_lab_summary.csv", mime="text/csv")
+    else:
+        st.caption("요약할 데이터가 없습니다.")
+
+    st.markdown("#### 🔎 실험실별 상세 (CAS)")
+    if detail:
+        df_det = pd.DataFrame(detail)
+        df_det["__sort__"] = df_det["환산보유량(L)"].apply(lambda x: int(x) if str(x).isdigit() else 0)
+        df_det = df_det.sort_values(by=["건물","호수","실험실","__sort__"], ascending=[True, True, True, False]).drop(columns="__sort__")
+        show_df(df_det)
+        st.download_button("📥 CSV로 내려받기 (실험실 상세)",
+                           df_det.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="inventory_by_lab_detail.csv", mime="text/csv")
+    else:
+        st.caption("상세 데이터가 없습니다.")
+
+    if skipped:
+        with st.expander("⚠️ 환산 불가 항목 보기 (밀도/용기부피/단위 문제)"):
+            show_df(pd.DataFrame(skipped))
+
+# ---------- 학교 전체 (범위와 무관, 공용 캐시) ----------
+with subt3:
+    st.caption("모든 학과/건물 합계입니다. 여러 사용자가 공유하는 요약이라 최대 15분 전 데이터일 수 있습니다.")
+    roll = cached_rollup()
+    # 범위를 고른 세션은 전체 테이블을 받아야 하므로 누를 때만 (전체 범위면 위와 같은 스냅샷이라 바로)
+    if roll is None and (scope.is_all or st.button("🌐 학교 전체 요약 불러오기",
+                                                   help="모든 학과의 트랜잭션을 받아야 해서 시간이 걸립니다")):
+        try:
+            roll = load_rollup()
+        except Exception as e:
+            st.error(f"학교 전체 요약 실패: {e}")
+    if roll is not None and len(roll):
+        by_dept = (roll.groupby(["dept", "building"], as_index=False)
+                       .agg(실험실수=("lab", "nunique"), 총보유량_L=("liters", "sum"), 환산불가=("skipped", "sum"))
+                       .rename(columns={"dept": "학과", "building": "건물", "총보유량_L": "총보유량(L)",
+                                        "환산불가": "환산 불가(건)"})
+                       .sort_values("총보유량(L)", ascending=False))
+        by_dept["총보유량(L)"] = by_dept["총보유량(L)"].round().astype(int)
+        st.markdown("#### 🏢 학과·건물별 총보유량 (L)")
+        show_df(by_dept)
+        n_skip = int(roll["skipped"].sum())
+        if n_skip:
+            st.caption(f"⚠️ L 로 환산할 수 없는 기록 {n_skip}건(밀도/용기부피/단위 문제)은 총보유량에서 빠졌습니다.")
+
+        by_cas = (roll[roll["CAS"] != ""].groupby(["CAS", "unit"], as_index=False)
+                      .agg(재고합계=("qty", "sum"), 보유실험실수=("lab", "nunique"))
+                      .rename(columns={"unit": "단위"})
+                      .sort_values("재고합계", ascending=False))
+        by_cas.insert(1, "물질명", by_cas["CAS"].map(lambda c: mats_idx.get(c, {}).get("name", "")))
+        by_cas["재고합계"] = by_cas["재고합계"].round().astype(int)
+        st.markdown("#### 🔬 CAS별 학교 전체 재고")
+        show_df(by_cas)
+        st.download_button("📥 CSV로 내려받기 (학교 전체 CAS별)",
+                           by_cas.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="inventory_university_by_cas.csv", mime="text/csv")
+    elif roll is not None:
+        st.caption("표시할 데이터가 없습니다.")
@@ -0,0 +1,183 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta, date
+
+from config import AIRTABLE_TOKEN, AIRTABLE_BASE_ID, TRASH_TABLE_ID, TRASH_TABLE_NAME
+from services.airtable import (at_create_many, at_delete_many, at_get_by_ids, at_update_many, patch_trash,
+                               trash_fields, trash_ref, tx_ref as tx_table_ref)
+from services.inventory import iso_z, load_live_snapshot, patch_snapshots, tx_stamp
+from services.scope import scope_bar
+
+# =========================
+# PAGE: 🔄 입출고 로그 — 표 안에서 바로 삭제/일시수정 (Undo 지원)
+# =========================
+st.info("표 안에서 '삭제' 체크하거나 '새 일시'를 수정한 뒤, 아래 '선택 항목 적용' 버튼을 누르세요. (Airtable에 tx_time 필드가 있어야 합니다)")
+
+if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+    st.error("Airtable secrets가 필요합니다."); st.stop()
+
+tx_ref  = tx_table_ref()
+
+# 기본 기간: 최근 30일
+today = date.today()
+default_start = today - timedelta(days=30)
+colf1, colf2 = st.columns(2)
+start_d = colf1.date_input("시작일", value=default_start)
+end_d   = colf2.date_input("종료일", value=today)
+
+scope_bar()
+snap = load_live_snapshot()
+if snap.error:
+    st.error(f"불러오기 실패: {snap.error}")
+tx, mats_idx = snap.tx, snap.mats_idx
+
+# 표시/편집용 데이터 구성
+def in_range(dt_val: datetime | None) -> bool:
+    if dt_val is None:
+        return True
+    return start_d <= dt_val.date() <= end_d
+
+rows_for_editor = []
+orig_time_map = {}  # record_id -> UTC ISO(Z) 문자열 (원래 값 비교용)
+
+for t in tx:
+    if not in_range(t.when):
+        continue
+
+    # 편집용 datetime 값 (naive로 표시 → 저장 시 UTC로 변환)
+    base_dt = t.when or datetime.now().astimezone()
+    new_dt_default = base_dt.astimezone().replace(microsecond=0).replace(tzinfo=None)
+
+    orig_time_map[t.id] = iso_z(t.when) if t.when else ""
+    rows_for_editor.append({
+        "record_id": t.id,
+        "일시(현재)": orig_time_map[t.id].replace("T"," ").replace("Z",""),
+        "새_일시": new_dt_default,     # 편집 가능
+        "구분": t.io_type,
+        "CAS": t.cas,
+        "물질명": mats_idx.get(t.cas, {}).get("name",""),
+        "수량": f"{int(round(t.qty)) if t.qty is not None else ''}",
+        "단위": str(t.unit),
+        "건물": t.building,
+        "호수": t.room,
+        "실험실": t.lab,
+        "삭제": False,                 # 체크박스
+    })
+
+if not rows_for_editor:
+    st.caption("표시할 데이터가 없습니다. 기간을 넓혀보세요.")
+    st.stop()
+
+df_edit = pd.DataFrame(rows_for_editor)
+df_edit.index = range(1, len(df_edit) + 1)
+df_edit.index.name = "No."
+
+edited = st.data_editor(
+    df_edit,
+    use_container_width=True,
+    num_rows="fixed",
+    column_config={
+        "record_id": st.column_config.TextColumn("record_id", disabled=True, help="Airtable 내부 ID"),
+        "일시(현재)": st.column_config.TextColumn("일시(현재)", disabled=True),
+        "새_일시": st.column_config.DatetimeColumn("새 일시(수정 가능)"),
+        "구분": st.column_config.TextColumn("구분", disabled=True),
+        "CAS": st.column_config.TextColumn("CAS", disabled=True),
+        "물질명": st.column_config.TextColumn("물질명", disabled=True),
+        "수량": st.column_config.TextColumn("수량", disabled=True),
+        "단위": st.column_config.TextColumn("단위", disabled=True),
+        "건물": st.column_config.TextColumn("건물", disabled=True),
+        "호수": st.column_config.TextColumn("호수", disabled=True),
+        "실험실": st.column_config.TextColumn("실험실", disabled=True),
+        "삭제": st.column_config.CheckboxColumn("삭제"),
+    },
+    hide_index=False,
+    key="edit_logs_grid",
+)
+
+cola, colb = st.columns([1,3])
+apply_btn = cola.button("✅ 선택 항목 적용")
+if "log_flash" in st.session_state:
+    colb.success(st.session_state.pop("log_flash"))
+
+def to_utc_iso(dt_val: datetime) -> str:
+    """에디터에서 넘어온 naive datetime을 로컬타임으로 간주 → UTC Z로 변환"""
+    if dt_val is None:
+        return ""
+    if dt_val.tzinfo is None:
+        local_tz = datetime.now().astimezone().tzinfo
+        dt_val = dt_val.replace(tzinfo=local_tz)
+    return iso_z(dt_val)
+
+if apply_btn:
+    to_delete, to_retime = [], {}
+    for idx, row in edited.iterrows():
+        rid = row.get("record_id")
+        if not rid:
+            continue
+        # 삭제 우선 처리
+        if bool(row.get("삭제", False)):
+            to_delete.append(rid)
+            continue
+        # 일시 수정 처리
+        new_dt = row.get("새_일시")
+        new_iso = to_utc_iso(new_dt) if isinstance(new_dt, datetime) else ""
+        if new_iso and (new_iso != orig_time_map.get(rid, "")):
+            to_retime[rid] = new_iso
+
+    updated = deleted = soft_deleted = errors = conflicts = 0
+    upserts, removed = [], set()
+    if to_delete or to_retime:
+        # 동시 수정 확인: 지금 Airtable 값의 표식이 화면에 불러온 때와 다르면 건너뛰고 최신 값으로 교체
+        ver = {t.id: t.ver for t in tx}
+        try:
+            current = at_get_by_ids(AIRTABLE_BASE_ID, tx_ref, to_delete + list(to_retime))
+        except Exception:
+            current, errors = None, len(to_delete) + len(to_retime)
+        if current is not None:
+            fresh = {}
+            for rid in to_delete + list(to_retime):
+                rec = current.get(rid)
+                if rec is None:                      # 다른 사용자가 이미 삭제
+                    removed.add(rid); conflicts += 1
+                elif tx_stamp(rec.get("fields", {})) != ver.get(rid):
+                    upserts.append(rec); conflicts += 1
+                else:
+                    fresh[rid] = rec
+            del_ok = [rid for rid in to_delete if rid in fresh]
+            retime_ok = [(rid, {"tx_time": iso}) for rid, iso in to_retime.items() if rid in fresh]
+
+            if del_ok and (TRASH_TABLE_ID or TRASH_TABLE_NAME):
+                # 휴지통 사용: 원본 백업 후 물리 삭제 (백업된 것만 삭제)
+                backups, errs = at_create_many(AIRTABLE_BASE_ID, trash_ref(), [trash_fields(fresh[r]) for r in del_ok])
+                backups = [b for b in backups if b]
+                patch_trash(added=backups)
+                backed = [b["fields"].get("original_record_id") for b in backups]
+                gone, errs2 = at_delete_many(AIRTABLE_BASE_ID, tx_ref, backed)
+                removed.update(gone)
+                deleted += len(gone)
+                errors += len(del_ok) - len(gone)
+            elif del_ok:
+                # 소프트 삭제(필드 'deleted' = True)
+                recs, errs = at_update_many(AIRTABLE_BASE_ID, tx_ref, [(r, {"deleted": True}) for r in del_ok])
+                upserts += recs
+                soft_deleted += len(recs)
+                errors += len(del_ok) - len(recs)
+            if retime_ok:
+                recs, errs = at_update_many(AIRTABLE_BASE_ID, tx_ref, retime_ok)
+                upserts += recs
+                updated += len(recs)
+                errors += len(retime_ok) - len(recs)
+
+    # 응답 레코드로 캐시된 스냅샷만 고침 — 다시 불러오지 않음
+    patch_snapshots(upserts=upserts, removed=removed)
+
+    msg = []
+    if updated: msg.append(f"🕒 일시 수정 {updated}건")
+    if deleted: msg.append(f"🗑️ 삭제(휴지통으로 이동) {deleted}건")
+    if soft_deleted: msg.append(f"🗂️ 소프트삭제 {soft_deleted}건")
+    if conflicts: msg.append(f"🔀 다른 사용자가 먼저 수정/삭제해 건너뜀 {conflicts}건 (최신 값으로 표시)")
+    if errors:  msg.append(f"⚠️ 오류 {errors}건")
+    if not msg:  msg = ["변경 사항이 없습니다."]
+    st.session_state["log_flash"] = " / ".join(msg)
+    st.session_state.pop("edit_logs_grid", None)  # 체크 상태 초기화 (행 구성이 바뀜)
+    st.rerun()
@@ -0,0 +1,244 @@
+import pandas as pd
+import streamlit as st
+from datetime import datetime
+
+from services.inventory import set_material_name_if_missing, load_material_one
+from services.dedup import content_sha, get_scan_index, image_dhash, ocr_cached, text_simhash
+from services.ocr import extract_cas
+from services.scan import group_bursts, identify, make_frame, pick_sharpest, save_scan
+from services.storage import pending_uploads
+from services.units import UNIT_CHOICES
+from ui import datetime_input_compat, show_df, vision_key_input
+
+# =========================
+# PAGE: 기록 (OCR/저장)
+# =========================
+if "last" not in st.session_state:
+    st.session_state.last = {"dept":"","lab":"","bld":"","room":"","io":"입고","unit":"g"}
+
+if pending_uploads():
+    st.caption(f"🖼 이미지 업로드 진행 중 {pending_uploads()}건 (기록 저장은 완료됨)")
+
+mode = st.radio("입력 방식", ["📄 단건 업로드", "📷 연속 촬영 (재고 실사)"], horizontal=True, key="ocr_mode")
+continuous = mode.startswith("📷")
+
+uploaded_file = None if continuous else st.file_uploader("라벨 정면 사진 업로드", type=["jpg","jpeg","png"])
+gcp_key = vision_key_input()
+
+st.markdown("### 📋 메타 정보")
+colA,colB,colC = st.columns(3)
+colD,colE = st.columns(2)
+
+dept = colA.selectbox("학과",
+    ["화학공학과","안전공학과","신소재공학과","기계시스템디자인공학과","기타(직접 입력)"],
+    index=0)
+lab = colB.text_input("실험실명", value=st.session_state.last["lab"])
+bld = colC.selectbox("건물", ["청운관","제1공학관","제2공학관","어울림관","기타(직접 입력)"], index=0)
+room = colD.text_input("호수 (예: 203)", value=st.session_state.last["room"])
+io_type = colE.selectbox("입·출고 구분", ["입고","출고","반품","폐기"], index=0)
+
+if dept.endswith("직접 입력"):
+    dept = colA.text_input("학과(직접 입력)", value=st.session_state.last["dept"])
+if bld.endswith("직접 입력"):
+    bld = colC.text_input("건물(직접 입력)", value=st.session_state.last["bld"])
+
+st.markdown("### ⏱ 거래 일시 (수정 가능)")
+now_local = datetime.now().astimezone()
+tx_time_input = datetime_input_compat("거래일시", now_local)
+
+st.markdown("### 📦 수량")
+colQ1, colQ2 = st.columns([1,1])
+qty = colQ1.number_input("수량", min_value=0.0, step=1.0, format="%.0f")  # 정수 입력
+unit = colQ2.selectbox("단위", UNIT_CHOICES,
+                       index=UNIT_CHOICES.index(st.session_state.last["unit"]))
+
+st.divider()
+
+def _dup_warning(m):
+    when = datetime.fromtimestamp(m.entry.saved_at).astimezone().strftime("%Y-%m-%d %H:%M")
+    st.warning(f"⚠️ 중복 의심: 최근 저장된 스캔과 {m.reason} (해밍거리 {m.distance}) — "
+               f"{m.entry.label or m.entry.record_id} · {when}")
+
+scan_idx = get_scan_index()
+img_bytes = uploaded_file.getvalue() if uploaded_file else b""
+img_sha = content_sha(img_bytes) if img_bytes else ""
+img_dhash = image_dhash(img_bytes) if img_bytes else None
+# OCR 전에 이미지 해시로 먼저 확인 — 중복이면 확인 전까지 Vision 호출 안 함
+dup_img = scan_idx.match_image(img_sha, img_dhash) if img_bytes else None
+dup_ok = True
+if dup_img:
+    _dup_warning(dup_img)
+    dup_ok = st.checkbox("중복이 아닙니다 — 계속 진행", key=f"dup_img_ok_{img_sha[:16]}")
+
+if continuous:
+    pass  # 아래 연속 촬영 섹션에서 처리
+elif uploaded_file and gcp_key and not dup_ok:
+    st.caption("같은 병을 다시 찍은 경우 저장하지 않아도 됩니다.")
+elif uploaded_file and gcp_key:
+    with st.spinner("🔎 OCR 분석 중…"):
+        ocr_json = ocr_cached(img_sha, img_bytes, gcp_key)
+
+    text = ""
+    try:
+        text = ocr_json["responses"][0]["fullTextAnnotation"]["text"]
+        st.success("✅ OCR 인식 성공")
+        st.text_area("추출 텍스트", text, height=220)
+    except Exception:
+        st.error("⚠️ 텍스트 인식 실패 (원본 응답 아래)")
+        st.json(ocr_json)
+
+    cas_no = extract_cas(text) if text else ""
+    st.code(f"🔎 CAS: {cas_no or '(없음)'}")
+
+    # CAS → 물질명 자동 채움(가능 시 Materials에 반영) — 해당 CAS 한 건만 조회
+    set_material_name_if_missing(cas_no, load_material_one(cas_no), name_hint=text)
+
+    # 이미지가 달라도 같은 CAS·거의 같은 라벨 텍스트면 저장 전에 한 번 더 확인
+    text_hash = text_simhash(text)
+    dup_txt = None if dup_img else scan_idx.match_text(cas_no, text_hash)
+    if dup_txt:
+        _dup_warning(dup_txt)
+        dup_ok = st.checkbox("중복이 아닙니다 — 저장 허용", key=f"dup_txt_ok_{img_sha[:16]}")
+
+    ready = bool(text and dept and lab and bld and room and io_type and (qty>=0) and dup_ok)
+    if not ready:
+        st.info("ℹ OCR/메타/수량을 채우면 저장할 수 있어요.")
+
+    if st.button("💾 Airtable에 저장", disabled=not ready):
+        ok, msg = save_scan(img_bytes, uploaded_file.name, text, cas_no,
+                            {"dept":dept,"lab":lab,"bld":bld,"room":room}, io_type, qty, unit,
+                            tx_time_input, img_sha, img_dhash, text_hash)
+        if ok:
+            st.success("✅ 저장 완료!")
+            st.session_state.last = {"dept":dept,"lab":lab,"bld":bld,"room":room,"io":io_type,"unit":unit}
+        else:
+            if "INVALID_MULTIPLE_CHOICE_OPTIONS" in msg:
+                st.error("❌ 드롭다운 옵션에 없는 값입니다. Airtable에서 옵션을 추가하세요.")
+            else:
+                st.error(f"❌ 저장 실패: {msg}")
+else:
+    st.caption("이미지와 Vision API Key를 입력하면 OCR을 시작합니다.")
+
+# =========================
+# 연속 촬영: 병마다 찍기만 하면 선명한 프레임 선택 → (바코드/OCR) → 위 메타·수량으로 자동 저장
+# =========================
+def _scan_bottle(frames) -> dict:
+    """한 병 분량 프레임 → 처리 결과 행 (저장/대기/확인 필요/건너뜀)
+
+    같은 사진 파일(sha 일치)만 바로 건너뜀. 유사 이미지·같은 CAS 유사 텍스트는 같은 병 재촬영일 수도,
+    같은 시약 다른 병일 수도 있어 '확인 필요'로 대기열에 넣음 ('같은 라벨 여러 병 허용'이면 검사 안 함)"""
+    f = pick_sharpest(frames)
+    row = {"시각": datetime.now().strftime("%H:%M:%S"), "파일": f.name, "프레임": len(frames),
+           "선명도": round(f.sharpness, 1), "CAS": "", "상태": ""}
+    if any(it["frame"].sha == f.sha for it in st.session_state.cap_queue):
+        row["상태"] = "중복 건너뜀 (대기열에 같은 파일)"
+        return row
+    dup = scan_idx.match_image(f.sha, f.dhash)
+    if dup and dup.entry.sha == f.sha:
+        row["상태"] = f"중복 건너뜀 ({dup.reason})"
+        return row
+    cas_no, text, err = identify(f, gcp_key)
+    if err:
+        row["상태"] = err
+        return row
+    row["CAS"] = cas_no
+    text_hash = text_simhash(text)
+    if st.session_state.cap_same_label:
+        dup = None
+    elif dup is None:
+        dup = scan_idx.match_text(cas_no, text_hash)
+    st.session_state.cap_queue.append({"frame": f, "text": text, "cas": cas_no,
+                                       "text_hash": text_hash, "row": row, "review": dup})
+    row["상태"] = f"확인 필요 ({dup.reason}: {dup.entry.label})" if dup else "대기"
+    return row
+
+def _save_queue(meta: dict, confirmed=()):
+    """대기열 저장. 확인 필요 항목은 confirmed(sha)에 든 것만 저장하고 나머지는 남김"""
+    keep = []
+    for item in st.session_state.cap_queue:
+        f, row = item["frame"], item["row"]
+        if item["review"] and f.sha not in confirmed:
+            keep.append(item)
+            continue
+        ok, msg = save_scan(f.data, f.name, item["text"], item["cas"], meta, io_type, qty, unit,
+                            datetime.now().astimezone(), f.sha, f.dhash, item["text_hash"])
+        row["상태"] = "저장" if ok else f"저장 실패: {msg[:80]}"
+        if ok:
+            t = st.session_state.cap_tally.setdefault((item["cas"] or "(CAS 없음)", unit), [0, 0.0])
+            t[0] += 1
+            t[1] += qty
+        else:
+            item["review"] = None  # 실패분은 대기열에 남겨 다시 저장 (확인은 끝났으니 다시 묻지 않음)
+            keep.append(item)
+    st.session_state.cap_queue = keep
+    st.session_state.last = {**meta, "io": io_type, "unit": unit}
+
+if continuous:
+    for k, v in (("cap_queue", []), ("cap_log", []), ("cap_tally", {}), ("cap_nonce", 0)):
+        st.session_state.setdefault(k, v)
+    meta = {"dept": dept, "lab": lab, "bld": bld, "room": room}
+    meta_ok = bool(dept and lab and bld and room and qty > 0)
+    if not meta_ok:
+        st.info("ℹ 위 메타 정보와 병당 수량(>0)을 먼저 채우세요. 촬영한 병마다 그대로 적용됩니다.")
+
+    auto_save = st.toggle("자동 저장", value=True, key="cap_auto",
+                          help="끄면 대기열에 모았다가 한 번에 저장")
+    st.toggle("같은 라벨 여러 병 허용", value=False, key="cap_same_label",
+              help="같은 시약이 여러 병 있을 때 — 켜면 비슷한 사진·같은 라벨 텍스트도 확인 없이 저장 (같은 사진 파일만 건너뜀)")
+    nonce = st.session_state.cap_nonce
+    shot = st.camera_input("라벨 촬영 (한 병씩)", key=f"cap_cam_{nonce}", disabled=not meta_ok)
+    burst = st.file_uploader("또는 연사/여러 장 업로드 — 비슷한 연속 사진은 한 병으로 묶고 가장 선명한 것만 사용",
+                             type=["jpg","jpeg","png"], accept_multiple_files=True,
+                             key=f"cap_burst_{nonce}", disabled=not meta_ok)
+
+    files = ([shot] if shot else []) + list(burst or [])
+    if files and meta_ok:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with st.spinner("🔎 프레임 분석/OCR 중…"):
+            frames = [make_frame(f"scan_{stamp}.jpg" if f is shot else f.name, f.getvalue()) for f in files]
+            for g in group_bursts(frames):
+                st.session_state.cap_log.append(_scan_bottle(g))
+                if auto_save:  # 병마다 바로 저장해야 같은 묶음 안의 재촬영도 중복으로 걸림
+                    _save_queue(meta)
+        # 위젯을 새 key 로 비워서 바로 다음 병을 찍을 수 있게
+        st.session_state.cap_nonce = nonce + 1
+        st.rerun()
+
+    if st.session_state.cap_queue:
+        review = [it for it in st.session_state.cap_queue if it["review"]]
+        st.caption(f"대기열 {len(st.session_state.cap_queue)}병" + (f" (확인 필요 {len(review)}병)" if review else ""))
+        confirmed = set()
+        if review:
+            st.warning("⚠️ 이미 저장된 병과 비슷합니다. 다른 병이면 체크해서 저장하고, 같은 병을 다시 찍었으면 버리세요.")
+            for it in review:
+                f, dup = it["frame"], it["review"]
+                c1, c2 = st.columns([1, 5])
+                c1.image(f.data, width=96)
+                if c2.checkbox(f"다른 병입니다 — {it['cas'] or '(CAS 없음)'} · {f.name} "
+                               f"({dup.reason}, 거리 {dup.distance}: {dup.entry.label})",
+                               key=f"cap_ok_{f.sha[:16]}"):
+                    confirmed.add(f.sha)
+        b1, b2 = st.columns(2)
+        if b1.button("💾 대기열 저장", disabled=not meta_ok):
+            _save_queue(meta, confirmed)
+            st.rerun()
+        if review and b2.button("🗑 체크 안 한 항목 버리기"):
+            for it in review:
+                if it["frame"].sha not in confirmed:
+                    it["row"]["상태"] = f"중복 건너뜀 ({it['review'].reason}, 확인 후 제외)"
+            st.session_state.cap_queue = [it for it in st.session_state.cap_queue
+                                          if not it["review"] or it["frame"].sha in confirmed]
+            st.rerun()
+
+    if st.session_state.cap_tally:
+        st.markdown("#### 🧮 CAS별 집계 (이번 세션)")
+        tally = pd.DataFrame([{"CAS": c, "병 수": n, "수량 합계": q, "단위": u}
+                              for (c, u), (n, q) in st.session_state.cap_tally.items()])
+        show_df(tally.sort_values("병 수", ascending=False))
+    if st.session_state.cap_log:
+        st.markdown("#### 📜 촬영 기록")
+        show_df(pd.DataFrame(st.session_state.cap_log[::-1]))
+        if st.button("🧹 기록/집계 초기화"):
+            for k in ("cap_queue", "cap_log", "cap_tally"):
+                del st.session_state[k]
+            st.rerun()
@@ -0,0 +1,146 @@
+import streamlit as st
+import pandas as pd
+import json
+
+from config import AIRTABLE_TOKEN, AIRTABLE_BASE_ID, TRASH_TABLE_ID, TRASH_TABLE_NAME
+from services.airtable import (at_create_many, at_delete_many, at_get_by_ids, get_trash_all, patch_trash,
+                               table_ref, tx_ref as tx_table_ref)
+from services.inventory import patch_snapshots
+
+# =========================
+# PAGE: 🗃️ 휴지통(복원)
+# =========================
+st.info("휴지통에 보관된 삭제 이력을 복원할 수 있습니다. 선택 후 '선택 항목 복원'을 누르세요.")
+
+if not (TRASH_TABLE_ID or TRASH_TABLE_NAME):
+    st.warning("휴지통 테이블이 설정되어 있지 않습니다. Secrets에 TRASH_TABLE_ID 또는 TRASH_TABLE_NAME을 설정하세요.")
+    st.stop()
+if not (AIRTABLE_TOKEN and AIRTABLE_BASE_ID):
+    st.error("Airtable secrets가 필요합니다."); st.stop()
+
+tx_ref   = tx_table_ref()
+trash_t  = table_ref(TRASH_TABLE_ID, TRASH_TABLE_NAME)
+
+trash_recs = get_trash_all()
+if not trash_recs:
+    st.caption("휴지통이 비어있습니다.")
+    st.stop()
+
+disp = []
+for tr in trash_recs:
+    tid = tr.get("id")
+    f   = tr.get("fields", {})
+    orig_id   = f.get("original_record_id", "")
+    deleted_at= f.get("deleted_at", "")
+    raw       = f.get("raw", "")
+
+    cas = name = qty = unit = io = bld = room = lab = ""
+    tx_time = ""
+    try:
+        js = json.loads(raw) if isinstance(raw, str) else raw
+        fields = js.get("fields", {})
+        cas   = (fields.get("CAS") or "")
+        name  = fields.get("Name") or fields.get("name") or ""
+        qty   = fields.get("qty")
+        unit  = fields.get("unit","")
+        io    = fields.get("io_type","")
+        bld   = fields.get("building","")
+        room  = fields.get("room","")
+        lab   = fields.get("lab","")
+        tx_time = fields.get("tx_time","") or js.get("createdTime","")
+    except Exception:
+        pass
+
+    disp.append({
+        "trash_id": tid,
+        "삭제시각": deleted_at.replace("T"," ").replace("Z",""),
+        "원본 record_id": orig_id,
+        "일시": tx_time.replace("T"," ").replace("Z",""),
+        "구분": io,
+        "CAS": cas,
+        "물질명(파일명)": name,
+        "수량": f"{int(round(float(qty)))}" if qty not in (None,"") else "",
+        "단위": unit,
+        "건물": bld, "호수": room, "실험실": lab,
+        "복원": False
+    })
+
+df_trash = pd.DataFrame(disp)
+df_trash.index = range(1, len(df_trash) + 1)
+df_trash.index.name = "No."
+
+edited_trash = st.data_editor(
+    df_trash,
+    use_container_width=True,
+    num_rows="fixed",
+    column_config={
+        "trash_id": st.column_config.TextColumn("trash_id", disabled=True),
+        "삭제시각": st.column_config.TextColumn("삭제시각", disabled=True),
+        "원본 record_id": st.column_config.TextColumn("원본 record_id", disabled=True),
+        "일시": st.column_config.TextColumn("일시", disabled=True),
+        "구분": st.column_config.TextColumn("구분", disabled=True),
+        "CAS": st.column_config.TextColumn("CAS", disabled=True),
+        "물질명(파일명)": st.column_config.TextColumn("물질명(파일명)", disabled=True),
+        "수량": st.column_config.TextColumn("수량", disabled=True),
+        "단위": st.column_config.TextColumn("단위", disabled=True),
+        "건물": st.column_config.TextColumn("건물", disabled=True),
+        "호수": st.column_config.TextColumn("호수", disabled=True),
+        "실험실": st.column_config.TextColumn("실험실", disabled=True),
+        "복원": st.column_config.CheckboxColumn("복원"),
+    },
+    hide_index=False,
+    key="trash_editor_grid",
+)
+
+colx, coly = st.columns([1,3])
+restore_btn = colx.button("✅ 선택 항목 복원")
+if "trash_flash" in st.session_state:
+    coly.success(st.session_state.pop("trash_flash"))
+
+if restore_btn:
+    restored = removed = errors = conflicts = 0
+    picked = [row.get("trash_id") for _, row in edited_trash.iterrows() if bool(row.get("복원", False))]
+    if picked:
+        # 다른 사용자가 이미 복원했으면 휴지통에 없음 → 건너뜀
+        try:
+            current = at_get_by_ids(AIRTABLE_BASE_ID, trash_t, picked)
+        except Exception:
+            current, errors = {}, len(picked)
+        gone = [tid for tid in picked if tid not in current] if not errors else []
+        conflicts += len(gone)
+        todo, fields_list = [], []
+        for tid in picked:
+            rec = current.get(tid)
+            if not rec:
+                continue
+            try:
+                raw = rec.get("fields", {}).get("raw", "")
+                js  = json.loads(raw) if isinstance(raw, str) else raw
+                fields = (js or {}).get("fields", {})
+            except Exception:
+                fields = None
+            if not isinstance(fields, dict) or not fields:
+                errors += 1
+                continue
+            fields.pop("deleted", None)  # 소프트삭제 흔적 제거
+            todo.append(tid); fields_list.append(fields)
+
+        created, errs = at_create_many(AIRTABLE_BASE_ID, tx_ref, fields_list)
+        done = [tid for tid, rec in zip(todo, created) if rec]
+        restored = len(done)
+        errors += len(todo) - restored
+        cleaned, errs2 = at_delete_many(AIRTABLE_BASE_ID, trash_t, done)
+        removed = len(cleaned)
+        # 응답 레코드로 캐시된 스냅샷/휴지통 목록만 고침 — 다시 불러오지 않음
+        patch_snapshots(upserts=created)
+        patch_trash(removed=cleaned + gone)
+
+    msg = []
+    if restored: msg.append(f"♻️ 복원 {restored}건")
+    if removed:  msg.append(f"🧹 휴지통 정리 {removed}건")
+    if conflicts: msg.append(f"🔀 이미 복원된 항목 {conflicts}건")
+    if errors:   msg.append(f"⚠️ 오류 {errors}건")
+    if not msg:  msg = ["변경 사항이 없습니다."]
+    st.session_state["trash_flash"] = " / ".join(msg)
+    st.session_state.pop("trash_editor_grid", None)  # 체크 상태 초기화 (행 구성이 바뀜)
+    st.rerun()
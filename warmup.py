@@ -0,0 +1,212 @@
+"""서버 시작 직후 예열 + 상태(health / readiness) 엔드포인트
+
+첫 방문자가 Materials/트랜잭션 페이지네이션, TLS 연결, 무거운 import 비용을 내지 않도록
+프로세스당 한 번 백그라운드 스레드에서 공용 캐시를 미리 채운다.
+
+- python serve.py [streamlit 옵션…] : 서버 부팅과 동시에 예열 (권장)
+- streamlit run app.py              : 첫 세션이 시작될 때 예열 시작 (app.py 에서 start())
+
+트랜잭션은 범위 선택 목록(dept/building/lab 만)과 Secrets WARMUP_LABS 의 범위를 미리 불러온다.
+기본값 ["*"] 는 새 세션이 처음 보는 전체 범위(전체 테이블 + 학교 전체 요약) — 실험실 이름을 더 적으면 그 범위도.
+
+Secrets HEALTH_PORT 를 지정하면 그 포트에 /healthz (프로세스 살아 있음) 와
+/readyz (예열 끝나면 200, 아니면 503) JSON 을 연다.
+"""
+import importlib, json, logging, threading, time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import metrics
+from config import (AIRTABLE_API_URL, AIRTABLE_BASE_ID, AIRTABLE_TOKEN, DEFAULT_GCP_KEY, HEALTH_PORT,
+                    IMGBB_API_URL, IMGBB_KEY, PUBCHEM_API_URL, VISION_API_URL, WARMUP, WARMUP_LABS)
+
+log = logging.getLogger("lab_ocr.warmup")
+
+@dataclass(slots=True)
+class Step:
+    name: str
+    ok: bool | None = None      # None: 진행 전/중
+    ms: float = 0.0
+    detail: str = ""
+
+@dataclass(slots=True)
+class WarmState:
+    started_at: float = 0.0     # epoch 초
+    finished_at: float = 0.0
+    steps: list = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at > 0
+
+    def to_dict(self) -> dict:
+        return {"ready": self.ready, "ok": self.ready and all(s.ok for s in self.steps),
+                "started_at": self.started_at, "finished_at": self.finished_at,
+                "warm_ms": round((self.finished_at - self.started_at) * 1000.0, 1) if self.ready else None,
+                "steps": [asdict(s) for s in self.steps]}
+
+_state = WarmState()
+_lock = threading.Lock()
+_started = False
+_thread: threading.Thread | None = None
+_health: ThreadingHTTPServer | None = None
+
+# =========================
+# 예열 단계 — 실패해도 다음 단계는 진행 (해당 캐시는 첫 사용 때 채워짐)
+# =========================
+HEAVY_MODULES = ("pandas", "PIL.Image", "services.forecast", "services.reconcile", "services.report",
+                 "services.scan")
+
+def _imports():
+    for m in HEAVY_MODULES:   # 페이지 첫 import 비용
+        importlib.import_module(m)
+    return f"{len(HEAVY_MODULES)}개 모듈"
+
+def _chemref():
+    from services.chemref import reference
+    ref = reference()
+    return f"{ref.version} ({len(ref.items)}종)"
+
+def _connections():
+    urls = [AIRTABLE_API_URL, PUBCHEM_API_URL]
+    if DEFAULT_GCP_KEY:
+        urls.append(VISION_API_URL)
+    if IMGBB_KEY:
+        urls.append(IMGBB_API_URL)
+    opened = [u for u in urls if metrics.warm_connection(u)]
+    return f"{len(opened)}/{len(urls)} 호스트"
+
+def _scope_list():
+    from services.scope import fetch_scope_list
+    return f"{len(fetch_scope_list())}개 범위"   # dept/building/lab 만 받는 가벼운 조회
+
+def _snapshots(labs):
+    """지정한 범위를 미리 불러옴 ("*" 는 새 세션의 첫 범위인 전체 범위 + 학교 전체 요약, 나머지는 실험실 이름)"""
+    from services.inventory import prime_snapshot
+    from services.scope import Scope, known_scopes, load_rollup
+    if not labs:
+        return "지정 없음"
+    scopes = [Scope(*k) for k in sorted(known_scopes()[0]) if k[2] in labs]
+    if "*" in labs:
+        scopes.append(Scope())
+    n = 0
+    for sc in scopes:
+        snap = prime_snapshot(sc)
+        if snap.error:
+            raise snap.error
+        n += len(snap.tx)
+    if "*" in labs:
+        load_rollup()
+    return f"{len(scopes)}개 범위, {n}건"
+
+def _scan_index():
+    from services.dedup import get_scan_index
+    get_scan_index()
+    return "ok"
+
+def _trash():
+    from services.airtable import get_trash_all, trash_enabled
+    return f"{len(get_trash_all())}건" if trash_enabled() else "미사용"
+
+def _image_store():
+    from services.storage import get_store
+    return get_store().name
+
+STEPS = [("imports", _imports), ("chemref", _chemref), ("connections", _connections),
+         ("scope_list", _scope_list), ("snapshots", _snapshots), ("scan_index", _scan_index),
+         ("trash", _trash), ("image_store", _image_store)]
+AIRTABLE_STEPS = {"scope_list", "snapshots", "scan_index", "trash"}
+
+def run(labs=None) -> WarmState:
+    """예열 단계를 현재 스레드에서 실행 (start() 의 작업 스레드, 벤치마크에서 사용). labs 기본값은 WARMUP_LABS"""
+    labs = set(WARMUP_LABS if labs is None else labs)
+    _state.steps, _state.finished_at = [], 0.0
+    _state.started_at = time.time()
+    airtable = bool(AIRTABLE_TOKEN and AIRTABLE_BASE_ID)
+    for name, fn in STEPS:
+        step = Step(name)
+        _state.steps.append(step)
+        if name in AIRTABLE_STEPS and not airtable:
+            step.ok, step.detail = True, "Airtable 미설정"
+            continue
+        t0 = time.perf_counter()
+        try:
+            step.detail = str(fn(labs) if name == "snapshots" else fn())
+            step.ok = True
+        except Exception as e:
+            step.ok, step.detail = False, f"{type(e).__name__}: {e}"
+            log.warning("예열 %s 실패: %s", name, e)
+        step.ms = round((time.perf_counter() - t0) * 1000.0, 1)
+    _state.finished_at = time.time()
+    log.info("예열 완료 %s", json.dumps(_state.to_dict(), ensure_ascii=False))
+    return _state
+
+def start() -> WarmState:
+    """예열 스레드/상태 서버 시작 (프로세스당 한 번, 이후 호출은 상태만 반환)"""
+    global _started, _thread
+    with _lock:
+        if not _started:
+            _started = True
+            if WARMUP:
+                _thread = threading.Thread(target=run, name="warmup", daemon=True)
+                _thread.start()
+            else:
+                _state.started_at = _state.finished_at = time.time()
+            if HEALTH_PORT:
+                start_health_server(HEALTH_PORT)
+    return _state
+
+def state() -> WarmState:
+    return _state
+
+def wait(timeout: float | None = None) -> bool:
+    """예열 끝날 때까지 대기 (벤치마크/테스트용)"""
+    if _thread is not None:
+        _thread.join(timeout)
+    return _state.ready
+
+def status_line() -> str:
+    if not _state.steps and not _state.ready:
+        return "예열: 시작 전"
+    if not _state.ready:
+        return f"예열 중… ({len(_state.steps)}/{len(STEPS)})"
+    failed = [s.name for s in _state.steps if s.ok is False]
+    secs = _state.finished_at - _state.started_at
+    return f"예열 완료 {secs:.1f}s" + (f" — 실패: {', '.join(failed)}" if failed else "")
+
+# =========================
+# health / readiness
+# =========================
+class _HealthHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/healthz":
+            return self._send(200, {"status": "ok"})
+        if path == "/readyz":
+            body = _state.to_dict()
+            return self._send(200 if body["ready"] else 503, body)
+        self._send(404, {"error": "not found"})
+
+def start_health_server(port: int, host: str = "0.0.0.0"):
+    global _health
+    if _health is not None:
+        return _health
+    try:
+        _health = ThreadingHTTPServer((host, port), _HealthHandler)
+    except OSError as e:   # 같은 호스트에 프로세스가 여럿이면 포트 충돌
+        log.warning("상태 엔드포인트 포트 %s 사용 불가: %s", port, e)
+        return None
+    _health.daemon_threads = True
+    threading.Thread(target=_health.serve_forever, name="health", daemon=True).start()
+    return _health